@@ -0,0 +1,87 @@
+"""Seeding of a synthetic metadata catalog for the benchmarks."""
+
+from decimal import Decimal
+
+# Number of datasets in the catalog. Each has a single version.
+NUM_DATASETS = 2000
+
+# Number of datasets with a deep tree of editions and distributions, and the
+# size of those trees.
+NUM_DEEP_DATASETS = 20
+EDITIONS_PER_VERSION = 100
+DISTRIBUTIONS_PER_EDITION = 5
+
+
+def dataset_id(i):
+    return f"dataset-{i:05}"
+
+
+def edition_name(i):
+    return f"2020{i // 28 % 12 + 1:02}{i % 28 + 1:02}T{i % 24:02}0000"
+
+
+def deep_dataset_ids():
+    return [dataset_id(i) for i in range(NUM_DEEP_DATASETS)]
+
+
+def _dataset(i):
+    return {
+        "Id": dataset_id(i),
+        "Type": "Dataset",
+        "title": f"Dataset {i}",
+        "description": "Synthetic dataset for benchmarking",
+        "keywords": ["benchmark", f"keyword-{i % 50}"],
+        "accrualPeriodicity": "hourly",
+        "accessRights": "public",
+        "objective": "Benchmarking",
+        "contactPoint": {"name": "Tim", "email": "tim@oslo.kommune.no"},
+        "publisher": "REN",
+        "state": "active",
+        "source": {"type": "file"},
+        "wasDerivedFrom": {"name": f"pipeline-{i % 10}"},
+    }
+
+
+def _catalog_items():
+    for i in range(NUM_DATASETS):
+        ds_id = dataset_id(i)
+        yield _dataset(i)
+        yield {"Id": f"{ds_id}/1", "Type": "Version", "version": "1"}
+        yield {
+            "Id": f"{ds_id}/latest",
+            "Type": "Version",
+            "version": "1",
+            "latest": f"{ds_id}/1",
+        }
+
+    for ds_id in deep_dataset_ids():
+        for e in range(EDITIONS_PER_VERSION):
+            edition_id = f"{ds_id}/1/{edition_name(e)}"
+            edition = {
+                "Id": edition_id,
+                "Type": "Edition",
+                "edition": edition_name(e),
+                "description": f"Edition {e}",
+            }
+            yield edition
+
+            for d in range(DISTRIBUTIONS_PER_EDITION):
+                yield {
+                    "Id": f"{edition_id}/{d}",
+                    "Type": "Distribution",
+                    "distribution_type": "file",
+                    "filename": f"file-{d}.csv",
+                    "content_type": "text/csv",
+                    "size": Decimal(1024 * d),
+                }
+
+        yield {**edition, "Id": f"{ds_id}/1/latest", "latest": edition_id}
+
+
+def seed_catalog(table):
+    """Fill `table` with the synthetic catalog, return the number of items."""
+    n = 0
+    for item in _catalog_items():
+        table.put_item(Item=item)
+        n += 1
+    return n
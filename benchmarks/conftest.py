@@ -0,0 +1,107 @@
+import os
+
+import pytest
+
+# The handlers look up the metadata table when imported, so the in-memory
+# backend must be selected before any of them are.
+os.environ["METADATA_STORAGE"] = "memory"
+
+from benchmarks.catalog import seed_catalog  # noqa: E402
+from benchmarks.harness import (  # noqa: E402
+    DynamoDBCallCounter,
+    load_baselines,
+    measure,
+    regressions,
+    save_baselines,
+)
+from metadata.storage import memory_metadata_table  # noqa: E402
+from tests.conftest import (  # noqa: E402,F401
+    auth_mock,
+    good_token,
+    lambda_event_factory,
+    mock_client_secret,
+    okdata_permission_api_mock,
+    raw_dataset,
+)
+
+_measurements = {}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--save-baselines",
+        action="store_true",
+        help="Store the measurements as the new benchmark baselines.",
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if session.config.getoption("--save-baselines") and _measurements:
+        save_baselines(
+            {
+                **load_baselines(),
+                **{name: m.baseline() for name, m in _measurements.items()},
+            }
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _measurements:
+        return
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(
+        f"{'name':<32} {'latency (ms)':>12} {'relative':>9} {'peak (KiB)':>11} "
+        f"{'DynamoDB':>9}"
+    )
+    for name, m in sorted(_measurements.items()):
+        terminalreporter.write_line(
+            f"{name:<32} {m.latency_ms:>12} {m.relative_latency:>9} "
+            f"{m.peak_kb:>11} {m.dynamodb_calls:>9}"
+        )
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    """The in-memory metadata table, seeded with the synthetic catalog."""
+    table = memory_metadata_table()
+    seed_catalog(table)
+    return table
+
+
+@pytest.fixture(scope="session")
+def call_counter(catalog):
+    return DynamoDBCallCounter(catalog)
+
+
+@pytest.fixture
+def event():
+    return lambda_event_factory()
+
+
+@pytest.fixture
+def auth_event():
+    return lambda_event_factory(good_token)
+
+
+@pytest.fixture
+def benchmark(request, call_counter):
+    """Return a function measuring a benchmark and checking it for regressions.
+
+    The measurement is compared against the stored baseline of the same name,
+    unless the baselines are being saved anew.
+    """
+    saving = request.config.getoption("--save-baselines")
+    baselines = load_baselines()
+
+    def run(name, fn, rounds=20, setup=None):
+        measurement = measure(fn, call_counter, rounds, setup)
+        _measurements[name] = measurement
+
+        if not saving and name in baselines:
+            problems = regressions(measurement, baselines[name])
+            assert not problems, f"{name}: {'; '.join(problems)}"
+
+        return measurement
+
+    return run
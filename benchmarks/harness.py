@@ -0,0 +1,209 @@
+"""Measurement of benchmarks and comparison against stored baselines."""
+
+import json
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+# The operations of a table that count as DynamoDB calls.
+DYNAMODB_OPERATIONS = [
+    "get_item",
+    "put_item",
+    "delete_item",
+    "update_item",
+    "query",
+    "transact_write_items",
+]
+
+# How much worse than the baseline a measurement may be before it's considered
+# a regression. Latencies are compared relative to the calibration loop (see
+# `calibrate`), which evens out differences between machines, but not the
+# noise of a busy one, hence the generous threshold, which can be adjusted
+# through `BENCHMARK_LATENCY_THRESHOLD`. DynamoDB calls are deterministic, so
+# any increase is a regression.
+LATENCY_THRESHOLD = float(os.environ.get("BENCHMARK_LATENCY_THRESHOLD", 2.0))
+ALLOCATION_THRESHOLD = 1.5
+
+# Latency differences below this many milliseconds are considered noise.
+LATENCY_NOISE_MS = 1.0
+
+
+# Items that the calibration loop serializes and sorts, like the handlers do.
+_CALIBRATION_ITEMS = [
+    {
+        "Id": f"calibration-{i}",
+        "Type": "Dataset",
+        "title": f"Calibration {i}",
+        "keywords": ["a", "b", "c"],
+        "n": i,
+    }
+    for i in range(200)
+]
+
+
+@dataclass
+class Baseline:
+    """A stored measurement, independent of the machine it was made on.
+
+    `relative_latency` is the latency in multiples of the calibration loop.
+    """
+
+    relative_latency: float
+    peak_kb: float
+    dynamodb_calls: int
+
+
+@dataclass
+class Measurement:
+    latency_ms: float
+    calibration_ms: float
+    peak_kb: float
+    dynamodb_calls: int
+
+    @property
+    def relative_latency(self):
+        return round(self.latency_ms / self.calibration_ms, 3)
+
+    def baseline(self):
+        return Baseline(self.relative_latency, self.peak_kb, self.dynamodb_calls)
+
+
+class DynamoDBCallCounter:
+    """Counts the calls made on the operations of `table`.
+
+    The operations are wrapped on the table instance itself, so calls made
+    through `table.meta.client` are counted as well.
+    """
+
+    def __init__(self, table):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+        for name in DYNAMODB_OPERATIONS:
+            setattr(table, name, self._counting(getattr(table, name)))
+
+    def _counting(self, operation):
+        def wrapper(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            return operation(*args, **kwargs)
+
+        return wrapper
+
+
+def _calibration_loop():
+    for _ in range(5):
+        items = json.loads(json.dumps(_CALIBRATION_ITEMS))
+        sorted(items, key=lambda item: item["title"], reverse=True)
+
+
+def calibrate(rounds=20):
+    """Return the median latency in milliseconds of the calibration loop.
+
+    The loop does the same kind of work as the handlers, so that latencies
+    relative to it are comparable across machines.
+    """
+    latencies = []
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _calibration_loop()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(latencies)
+
+
+def measure(fn, call_counter, rounds, setup=None):
+    """Return a `Measurement` of calling `fn` `rounds` times.
+
+    The latency is the median of the rounds, and the DynamoDB calls those of a
+    single round. The calibration loop is timed right before, under the same
+    conditions. Allocations are measured in a separate round, as tracing them
+    slows everything down. `setup` is called before every round, outside of
+    the measurements.
+    """
+    calibration_ms = calibrate()
+    latencies = []
+    calls = 0
+
+    for _ in range(rounds):
+        if setup:
+            setup()
+        calls_before = call_counter.calls
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+        calls += call_counter.calls - calls_before
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        latency_ms=round(statistics.median(latencies), 3),
+        calibration_ms=round(calibration_ms, 3),
+        peak_kb=round(peak / 1024, 1),
+        dynamodb_calls=calls // rounds,
+    )
+
+
+def assert_status(response, status=200):
+    """Assert that the handler `response` has HTTP status code `status`."""
+    assert response["statusCode"] == status, response["body"]
+
+
+def regressions(measurement, baseline):
+    """Return descriptions of how `measurement` regressed from `baseline`."""
+    problems = []
+
+    if measurement.dynamodb_calls > baseline.dynamodb_calls:
+        problems.append(
+            f"DynamoDB calls increased from {baseline.dynamodb_calls} "
+            f"to {measurement.dynamodb_calls}"
+        )
+    # The baseline's latency on this machine.
+    baseline_ms = baseline.relative_latency * measurement.calibration_ms
+    if measurement.latency_ms > max(
+        baseline_ms * LATENCY_THRESHOLD, baseline_ms + LATENCY_NOISE_MS
+    ):
+        problems.append(
+            f"Latency increased from {baseline.relative_latency} "
+            f"to {measurement.relative_latency} times the calibration loop "
+            f"({measurement.latency_ms} ms)"
+        )
+    if measurement.peak_kb > baseline.peak_kb * ALLOCATION_THRESHOLD:
+        problems.append(
+            f"Peak allocations increased from {baseline.peak_kb} KiB "
+            f"to {measurement.peak_kb} KiB"
+        )
+
+    return problems
+
+
+def load_baselines():
+    if not BASELINES_PATH.exists():
+        return {}
+
+    with open(BASELINES_PATH) as f:
+        return {name: Baseline(**baseline) for name, baseline in json.load(f).items()}
+
+
+def save_baselines(baselines):
+    with open(BASELINES_PATH, "w") as f:
+        json.dump(
+            {name: asdict(b) for name, b in sorted(baselines.items())},
+            f,
+            indent=2,
+        )
+        f.write("\n")
@@ -0,0 +1,78 @@
+from itertools import count
+
+from benchmarks.catalog import NUM_DATASETS, dataset_id, deep_dataset_ids
+from benchmarks.harness import assert_status
+from metadata.dataset import handler as dataset_handler
+from metadata.dataset.snapshot import ListingSnapshotRepository
+
+_titles = (f"Benchmark dataset {i}" for i in count())
+
+
+def test_get_datasets(benchmark, catalog, event):
+    benchmark(
+        "get_datasets",
+        lambda: assert_status(dataset_handler.get_datasets(event(), None)),
+        rounds=5,
+    )
+
+
+def test_get_datasets_snapshot(benchmark, catalog, event, monkeypatch):
+    monkeypatch.setenv("ENABLE_CATALOG_SNAPSHOT", "true")
+    ListingSnapshotRepository().apply({})
+    benchmark(
+        "get_datasets_snapshot",
+        lambda: assert_status(dataset_handler.get_datasets(event(), None)),
+        rounds=5,
+    )
+
+
+def test_get_datasets_derived_from(benchmark, catalog, event):
+    e = event(query_params={"was_derived_from_name": "pipeline-3"})
+    benchmark(
+        "get_datasets_derived_from",
+        lambda: assert_status(dataset_handler.get_datasets(e, None)),
+        rounds=5,
+    )
+
+
+def test_get_dataset(benchmark, catalog, event):
+    e = event(dataset=dataset_id(NUM_DATASETS // 2))
+    benchmark(
+        "get_dataset", lambda: assert_status(dataset_handler.get_dataset(e, None))
+    )
+
+
+def test_get_dataset_embed_versions(benchmark, catalog, event):
+    e = event(dataset=dataset_id(NUM_DATASETS // 2), query_params={"embed": "versions"})
+    benchmark(
+        "get_dataset_embed_versions",
+        lambda: assert_status(dataset_handler.get_dataset(e, None)),
+    )
+
+
+def test_get_code_examples(benchmark, catalog, event):
+    e = event(dataset=deep_dataset_ids()[0])
+    benchmark(
+        "get_code_examples",
+        lambda: assert_status(dataset_handler.get_code_examples(e, None)),
+    )
+
+
+def test_create_dataset(benchmark, catalog, auth_event, raw_dataset):
+    benchmark(
+        "create_dataset",
+        lambda: assert_status(
+            dataset_handler.create_dataset(
+                auth_event({**raw_dataset, "title": next(_titles)}), None
+            ),
+            201,
+        ),
+        rounds=10,
+    )
+
+
+def test_patch_dataset(benchmark, catalog, auth_event):
+    e = auth_event({"title": "Patched"}, dataset=dataset_id(NUM_DATASETS - 1))
+    benchmark(
+        "patch_dataset", lambda: assert_status(dataset_handler.patch_dataset(e, None))
+    )
@@ -0,0 +1,38 @@
+from benchmarks.catalog import deep_dataset_ids, edition_name
+from benchmarks.harness import assert_status
+from metadata.distribution import handler as distribution_handler
+
+
+def test_get_distributions(benchmark, catalog, event):
+    e = event(dataset=deep_dataset_ids()[3], version="1", edition=edition_name(10))
+    benchmark(
+        "get_distributions",
+        lambda: assert_status(distribution_handler.get_distributions(e, None)),
+    )
+
+
+def test_get_distribution(benchmark, catalog, event):
+    e = event(
+        dataset=deep_dataset_ids()[3],
+        version="1",
+        edition=edition_name(10),
+        distribution="2",
+    )
+    benchmark(
+        "get_distribution",
+        lambda: assert_status(distribution_handler.get_distribution(e, None)),
+    )
+
+
+def test_create_distribution(benchmark, catalog, auth_event):
+    e = auth_event(
+        {"distribution_type": "file", "filename": "benchmark.csv"},
+        dataset=deep_dataset_ids()[4],
+        version="1",
+        edition=edition_name(20),
+    )
+    benchmark(
+        "create_distribution",
+        lambda: assert_status(distribution_handler.create_distribution(e, None), 201),
+        rounds=10,
+    )
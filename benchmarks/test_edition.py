@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+from benchmarks.catalog import deep_dataset_ids, edition_name
+from benchmarks.harness import assert_status
+from metadata.edition import handler as edition_handler
+
+_timestamps = (
+    (datetime(2021, 1, 1, tzinfo=timezone.utc) + timedelta(hours=h)).isoformat()
+    for h in count()
+)
+
+
+def test_get_editions(benchmark, catalog, event):
+    e = event(dataset=deep_dataset_ids()[1], version="1")
+    benchmark(
+        "get_editions", lambda: assert_status(edition_handler.get_editions(e, None))
+    )
+
+
+def test_get_editions_latest(benchmark, catalog, event):
+    e = event(
+        dataset=deep_dataset_ids()[1],
+        version="1",
+        query_params={"order": "desc", "limit": "10"},
+    )
+    benchmark(
+        "get_editions_latest",
+        lambda: assert_status(edition_handler.get_editions(e, None)),
+    )
+
+
+def test_get_edition(benchmark, catalog, event):
+    e = event(dataset=deep_dataset_ids()[1], version="1", edition=edition_name(50))
+    benchmark(
+        "get_edition", lambda: assert_status(edition_handler.get_edition(e, None))
+    )
+
+
+def test_create_edition(benchmark, catalog, auth_event):
+    ds_id = deep_dataset_ids()[2]
+    benchmark(
+        "create_edition",
+        lambda: assert_status(
+            edition_handler.create_edition(
+                auth_event(
+                    {"edition": next(_timestamps), "description": "Benchmark"},
+                    dataset=ds_id,
+                    version="1",
+                ),
+                None,
+            ),
+            201,
+        ),
+        rounds=10,
+    )
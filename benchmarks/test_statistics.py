@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from benchmarks.catalog import NUM_DATASETS, dataset_id
+from benchmarks.harness import assert_status
+from metadata.statistics.handler import get_read_statistics
+from metadata.statistics.repository import StatisticsRepository
+
+STATISTICS_DATASET_ID = dataset_id(NUM_DATASETS // 4)
+
+# Number of hours of read statistics for the dataset.
+STATISTICS_HOURS = 30 * 24
+
+
+@pytest.fixture(scope="module")
+def statistics(catalog):
+    statistics_repository = StatisticsRepository()
+    start = datetime(2020, 1, 1)
+
+    for h in range(STATISTICS_HOURS):
+        hour = (start + timedelta(hours=h)).strftime("%Y%m%d%H")
+        statistics_repository.add_read_statistics(
+            STATISTICS_DATASET_ID, hour, 10, 1000, 1, [f"user-{h % 7}"]
+        )
+
+
+def test_get_read_statistics(benchmark, statistics, event):
+    e = event(dataset=STATISTICS_DATASET_ID)
+    benchmark(
+        "get_read_statistics",
+        lambda: assert_status(get_read_statistics(e, None)),
+    )
+
+
+def test_get_read_statistics_range(benchmark, statistics, event):
+    e = event(
+        dataset=STATISTICS_DATASET_ID,
+        query_params={"since": "2020-01-10T00:00:00", "until": "2020-01-11T00:00:00"},
+    )
+    benchmark(
+        "get_read_statistics_range",
+        lambda: assert_status(get_read_statistics(e, None)),
+    )
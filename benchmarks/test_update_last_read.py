@@ -0,0 +1,73 @@
+import boto3
+import pytest
+from freezegun import freeze_time
+from moto import mock_aws
+
+from benchmarks.catalog import NUM_DATASETS, dataset_id
+from jobs.update_last_read.checkpoint import CHECKPOINT_ID
+from jobs.update_last_read.handler import handler
+from metadata.util import getenv
+
+LOG_HOUR = "2020-01-01-00"
+
+# The size of the synthetic access logs of `LOG_HOUR`.
+NUM_LOG_OBJECTS = 50
+LINES_PER_LOG_OBJECT = 20
+
+_log_line = (
+    "ed45d9ae794cbbf2b6eb8515794b5f986a56375ba87b120c5a784c2710c9dd12 "
+    "ok-origo-dataplatform-dev [01/Jan/2020:00:{minute:02}:00 +0000] 12.34.45.67 "
+    "arn:aws:sts::123456789000:assumed-role/{requester} 2DAB5FDCE12E0C7D "
+    "REST.GET.OBJECT raw/green/{dataset_id}/version%253D1/edition%253D1/data.csv "
+    '"GET /raw/green/{dataset_id}/version%3D1/edition%3D1/data.csv HTTP/1.1" '
+    '200 - 1024 1024 12 11 "-" "aws-internal/3" - '
+    "gnhk3nmips5hDQ7K0rwTnT18 SigV4 ECDHE-RSA-AES128-SHA AuthHeader "
+    "ok-origo-dataplatform-dev.s3.eu-west-1.amazonaws.com TLSv1.2\n"
+)
+
+
+def _log_object(n):
+    return "".join(
+        _log_line.format(
+            minute=i % 60,
+            requester=f"role-{i % 5}",
+            dataset_id=dataset_id((n * LINES_PER_LOG_OBJECT + i) % NUM_DATASETS),
+        )
+        for i in range(LINES_PER_LOG_OBJECT)
+    ).encode()
+
+
+@pytest.fixture
+def access_logs():
+    with mock_aws():
+        s3 = boto3.client("s3")
+        bucket = getenv("LOGS_BUCKET_NAME")
+        s3.create_bucket(
+            Bucket=bucket,
+            CreateBucketConfiguration={"LocationConstraint": getenv("AWS_REGION")},
+        )
+
+        for n in range(NUM_LOG_OBJECTS):
+            s3.put_object(
+                Bucket=bucket,
+                Key=f"logs/s3/{getenv('DATA_BUCKET_NAME')}/{LOG_HOUR}-00-00-{n:016X}",
+                Body=_log_object(n),
+            )
+
+        yield
+
+
+# The harness is ignored so that it still measures real time.
+@freeze_time("2020-01-01-02", ignore=["benchmarks.harness"])
+def test_update_last_read(benchmark, catalog, access_logs):
+    # The checkpoints of the hour's log objects are removed once it completes,
+    # leaving only the latest complete hour to reset.
+    def reset_checkpoints():
+        catalog.delete_item(Key={"Id": CHECKPOINT_ID, "Type": "LastReadCheckpoint"})
+
+    benchmark(
+        "update_last_read",
+        lambda: handler({}, {}),
+        rounds=5,
+        setup=reset_checkpoints,
+    )
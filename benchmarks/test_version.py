@@ -0,0 +1,35 @@
+from itertools import count
+
+from benchmarks.catalog import NUM_DATASETS, dataset_id
+from benchmarks.harness import assert_status
+from metadata.version import handler as version_handler
+
+_versions = (str(v) for v in count(2))
+
+
+def test_get_versions(benchmark, catalog, event):
+    e = event(dataset=dataset_id(NUM_DATASETS // 3))
+    benchmark(
+        "get_versions", lambda: assert_status(version_handler.get_versions(e, None))
+    )
+
+
+def test_get_version(benchmark, catalog, event):
+    e = event(dataset=dataset_id(NUM_DATASETS // 3), version="1")
+    benchmark(
+        "get_version", lambda: assert_status(version_handler.get_version(e, None))
+    )
+
+
+def test_create_version(benchmark, catalog, auth_event):
+    ds_id = dataset_id(NUM_DATASETS - 2)
+    benchmark(
+        "create_version",
+        lambda: assert_status(
+            version_handler.create_version(
+                auth_event({"version": next(_versions)}, dataset=ds_id), None
+            ),
+            201,
+        ),
+        rounds=10,
+    )
@@ -0,0 +1,128 @@
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from aws_xray_sdk.core import patch_all, xray_recorder
+
+from jobs.edition_retention.policy import RetentionPolicy
+from metadata import coldstart
+from metadata.dataset.repository import DatasetRepository
+from metadata.edition.repository import EditionRepository
+from metadata.error import DeleteConflict, ResourceNotFoundError
+from metadata.instrumentation import logging_wrapper
+from metadata.version.repository import VersionRepository
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", logging.INFO))
+
+with coldstart.phase("xray_patch"):
+    patch_all()
+
+# Number of editions to delete before pausing, and the length of the pause.
+# Each edition deletion cascades to its distributions and their data in S3, so
+# keep the pace down to avoid hogging the table's write capacity.
+BATCH_SIZE = 25
+BATCH_DELAY_SECONDS = 1
+
+# Maximum number of editions to delete in a single run. Any remaining expired
+# editions are picked up by the next run.
+MAX_DELETIONS_PER_RUN = 500
+
+
+def _expired_editions(edition_repository, dataset_id, version, policy, now):
+    """Return the IDs of the expired editions of `version` of `dataset_id`.
+
+    The edition currently pointed to by "latest" is never considered expired.
+    """
+    editions = edition_repository.get_editions(dataset_id, version)
+    latest = edition_repository.get_edition(dataset_id, version, "latest")
+    latest_id = latest["Id"] if latest else None
+
+    return [
+        edition_id
+        for edition_id in policy.expired([e["Id"] for e in editions], now)
+        if edition_id != latest_id
+    ]
+
+
+def _delete_editions(edition_repository, edition_ids):
+    """Delete `edition_ids` along with their distributions in batches.
+
+    Return a tuple of the deleted and failed edition IDs.
+    """
+    deleted = []
+    failed = []
+
+    for i in range(0, len(edition_ids), BATCH_SIZE):
+        if i > 0:
+            time.sleep(BATCH_DELAY_SECONDS)
+
+        for edition_id in edition_ids[i : i + BATCH_SIZE]:
+            try:
+                edition_repository.delete_item(edition_id, cascade=True)
+                deleted.append(edition_id)
+            except (DeleteConflict, ResourceNotFoundError, ValueError) as e:
+                logger.warning(f"Couldn't delete edition {edition_id}: {e}")
+                failed.append(edition_id)
+
+    return deleted, failed
+
+
+@logging_wrapper
+@xray_recorder.capture("handler")
+def handler(event, context):
+    dry_run = bool((event or {}).get("dry_run"))
+    now = datetime.now(timezone.utc)
+
+    dataset_repository = DatasetRepository()
+    version_repository = VersionRepository()
+    edition_repository = EditionRepository()
+
+    expired = []
+
+    for dataset in dataset_repository.get_datasets():
+        policy = RetentionPolicy.from_dataset(dataset)
+
+        if not policy:
+            continue
+
+        dataset_id = dataset["Id"]
+
+        if dataset.get("state") == "maintenance":
+            logger.info(f"Dataset {dataset_id} is in maintenance; skipping")
+            continue
+
+        for version in version_repository.get_versions(dataset_id):
+            version_name = version["Id"].split("/")[-1]
+            expired.extend(
+                _expired_editions(
+                    edition_repository, dataset_id, version_name, policy, now
+                )
+            )
+
+    logger.info(f"Found {len(expired)} expired editions")
+
+    if len(expired) > MAX_DELETIONS_PER_RUN:
+        logger.info(f"Deleting the first {MAX_DELETIONS_PER_RUN} this run")
+        expired = expired[:MAX_DELETIONS_PER_RUN]
+
+    if dry_run:
+        logger.info("Dry run; would have deleted:")
+        for edition_id in expired:
+            logger.info(f" - {edition_id}")
+        return
+
+    deleted, failed = _delete_editions(edition_repository, expired)
+
+    logger.info("Deleted editions:")
+    if deleted:
+        for edition_id in deleted:
+            logger.info(f" - {edition_id}")
+    else:
+        logger.info(" None")
+
+    if failed:
+        logger.info("Failed editions:")
+        for edition_id in failed:
+            logger.info(f" - {edition_id}")
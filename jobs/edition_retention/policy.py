@@ -0,0 +1,71 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from metadata.edition.repository import edition_fmt
+
+logger = logging.getLogger()
+
+
+@dataclass
+class RetentionPolicy:
+    """A retention policy for the editions of a dataset.
+
+    An edition is kept as long as it's either among the `keep_last` most
+    recent editions, or younger than `keep_days` days.
+    """
+
+    keep_last: int | None = None
+    keep_days: int | None = None
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        """Return the retention policy of `dataset`.
+
+        If `dataset` doesn't have a retention policy, return `None`.
+        """
+        retention = dataset.get("retention")
+
+        if not retention:
+            return None
+
+        keep_last = retention.get("keep_last")
+        keep_days = retention.get("keep_days")
+
+        return cls(
+            int(keep_last) if keep_last is not None else None,
+            int(keep_days) if keep_days is not None else None,
+        )
+
+    def expired(self, edition_ids, now):
+        """Return the IDs among `edition_ids` that have expired at `now`.
+
+        `edition_ids` must be sorted chronologically. Editions whose name
+        isn't a timestamp never expire, and don't count towards `keep_last`.
+        """
+        if self.keep_last is None and self.keep_days is None:
+            return []
+
+        candidates = [e for e in edition_ids if _edition_time(e) is not None]
+
+        if self.keep_last is not None:
+            candidates = candidates[: max(len(candidates) - self.keep_last, 0)]
+
+        if self.keep_days is not None:
+            cutoff = now - timedelta(days=self.keep_days)
+            candidates = [e for e in candidates if _edition_time(e) < cutoff]
+
+        return candidates
+
+
+def _edition_time(edition_id):
+    """Return the time of `edition_id` as a timezone aware `datetime`.
+
+    Return `None` if the edition's name isn't a timestamp.
+    """
+    edition = edition_id.split("/")[-1]
+    try:
+        return datetime.strptime(edition, edition_fmt).replace(tzinfo=timezone.utc)
+    except ValueError:
+        logger.warning(f"Edition {edition_id} isn't named by time; keeping it")
+        return None
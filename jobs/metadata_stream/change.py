@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+
+from boto3.dynamodb.types import TypeDeserializer
+
+_deserializer = TypeDeserializer()
+
+
+def _deserialize(image):
+    if image is None:
+        return None
+    return {k: _deserializer.deserialize(v) for k, v in image.items()}
+
+
+@dataclass(frozen=True)
+class Change:
+    """A change of an item in the metadata table, from a DynamoDB stream.
+
+    `event_name` is one of `INSERT`, `MODIFY` and `REMOVE`. The images are
+    the item before and after the change, as plain dictionaries; the old one
+    is `None` for inserts and the new one `None` for removals.
+    """
+
+    event_name: str
+    item_id: str
+    item_type: str
+    old_image: dict | None
+    new_image: dict | None
+    sequence_number: str
+
+    @classmethod
+    def from_stream_record(cls, record):
+        """Return a `Change` of DynamoDB stream record `record`.
+
+        The stream must be configured to include both the old and the new
+        images of the items (`NEW_AND_OLD_IMAGES`).
+        """
+        dynamodb = record["dynamodb"]
+        keys = _deserialize(dynamodb["Keys"])
+
+        return cls(
+            event_name=record["eventName"],
+            item_id=keys["Id"],
+            item_type=keys["Type"],
+            old_image=_deserialize(dynamodb.get("OldImage")),
+            new_image=_deserialize(dynamodb.get("NewImage")),
+            sequence_number=dynamodb["SequenceNumber"],
+        )
+
+    @property
+    def dataset_id(self):
+        """The ID of the dataset the changed item belongs to."""
+        return self.item_id.split("/", 1)[0]
@@ -0,0 +1,50 @@
+import logging
+import os
+import time
+
+from aws_xray_sdk.core import patch_all, xray_recorder
+from okdata.aws.logging import log_add
+
+from jobs.metadata_stream.change import Change
+from jobs.metadata_stream.subscribers import enabled_subscribers
+from metadata import coldstart
+from metadata.instrumentation import logging_wrapper
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", logging.INFO))
+
+with coldstart.phase("xray_patch"):
+    patch_all()
+
+
+def process_changes(changes):
+    """Hand `changes` to every enabled subscriber.
+
+    Return the time spent by each subscriber in milliseconds.
+    """
+    durations = {}
+
+    for name, f in enabled_subscribers():
+        start_time = time.perf_counter_ns()
+        f(changes)
+        durations[name] = round((time.perf_counter_ns() - start_time) / 1000000.0, 3)
+
+    return durations
+
+
+@logging_wrapper
+@xray_recorder.capture("handler")
+def handler(event, context):
+    """Process a batch of DynamoDB stream records of the metadata table.
+
+    Should a subscriber fail, the error is reraised so that the whole batch is
+    retried.
+    """
+    changes = [Change.from_stream_record(r) for r in event.get("Records", [])]
+    log_add(
+        stream_records=len(changes),
+        stream_datasets=len({c.dataset_id for c in changes}),
+    )
+
+    if changes:
+        log_add(subscriber_duration_ms=process_changes(changes))
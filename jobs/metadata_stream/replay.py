@@ -0,0 +1,132 @@
+"""Feed synthetic DynamoDB stream events to the metadata stream consumer.
+
+Builds stream events like the ones DynamoDB Streams delivers, for running the
+consumer and its subscribers locally or in tests. From the command line, the
+changes are read from a JSON file holding a list of objects with the old
+and/or new image of an item:
+
+    python -m jobs.metadata_stream.replay changes.json
+
+The event name of each change is derived from which images are present,
+unless given as `eventName`. Changes are delivered in batches of
+`--batch-size` records.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+from decimal import Decimal
+from types import SimpleNamespace
+
+from boto3.dynamodb.types import TypeSerializer
+
+from metadata.storage import METADATA_TABLE_NAME
+
+EVENT_SOURCE_ARN = (
+    f"arn:aws:dynamodb:eu-west-1:000000000000:table/{METADATA_TABLE_NAME}"
+    "/stream/1970-01-01T00:00:00.000"
+)
+
+_serializer = TypeSerializer()
+_sequence_numbers = itertools.count(1)
+
+
+def _serialize(item):
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+def _key(item):
+    return item["Id"], item["Type"]
+
+
+def _event_name(old_image, new_image):
+    if old_image is None:
+        return "INSERT"
+    if new_image is None:
+        return "REMOVE"
+    return "MODIFY"
+
+
+def stream_record(old_image=None, new_image=None, event_name=None):
+    """Return a stream record of an item changing from `old_image` to `new_image`.
+
+    Either image may be `None`, for inserted and removed items respectively.
+    """
+    image = new_image if new_image is not None else old_image
+    dynamodb = {
+        "Keys": _serialize({"Id": image["Id"], "Type": image["Type"]}),
+        "SequenceNumber": str(next(_sequence_numbers)).zfill(21),
+        "StreamViewType": "NEW_AND_OLD_IMAGES",
+    }
+    if old_image is not None:
+        dynamodb["OldImage"] = _serialize(old_image)
+    if new_image is not None:
+        dynamodb["NewImage"] = _serialize(new_image)
+
+    return {
+        "eventID": dynamodb["SequenceNumber"],
+        "eventName": event_name or _event_name(old_image, new_image),
+        "eventSource": "aws:dynamodb",
+        "eventSourceARN": EVENT_SOURCE_ARN,
+        "dynamodb": dynamodb,
+    }
+
+
+def stream_event(records):
+    """Return a stream event delivering `records`."""
+    return {"Records": list(records)}
+
+
+def diff_records(before, after):
+    """Return stream records of the changes from items `before` to `after`.
+
+    Items are matched by their key, and unchanged items are left out.
+    """
+    old_items = {_key(item): item for item in before}
+    new_items = {_key(item): item for item in after}
+
+    return [
+        stream_record(old_items.get(k), new_items.get(k))
+        for k in [*old_items, *(k for k in new_items if k not in old_items)]
+        if old_items.get(k) != new_items.get(k)
+    ]
+
+
+def replay(changes, batch_size=100):
+    """Feed `changes` to the stream consumer in batches of `batch_size`.
+
+    `changes` is a list of objects like the ones read from the command line.
+    Return the handler's responses.
+    """
+    from jobs.metadata_stream.handler import handler
+
+    records = [
+        stream_record(c.get("OldImage"), c.get("NewImage"), c.get("eventName"))
+        for c in changes
+    ]
+    context = SimpleNamespace(
+        aws_request_id="replay",
+        function_name="metadata-stream-replay",
+        function_version="$LATEST",
+        memory_limit_in_mb=0,
+    )
+
+    return [
+        handler(stream_event(records[i : i + batch_size]), context)
+        for i in range(0, len(records), batch_size)
+    ]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("changes", help="JSON file with the changes to replay")
+    parser.add_argument(
+        "--batch-size", type=int, default=100, help="Records per stream event"
+    )
+    args = parser.parse_args()
+
+    with open(args.changes) as f:
+        replay(json.load(f, parse_float=Decimal), args.batch_size)
@@ -0,0 +1,66 @@
+"""Subscribers to the changes of the metadata table.
+
+A subscriber is a function taking a list of `Change`s, registered under a
+name with `subscriber`. Every batch of stream records is handed to each
+enabled subscriber in turn, in order of registration.
+
+A batch is retried when a subscriber fails, so subscribers must tolerate
+seeing the same changes more than once.
+"""
+
+import os
+from collections import Counter
+
+from okdata.aws.logging import log_add
+
+from metadata.dataset.snapshot import ListingSnapshotRepository
+
+_subscribers = {}
+
+
+def subscriber(name):
+    """Register the decorated function as the subscriber called `name`."""
+
+    def register(f):
+        _subscribers[name] = f
+        return f
+
+    return register
+
+
+def enabled_subscribers():
+    """Return the names and functions of the enabled subscribers.
+
+    Every subscriber is enabled, unless the environment variable
+    `METADATA_STREAM_SUBSCRIBERS` names the ones to enable, separated by
+    commas.
+    """
+    names = os.environ.get("METADATA_STREAM_SUBSCRIBERS")
+
+    if not names:
+        return list(_subscribers.items())
+
+    names = [name.strip() for name in names.split(",") if name.strip()]
+    if unknown := [name for name in names if name not in _subscribers]:
+        raise ValueError(f"Unknown stream subscribers: {', '.join(unknown)}")
+
+    return [(name, f) for name, f in _subscribers.items() if name in names]
+
+
+@subscriber("counters")
+def count_changes(changes):
+    """Log the number of changes by item type and event name."""
+    counts = Counter(f"{c.item_type}:{c.event_name}" for c in changes)
+    log_add(stream_changes=dict(sorted(counts.items())))
+
+
+@subscriber("listing_snapshot")
+def update_listing_snapshot(changes):
+    """Apply the changed datasets to the catalog listing snapshot.
+
+    See `metadata.dataset.snapshot`.
+    """
+    datasets = {c.item_id: c.new_image for c in changes if c.item_type == "Dataset"}
+
+    if datasets:
+        ListingSnapshotRepository().apply(datasets)
@@ -0,0 +1,141 @@
+"""Recompute `last_read` from the S3 access logs of an arbitrary time range.
+
+Unlike the hourly job, which handles a single hour of logs, this spreads the
+parsing of the logs across several processes to make use of every core when
+backfilling days or weeks of logs. It's meant to be run from the command line
+on a multi-core machine:
+
+    python -m jobs.update_last_read.backfill 2020-01-01T00 2020-02-01T00
+"""
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import boto3
+
+from jobs.update_last_read.handler import (
+    MAX_WORKERS,
+    _chunks,
+    _log_keys,
+    _merge_reads,
+    _object_reads,
+    _update_last_read,
+    hour_fmt,
+)
+from metadata.util import getenv
+
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", logging.INFO))
+
+# Number of log objects handed to a worker process at a time. Log objects are
+# small, so handing them out one by one would make the inter-process
+# communication dominate. Each chunk only sends back the latest read per
+# dataset.
+CHUNK_SIZE = 64
+
+
+# S3 client of the current worker process, set by `_init_worker`. Clients
+# can't be shared with the parent process, as their connections don't survive
+# a fork.
+_worker_s3 = None
+
+
+def _init_worker():
+    global _worker_s3
+    _worker_s3 = boto3.client("s3")
+
+
+def _hour_prefixes(data_bucket_name, start, end):
+    """Yield the log object key prefixes of every hour from `start` to `end`.
+
+    `end` is exclusive. Log objects are named by UTC hour, so `start` is
+    converted to UTC first.
+    """
+    hour = start.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    while hour < end:
+        yield f"logs/s3/{data_bucket_name}/{hour.strftime(hour_fmt)}"
+        hour += timedelta(hours=1)
+
+
+def _chunk_reads(logs_bucket_name, keys):
+    """Return the latest dataset reads found in the log objects `keys`."""
+    datasets_read = {}
+
+    for key in keys:
+        _merge_reads(datasets_read, _object_reads(_worker_s3, logs_bucket_name, key))
+
+    return datasets_read
+
+
+def backfill(start, end, max_workers=None, dry_run=False):
+    """Update `last_read` for datasets read from `start` up until `end`.
+
+    Return a dictionary mapping the IDs of the datasets read to their sortable
+    read times.
+    """
+    data_bucket_name = getenv("DATA_BUCKET_NAME")
+    logs_bucket_name = getenv("LOGS_BUCKET_NAME")
+    s3 = boto3.client("s3")
+
+    keys = (
+        key
+        for prefix in _hour_prefixes(data_bucket_name, start, end)
+        for key in _log_keys(s3, logs_bucket_name, prefix)
+    )
+    datasets_read = {}
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker
+    ) as executor:
+        futures = [
+            executor.submit(_chunk_reads, logs_bucket_name, chunk)
+            for chunk in _chunks(keys, CHUNK_SIZE)
+        ]
+        logger.info(f"Processing {len(futures)} chunks of log objects")
+
+        for future in futures:
+            _merge_reads(datasets_read, future.result())
+
+    if not dry_run:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            _update_last_read(datasets_read, executor)
+
+    return datasets_read
+
+
+def _parse_hour(value):
+    """Return ISO 8601 `value` as a UTC datetime.
+
+    Times without a UTC offset are assumed to be in UTC.
+    """
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+if __name__ == "__main__":
+    logging.basicConfig()
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("start", type=_parse_hour, help="Start time (inclusive)")
+    parser.add_argument("end", type=_parse_hour, help="End time (exclusive)")
+    parser.add_argument(
+        "--workers", type=int, help="Number of worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print the datasets read, don't update them",
+    )
+    args = parser.parse_args()
+
+    datasets_read = backfill(args.start, args.end, args.workers, args.dry_run)
+
+    if args.dry_run:
+        for dataset_id, t in sorted(datasets_read.items()):
+            print(f"{dataset_id}: {t}")
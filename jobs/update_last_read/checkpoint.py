@@ -0,0 +1,103 @@
+import time
+from datetime import timedelta
+
+from aws_xray_sdk.core import patch
+from boto3.dynamodb.conditions import Key
+
+from metadata.CommonRepository import CommonRepository, ID_COLUMN, TYPE_COLUMN
+from metadata.storage import metadata_table
+
+patch(["boto3"])
+
+CHECKPOINT_ID = "update-last-read"
+
+# How long the checkpoints of an hour in progress are kept, should they not be
+# removed when it completes (e.g. if the job stopped running). Removal is left
+# to the table's TTL on the `expires_at` attribute.
+CHECKPOINT_TTL = timedelta(days=7)
+
+
+class CheckpointRepository(CommonRepository):
+    """Progress of the `update_last_read` job through the S3 access logs.
+
+    Two kinds of checkpoint items are kept in the metadata table:
+
+    - A cursor item with ID `update-last-read`, recording the latest log hour
+      that has been completely processed.
+
+    - An item per log object processed so far in an hour in progress, with the
+      object's ETag. These are removed once the hour is complete. An hour may
+      have thousands of log objects, far more than would fit in a single item.
+
+      The items of an hour share the ID `update-last-read/{hour}`, while their
+      type is `LastReadCheckpoint/{key}`. That way they can be read back with
+      a consistent query on the table itself.
+    """
+
+    def __init__(self):
+        self.metadata_table = metadata_table()
+
+        super().__init__(self.metadata_table, "LastReadCheckpoint")
+
+    def _key(self, item_id):
+        return {ID_COLUMN: item_id, TYPE_COLUMN: self.type}
+
+    def _object_key(self, hour, key):
+        return {ID_COLUMN: f"{CHECKPOINT_ID}/{hour}", TYPE_COLUMN: f"{self.type}/{key}"}
+
+    def last_complete_hour(self):
+        """Return the latest completely processed hour, or `None`."""
+        item = self.get_item(CHECKPOINT_ID, consistent_read=True)
+        return item and item["hour"]
+
+    def processed_objects(self, hour):
+        """Return a dictionary of the log objects processed so far in `hour`.
+
+        The dictionary maps object keys to ETags.
+        """
+        prefix = f"{self.type}/"
+        items = self._query(
+            {
+                "KeyConditionExpression": Key(ID_COLUMN).eq(f"{CHECKPOINT_ID}/{hour}")
+                & Key(TYPE_COLUMN).begins_with(prefix),
+                "ConsistentRead": True,
+            }
+        )
+        return {item[TYPE_COLUMN][len(prefix) :]: item["etag"] for item in items}
+
+    def save_progress(self, hour, objects, executor=None):
+        """Record that the log objects `objects` in `hour` have been processed.
+
+        `objects` maps object keys to ETags. The checkpoint items are written
+        concurrently on `executor` when given.
+        """
+        expires_at = int(time.time() + CHECKPOINT_TTL.total_seconds())
+
+        def save(obj):
+            key, etag = obj
+            self._call_table(
+                "put_item",
+                client=True,
+                Item={
+                    **self._object_key(hour, key),
+                    "etag": etag,
+                    "expires_at": expires_at,
+                },
+            )
+
+        list((executor.map if executor else map)(save, objects.items()))
+
+    def complete_hour(self, hour, objects=(), executor=None):
+        """Record that every log object in `hour` has been processed.
+
+        The checkpoint items of `objects`, the keys of the hour's processed log
+        objects, are deleted concurrently on `executor` when given.
+        """
+        self._call_table("put_item", Item={**self._key(CHECKPOINT_ID), "hour": hour})
+
+        def delete(key):
+            self._call_table(
+                "delete_item", client=True, Key=self._object_key(hour, key)
+            )
+
+        list((executor.map if executor else map)(delete, objects))
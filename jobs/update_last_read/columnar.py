@@ -0,0 +1,62 @@
+import dataclasses
+import gzip
+import json
+
+from jobs.update_last_read.logrec import LogRecord
+
+# Log record fields holding integers, stored as such rather than as strings.
+INTEGER_FIELDS = {
+    "http_status",
+    "bytes_sent",
+    "object_size",
+    "total_time",
+    "turn_around_time",
+}
+
+
+class ColumnarLog:
+    """The fully parsed records of an S3 access log, stored column by column.
+
+    Meant for keeping a parsed copy of the access logs, so that later analyses
+    don't need to parse the text logs again. The result is a gzipped JSON
+    object mapping each `LogRecord` field name to a list of values, which most
+    tools can load directly (e.g. `pandas.DataFrame(json.load(f))`). Times are
+    stored as UNIX timestamps.
+    """
+
+    def __init__(self):
+        self.columns = {field.name: [] for field in dataclasses.fields(LogRecord)}
+
+    def add(self, log_record):
+        for name, values in self.columns.items():
+            value = getattr(log_record, name)
+
+            if name == "time":
+                value = int(log_record.datetime().timestamp())
+            elif name in INTEGER_FIELDS:
+                value = int(value) if value.isdigit() else None
+
+            values.append(value)
+
+    def tee(self, log_lines):
+        """Yield `log_lines` unchanged, adding each of them on the way."""
+        for log_line in log_lines:
+            self.add(LogRecord.from_log_line(log_line))
+            yield log_line
+
+    def __len__(self):
+        return len(self.columns["time"])
+
+    def dumps(self):
+        """Return the columns as gzipped JSON."""
+        return gzip.compress(json.dumps(self.columns).encode())
+
+
+def columnar_key(prefix, log_key):
+    """Return the key of the columnar copy of log object `log_key`.
+
+    The copies are grouped by the hour of the log object under `prefix`.
+    """
+    name = log_key.rsplit("/", 1)[-1].removesuffix(".gz").removesuffix(".zst")
+    # Log object names start with their time on the format YYYY-MM-DD-HH-MM-SS.
+    return f"{prefix}/{name[:13]}/{name}.json.gz"
@@ -1,11 +1,27 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from urllib.parse import unquote
 
 from metadata.common import CONFIDENTIALITIES, STAGES
 
+# Maximum number of S3 keys to remember the parse result of. The same objects
+# tend to be read over and over, so this saves a lot of repeated work.
+KEY_CACHE_SIZE = 65536
 
-@dataclass
+# fmt: off
+key_pattern = re.compile("/".join([
+    r"(?P<stage>[^/]+)",            # Stage
+    r"(?P<confidentiality>[^/]+)",  # Confidentiality
+    r"(?P<dataset>\S+)",            # Dataset
+    r"version=(?P<version>[^/]+)",  # Version
+    r"edition=(?P<edition>[^/]+)",  # Edition
+    r"(?P<filepath>.+)$",           # Filepath
+]))
+# fmt: on
+
+
+@dataclass(frozen=True)
 class DatasetEntry:
     """An S3 object entry that looks like it belongs to a dataset."""
 
@@ -17,28 +33,21 @@ class DatasetEntry:
     filepath: str
 
     @classmethod
+    @lru_cache(maxsize=KEY_CACHE_SIZE)
     def from_s3_key(cls, key):
         """Return a `DatasetEntry` object corresponding to `key`.
 
         If `key` doesn't look like it belongs to a dataset, return `None`.
+
+        Results are cached, including negative ones. Use
+        `DatasetEntry.from_s3_key.cache_info()` for cache statistics.
         """
         if isinstance(key, str):
             # Amazon URL-encodes the key twice for unknown reasons, so decode
             # it twice.
             key_unquoted = unquote(unquote(key))
 
-            # fmt: off
-            pattern = re.compile("/".join([
-                r"(?P<stage>[^/]+)",            # Stage
-                r"(?P<confidentiality>[^/]+)",  # Confidentiality
-                r"(?P<dataset>\S+)",            # Dataset
-                r"version=(?P<version>[^/]+)",  # Version
-                r"edition=(?P<edition>[^/]+)",  # Edition
-                r"(?P<filepath>.+)$",           # Filepath
-            ]))
-            # fmt: on
-
-            if match := pattern.search(key_unquoted):
+            if match := key_pattern.search(key_unquoted):
                 stage = match.group("stage")
                 confidentiality = match.group("confidentiality")
                 dataset = match.group("dataset").split("/")[-1]
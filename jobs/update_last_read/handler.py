@@ -1,67 +1,268 @@
+import gzip
+import io
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from operator import itemgetter
 
 import boto3
+import zstandard
 from aws_xray_sdk.core import patch_all, xray_recorder
-from okdata.aws.logging import logging_wrapper
+from okdata.aws.logging import log_add
 
+from jobs.update_last_read.columnar import ColumnarLog, columnar_key
+from jobs.update_last_read.checkpoint import CheckpointRepository
 from jobs.update_last_read.dataset import DatasetEntry
-from jobs.update_last_read.logrec import LogRecord
+from jobs.update_last_read.logrec import PartialLogRecord, from_sortable_time
+from jobs.update_last_read.statistics import ReadStatistics, merge_statistics
+from metadata import coldstart
+from metadata.common import STAGES
 from metadata.dataset.repository import DatasetRepository
+from metadata.error import ResourceNotFoundError
+from metadata.instrumentation import logging_wrapper
+from metadata.statistics.repository import StatisticsRepository
 from metadata.util import getenv
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get("LOG_LEVEL", logging.INFO))
 
-patch_all()
+with coldstart.phase("xray_patch"):
+    patch_all()
+
+# Substrings that every log line of a dataset read contains; the operation is
+# immediately followed by the key, which starts with a stage.
+DATASET_READ_MARKERS = tuple(f" REST.GET.OBJECT {stage}/" for stage in STAGES)
+
+# Number of log objects to fetch and parse concurrently.
+MAX_WORKERS = 16
+
+# Maximum number of log hours to process in a single run. When the job has
+# fallen further behind than this, it catches up over several runs.
+MAX_CATCH_UP_HOURS = 24
+
+# Number of log objects to process between each saved checkpoint.
+CHECKPOINT_INTERVAL = 500
+
+hour_fmt = "%Y-%m-%d-%H"
+
+# When set, a columnar copy of every log object processed is written to the
+# logs bucket under this prefix (see `columnar.ColumnarLog`).
+COLUMNAR_LOGS_PREFIX = os.environ.get("COLUMNAR_LOGS_PREFIX")
 
 
 def _two_hours_ago():
     """Return a UTC timestamp of two hours ago on the format YYYY-MM-DD-HH."""
-    return (datetime.now(timezone.utc) - timedelta(hours=2)).strftime("%Y-%m-%d-%H")
+    return (datetime.now(timezone.utc) - timedelta(hours=2)).strftime(hour_fmt)
 
 
-@logging_wrapper
-@xray_recorder.capture("handler")
-def handler(event, context):
-    s3 = boto3.resource("s3")
-    data_bucket_name = getenv("DATA_BUCKET_NAME")
-    logs_bucket_name = getenv("LOGS_BUCKET_NAME")
-    timestamp = _two_hours_ago()
-    prefix = f"logs/s3/{data_bucket_name}/{timestamp}"
+def _hours_to_process(last_complete_hour, until):
+    """Return the log hours to process, oldest first.
+
+    That is every hour after `last_complete_hour` up to and including `until`,
+    limited to the `MAX_CATCH_UP_HOURS` oldest ones. When there is no
+    `last_complete_hour`, only `until` is processed.
+    """
+    if not last_complete_hour:
+        return [until]
+
+    hour = datetime.strptime(last_complete_hour, hour_fmt)
+    end = datetime.strptime(until, hour_fmt)
+    hours = []
+
+    while (hour := hour + timedelta(hours=1)) <= end:
+        hours.append(hour.strftime(hour_fmt))
+        if len(hours) == MAX_CATCH_UP_HOURS:
+            break
+
+    return hours
+
+
+def _chunks(iterable, size):
+    """Yield lists of `size` consecutive elements from `iterable`."""
+    chunk = []
+
+    for element in iterable:
+        chunk.append(element)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _compression(key, content_encoding):
+    """Return the compression of log object `key`, or `None` if uncompressed.
+
+    The compression is given by the object's content encoding, falling back to
+    its file extension.
+    """
+    if content_encoding in ("gzip", "zstd"):
+        return content_encoding
+    if key.endswith(".gz"):
+        return "gzip"
+    if key.endswith(".zst"):
+        return "zstd"
+    return None
+
 
+def _raw_lines(s3, bucket, key):
+    """Return an iterator over the raw lines of log object `key`.
+
+    Compressed objects are decompressed on the fly as they're streamed.
+    """
+    obj = s3.get_object(Bucket=bucket, Key=key)
+    body = obj["Body"]
+    compression = _compression(key, obj.get("ContentEncoding"))
+
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=body)
+
+    if compression == "zstd":
+        return io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(body, read_across_frames=True)
+        )
+
+    return body.iter_lines()
+
+
+def _log_lines(raw_lines):
+    """Yield the non-empty lines of the raw lines `raw_lines` one at a time."""
+    for line in raw_lines:
+        if line := line.decode().strip():
+            yield line
+
+
+def _is_dataset_read(log_line):
+    """Return true if `log_line` could be a GET request on a dataset.
+
+    This is a cheap check meant for filtering out irrelevant log lines before
+    parsing them; a true result must be confirmed by parsing the line.
+    """
+    return any(marker in log_line for marker in DATASET_READ_MARKERS)
+
+
+def _latest_reads(log_lines, statistics=None):
+    """Return the time of the latest read of each dataset in `log_lines`.
+
+    The result is a dictionary mapping dataset IDs to sortable time strings
+    (see `logrec.sortable_time`). Only the latest read per dataset is kept in
+    memory, so `log_lines` can be an arbitrarily long iterable.
+
+    When given, the reads are also counted in the dictionary `statistics`,
+    mapping `(dataset_id, hour)` tuples to `ReadStatistics`.
+    """
     datasets_read = {}
-    dataset_repository = DatasetRepository()
 
-    for obj in s3.Bucket(logs_bucket_name).objects.filter(Prefix=prefix):
-        log_records = [
-            log_record
-            for log_record in map(
-                LogRecord.from_log_line,
-                obj.get()["Body"].read().decode().strip().split("\n"),
-            )
-            if log_record.operation == "REST.GET.OBJECT"
-        ]
+    for log_line in filter(_is_dataset_read, log_lines):
+        log_record = PartialLogRecord.from_log_line(log_line)
+
+        if log_record.operation != "REST.GET.OBJECT":
+            continue
+
+        if dataset_entry := DatasetEntry.from_s3_key(log_record.key):
+            dataset_id = dataset_entry.dataset_id
+            t = log_record.sortable_time()
+
+            if dataset_id not in datasets_read or datasets_read[dataset_id] < t:
+                datasets_read[dataset_id] = t
+
+            if statistics is not None:
+                # The first 10 characters of a sortable time is its hour.
+                key = (dataset_id, t[:10])
+                if key not in statistics:
+                    statistics[key] = ReadStatistics()
+                statistics[key].add(log_record)
+
+    return datasets_read
+
+
+def _merge_reads(datasets_read, other):
+    """Merge the dataset reads in `other` into `datasets_read`.
+
+    Keep the latest read time of each dataset. `datasets_read` is updated in
+    place and returned.
+    """
+    for dataset_id, t in other.items():
+        if dataset_id not in datasets_read or datasets_read[dataset_id] < t:
+            datasets_read[dataset_id] = t
 
-        for log_record in log_records:
-            if dataset_entry := DatasetEntry.from_s3_key(log_record.key):
-                dataset_id = dataset_entry.dataset_id
-                dt = log_record.datetime()
+    return datasets_read
 
-                if dataset_id not in datasets_read or datasets_read[dataset_id] < dt:
-                    datasets_read[dataset_id] = dt
 
+def _log_objects(s3, bucket, prefix):
+    """Yield the key and ETag of every log object in `bucket` under `prefix`."""
+    paginator = s3.get_paginator("list_objects_v2")
+
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            yield obj["Key"], obj["ETag"]
+
+
+def _log_keys(s3, bucket, prefix):
+    """Yield the keys of every log object in `bucket` starting with `prefix`."""
+    for key, _ in _log_objects(s3, bucket, prefix):
+        yield key
+
+
+def _object_reads(s3, bucket, key, statistics=None):
+    """Return the latest dataset reads found in the log object `key`.
+
+    The reads are also counted in `statistics` when given, like in
+    `_latest_reads`.
+    """
+    return _latest_reads(_log_lines(_raw_lines(s3, bucket, key)), statistics)
+
+
+def _object_reads_and_statistics(s3, bucket, key):
+    """Return the latest dataset reads and read statistics of log object `key`.
+
+    A columnar copy of the log object is written too when
+    `COLUMNAR_LOGS_PREFIX` is set.
+    """
+    statistics = {}
+    log_lines = _log_lines(_raw_lines(s3, bucket, key))
+
+    if not COLUMNAR_LOGS_PREFIX:
+        return _latest_reads(log_lines, statistics), statistics
+
+    columnar_log = ColumnarLog()
+    datasets_read = _latest_reads(columnar_log.tee(log_lines), statistics)
+    s3.put_object(
+        Bucket=bucket,
+        Key=columnar_key(COLUMNAR_LOGS_PREFIX, key),
+        Body=columnar_log.dumps(),
+        ContentType="application/json",
+        ContentEncoding="gzip",
+    )
+
+    return datasets_read, statistics
+
+
+def _update_last_read(datasets_read, executor=None):
+    """Update the `last_read` field of the datasets in `datasets_read`.
+
+    `datasets_read` maps dataset IDs to sortable read times. A dataset's
+    `last_read` field is never moved backwards in time. The updates are
+    dispatched concurrently on `executor` when given. Return the IDs of the
+    datasets that weren't found.
+    """
+    dataset_repository = DatasetRepository()
     updated_datasets = []
     not_found_datasets = []
 
-    for dataset, dt in datasets_read.items():
-        if dataset_repository.dataset_exists(dataset):
-            dataset_repository.patch_dataset(dataset, {"last_read": dt.isoformat()})
-            updated_datasets.append((dataset, dt))
-        else:
-            not_found_datasets.append(dataset)
+    def update(item):
+        dataset_id, t = item
+        dt = from_sortable_time(t)
+        try:
+            if dataset_repository.update_last_read(dataset_id, dt.isoformat()):
+                updated_datasets.append((dataset_id, dt))
+        except ResourceNotFoundError:
+            not_found_datasets.append(dataset_id)
+
+    # Consume the results to propagate any unexpected errors.
+    list((executor.map if executor else map)(update, datasets_read.items()))
 
     logger.info("Updated datasets:")
     if updated_datasets:
@@ -76,3 +277,108 @@ def handler(event, context):
             logger.info(f" - {dataset}")
     else:
         logger.info(" None")
+
+    return not_found_datasets
+
+
+def _update_statistics(statistics, executor):
+    """Add the read statistics `statistics` to the hourly rollups.
+
+    The rollups are updated concurrently on `executor`.
+    """
+    statistics_repository = StatisticsRepository()
+
+    def update(item):
+        (dataset_id, hour), read_statistics = item
+        statistics_repository.add_read_statistics(
+            dataset_id,
+            hour,
+            read_statistics.reads,
+            read_statistics.bytes_sent,
+            read_statistics.errors,
+            read_statistics.requesters,
+        )
+
+    list(executor.map(update, statistics.items()))
+
+
+def _process_hour(executor, s3, checkpoints, logs_bucket_name, prefix, hour):
+    """Update `last_read` and read statistics from the new log objects of `hour`.
+
+    Progress is checkpointed every `CHECKPOINT_INTERVAL` objects, so that an
+    interrupted run can resume where it left off. Objects already processed are
+    skipped, unless their ETag has changed since. Return the number of objects
+    processed and skipped.
+    """
+    processed = checkpoints.processed_objects(hour)
+    pending = []
+    skipped = 0
+
+    for key, etag in _log_objects(s3, logs_bucket_name, f"{prefix}/{hour}"):
+        if processed.get(key) == etag:
+            skipped += 1
+        else:
+            pending.append((key, etag))
+
+    for chunk in _chunks(pending, CHECKPOINT_INTERVAL):
+        datasets_read = {}
+        statistics = {}
+
+        # Log objects are many and small, so fetching them is dominated by
+        # request latency. Fetch and parse them concurrently, each into its own
+        # result which is merged in afterwards.
+        for object_reads, object_statistics in executor.map(
+            lambda obj: _object_reads_and_statistics(s3, logs_bucket_name, obj[0]),
+            chunk,
+        ):
+            _merge_reads(datasets_read, object_reads)
+            merge_statistics(statistics, object_statistics)
+
+        not_found_datasets = set(_update_last_read(datasets_read, executor))
+        _update_statistics(
+            {k: v for k, v in statistics.items() if k[0] not in not_found_datasets},
+            executor,
+        )
+
+        # The datasets are updated before saving the checkpoint. Should the run
+        # be interrupted in between, the chunk is processed again next time.
+        # That's harmless for `last_read`, which is never moved backwards, but
+        # the chunk's reads are counted twice in the statistics.
+        checkpoints.save_progress(hour, dict(chunk), executor)
+        processed.update(chunk)
+
+    checkpoints.complete_hour(hour, processed, executor)
+
+    return len(pending), skipped
+
+
+@logging_wrapper
+@xray_recorder.capture("handler")
+def handler(event, context):
+    s3 = boto3.client("s3")
+    data_bucket_name = getenv("DATA_BUCKET_NAME")
+    logs_bucket_name = getenv("LOGS_BUCKET_NAME")
+    prefix = f"logs/s3/{data_bucket_name}"
+    checkpoints = CheckpointRepository()
+    hours = _hours_to_process(checkpoints.last_complete_hour(), _two_hours_ago())
+    objects_processed = 0
+    objects_skipped = 0
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for hour in hours:
+            logger.info(f"Processing log hour {hour}")
+            processed, skipped = _process_hour(
+                executor, s3, checkpoints, logs_bucket_name, prefix, hour
+            )
+            objects_processed += processed
+            objects_skipped += skipped
+
+    key_cache_info = DatasetEntry.from_s3_key.cache_info()
+    log_add(
+        hours_processed=len(hours),
+        objects_processed=objects_processed,
+        objects_skipped=objects_skipped,
+        key_cache_hits=key_cache_info.hits,
+        key_cache_misses=key_cache_info.misses,
+        key_cache_size=key_cache_info.currsize,
+    )
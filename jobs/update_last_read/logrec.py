@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import dataclasses
 import re
 
@@ -42,6 +43,105 @@ optional_fields_pattern = ' ?'.join([
 
 pattern = re.compile(f"{required_fields_pattern} ?{optional_fields_pattern}.*")
 
+# fmt: off
+# Regex for matching only the leading fields of a log record, up to and
+# including the bytes sent. Much cheaper than `pattern` when the rest of the
+# record isn't needed.
+partial_pattern = re.compile('^' + ' '.join([
+    r'\S+',                        # Bucket Owner
+    r'\S+',                        # Bucket
+    r'\[([\w:/]+\s[+\-]\d{4})\]',  # Time
+    r'\S+',                        # Remote IP
+    r'(\S+)',                      # Requester
+    r'\S+',                        # Request ID
+    r'(\S+)',                      # Operation
+    r'(\S+)',                      # Key
+    r'"?(?:-|[^"]*)"?',            # Request-URI
+    r'(\S+)',                      # HTTP status
+    r'\S+',                        # Error Code
+    r'(\S+)',                      # Bytes Sent
+]))
+# fmt: on
+
+
+time_fmt = "%d/%b/%Y:%H:%M:%S %z"
+
+# Format of the sortable time representation returned by `sortable_time`.
+sortable_time_fmt = "%Y%m%d%H%M%S"
+
+MONTHS = {
+    month: i
+    for i, month in enumerate(
+        [
+            "Jan",
+            "Feb",
+            "Mar",
+            "Apr",
+            "May",
+            "Jun",
+            "Jul",
+            "Aug",
+            "Sep",
+            "Oct",
+            "Nov",
+            "Dec",
+        ],
+        start=1,
+    )
+}
+
+
+@lru_cache(maxsize=256)
+def _parse_date(date, offset):
+    """Return a tuple of year, month, day, and timezone for a log record time.
+
+    `date` is the date part of a log record time (e.g. "17/Feb/2020") and
+    `offset` its UTC offset (e.g. "+0000"). Log records processed together
+    tend to share these, hence the caching.
+    """
+    sign = -1 if offset[0] == "-" else 1
+    tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+    return int(date[7:11]), MONTHS[date[3:6]], int(date[0:2]), tz
+
+
+def _parse_time(time):
+    """Return the log record time `time` as a timezone aware `datetime`.
+
+    This is equivalent to `datetime.strptime(time, time_fmt)`, but much faster
+    for the fixed width format used in the logs.
+    """
+    if len(time) != 26 or time[3:6] not in MONTHS:
+        return datetime.strptime(time, time_fmt)
+
+    year, month, day, tz = _parse_date(time[:11], time[21:])
+
+    return datetime(
+        year, month, day, int(time[12:14]), int(time[15:17]), int(time[18:20]), 0, tz
+    )
+
+
+@lru_cache(maxsize=256)
+def _sortable_date(date):
+    return f"{date[7:11]}{MONTHS[date[3:6]]:02}{date[0:2]}"
+
+
+def sortable_time(time):
+    """Return the log record time `time` as a sortable UTC string.
+
+    The result can be compared directly, and turned into a `datetime` with
+    `from_sortable_time`. This is cheaper than parsing `time` into a
+    `datetime` when only the latest of many times is of interest.
+    """
+    if len(time) == 26 and time[21:] == "+0000" and time[3:6] in MONTHS:
+        return f"{_sortable_date(time[:11])}{time[12:14]}{time[15:17]}{time[18:20]}"
+
+    return _parse_time(time).astimezone(timezone.utc).strftime(sortable_time_fmt)
+
+
+def from_sortable_time(sortable):
+    """Return the sortable time `sortable` as a timezone aware `datetime`."""
+    return datetime.strptime(sortable, sortable_time_fmt).replace(tzinfo=timezone.utc)
+
 
 class LogRecordParseError(RuntimeError):
     """Raised when an S3 access log line failed to parse."""
@@ -84,7 +184,11 @@ class LogRecord:
 
     def datetime(self):
         """Return the log record time as a timezone aware `datetime` object."""
-        return datetime.strptime(self.time, "%d/%b/%Y:%H:%M:%S %z")
+        return _parse_time(self.time)
+
+    def sortable_time(self):
+        """Return the log record time as a sortable UTC string."""
+        return sortable_time(self.time)
 
     @classmethod
     def from_log_line(cls, log_line):
@@ -97,3 +201,38 @@ class LogRecord:
 
         # We expect our regex to match every log record.
         raise LogRecordParseError(f"Couldn't parse log record: {log_line}")
+
+
+@dataclasses.dataclass
+class PartialLogRecord:
+    """The fields of an S3 access log record needed to account for a read.
+
+    Use this over `LogRecord` when the rest of the fields aren't needed, as
+    it's considerably cheaper to parse.
+    """
+
+    time: str
+    requester: str
+    operation: str
+    key: str
+    http_status: str
+    bytes_sent: str
+
+    def datetime(self):
+        """Return the log record time as a timezone aware `datetime` object."""
+        return _parse_time(self.time)
+
+    def sortable_time(self):
+        """Return the log record time as a sortable UTC string."""
+        return sortable_time(self.time)
+
+    @classmethod
+    def from_log_line(cls, log_line):
+        """Parse `log_line` and return a corresponding `PartialLogRecord`.
+
+        Raise `LogRecordParseError` if the log line doesn't parse.
+        """
+        if m := partial_pattern.match(log_line):
+            return cls(*map(LogRecord._clean_field, m.groups()))
+
+        raise LogRecordParseError(f"Couldn't parse log record: {log_line}")
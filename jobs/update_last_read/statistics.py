@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ReadStatistics:
+    """Counters of the reads of a dataset within an hour."""
+
+    reads: int = 0
+    bytes_sent: int = 0
+    errors: int = 0
+    requesters: set = field(default_factory=set)
+
+    def add(self, log_record):
+        """Count the read in `log_record`."""
+        self.reads += 1
+        if log_record.bytes_sent:
+            self.bytes_sent += int(log_record.bytes_sent)
+        if log_record.http_status[:1] in ("4", "5"):
+            self.errors += 1
+        # Anonymous requests have a blank requester, which DynamoDB sets can't
+        # hold.
+        self.requesters.add(log_record.requester or "-")
+
+    def merge(self, other):
+        """Add the counters of `other` to these."""
+        self.reads += other.reads
+        self.bytes_sent += other.bytes_sent
+        self.errors += other.errors
+        self.requesters |= other.requesters
+
+
+def merge_statistics(statistics, other):
+    """Merge the read statistics in `other` into `statistics`.
+
+    Both are dictionaries mapping `(dataset_id, hour)` tuples to
+    `ReadStatistics`. `statistics` is updated in place and returned.
+    """
+    for key, read_statistics in other.items():
+        if key in statistics:
+            statistics[key].merge(read_statistics)
+        else:
+            statistics[key] = read_statistics
+
+    return statistics
@@ -4,16 +4,20 @@ from functools import reduce
 from aws_xray_sdk.core import patch_all
 from boto3.dynamodb.conditions import And, Attr, Key
 from botocore.exceptions import ClientError
-from okdata.aws.logging import log_add, log_duration
+from okdata.aws.logging import log_add
 
+from metadata import coldstart
 from metadata.error import (
     DeleteConflict,
     ResourceConflict,
     ResourceNotFoundError,
     ValidationError,
 )
+from metadata.instrumentation import record_dynamodb_call
+from metadata.item_cache import item_cache, written_keys
 
-patch_all()
+with coldstart.phase("xray_patch"):
+    patch_all()
 
 log = logging.getLogger()
 
@@ -21,6 +25,9 @@ log = logging.getLogger()
 ID_COLUMN = "Id"
 TYPE_COLUMN = "Type"
 
+# Maximum number of actions in a single `transact_write_items` request.
+MAX_TRANSACTION_SIZE = 100
+
 
 class MissingParentError(KeyError):
     """Raised when a parent doesn't exist."""
@@ -33,25 +40,67 @@ class CommonRepository:
         self.table = table
         self.type = type
 
-    def get_item(self, item_id, consistent_read=False):
+    def _call_table(self, operation, client=False, **kwargs):
+        """Call DynamoDB `operation` on `self.table` with `kwargs`.
+
+        The call is made through the underlying (thread safe) client if
+        `client` is true. It's recorded in the per-request DynamoDB call
+        accounting, including the capacity it consumed.
+
+        Items written are invalidated in the item cache, if enabled. That's
+        done even if the call fails, as it may have written anyway.
+        """
+        target = self.table.meta.client if client else self.table
+        if client and operation != "transact_write_items":
+            kwargs["TableName"] = self.table.name
+
+        try:
+            return record_dynamodb_call(
+                lambda: getattr(target, operation)(
+                    ReturnConsumedCapacity="TOTAL", **kwargs
+                ),
+                operation,
+                kwargs.get("IndexName"),
+            )
+        finally:
+            if (cache := item_cache()) is not None:
+                for item_id, item_type in written_keys(operation, kwargs):
+                    cache.invalidate((self.table.name, item_id, item_type))
+
+    def get_item(self, item_id, consistent_read=False, use_cache=True):
+        """Return the item with ID `item_id`, or `None` if it doesn't exist.
+
+        When the item cache is enabled, items are read from it unless
+        `consistent_read` is true or `use_cache` is false.
+        """
         log_add(dynamodb_item_id=item_id, dynamodb_item_type=self.type)
         key = {ID_COLUMN: item_id, TYPE_COLUMN: self.type}
+        cache = item_cache() if use_cache else None
+        cache_key = (self.table.name, item_id, self.type)
+        item = None
 
-        db_response = log_duration(
-            lambda: self.table.get_item(Key=key, ConsistentRead=consistent_read),
-            "dynamodb_duration_ms",
-        )
+        if cache is not None and not consistent_read:
+            item = cache.get(cache_key)
+            log_add(item_cache_hit=item is not None)
 
-        status_code = db_response["ResponseMetadata"]["HTTPStatusCode"]
-        log_add(dynamodb_status_code=status_code)
+        if item is None:
+            db_response = self._call_table(
+                "get_item", Key=key, ConsistentRead=consistent_read
+            )
+
+            status_code = db_response["ResponseMetadata"]["HTTPStatusCode"]
+            log_add(dynamodb_status_code=status_code)
 
-        if "Item" not in db_response:
-            log.info(f"Item {item_id} not found.")
-            log_add(dynamodb_num_items=0)
-            return None
+            if "Item" not in db_response:
+                log.info(f"Item {item_id} not found.")
+                log_add(dynamodb_num_items=0)
+                return None
 
-        log_add(dynamodb_num_items=1)
-        item = db_response["Item"]
+            log_add(dynamodb_num_items=1)
+            item = db_response["Item"]
+
+            if cache is not None:
+                cache.put(cache_key, item)
 
         # Set correct ID for 'latest' version/edition
         is_latest = "latest" in item
@@ -89,15 +138,32 @@ class CommonRepository:
         if filter_conditions:
             query_args["FilterExpression"] = reduce(And, filter_conditions)
 
-        db_response = log_duration(
-            lambda: self.table.query(**query_args),
-            "dynamodb_duration_ms",
-        )
+        return self._query(query_args)
 
-        status_code = db_response["ResponseMetadata"]["HTTPStatusCode"]
-        log_add(dynamodb_status_code=status_code)
+    def _query(self, query_args, limit=None):
+        """Run a query on `self.table` with `query_args`.
+
+        Follow the pagination of the results until every matching item is
+        returned, or until `limit` items are found if given.
+        """
+        items = []
+
+        while True:
+            if limit:
+                query_args["Limit"] = limit - len(items)
+
+            db_response = self._call_table("query", **query_args)
+
+            status_code = db_response["ResponseMetadata"]["HTTPStatusCode"]
+            log_add(dynamodb_status_code=status_code)
+
+            items.extend(db_response["Items"])
+
+            if "LastEvaluatedKey" not in db_response or (limit and len(items) >= limit):
+                break
+
+            query_args["ExclusiveStartKey"] = db_response["LastEvaluatedKey"]
 
-        items = db_response["Items"]
         log_add(dynamodb_num_items=len(items))
 
         return items
@@ -120,7 +186,7 @@ class CommonRepository:
         if parent_id:
             log_add(dynamodb_parent_id=parent_id)
             parent_key = {ID_COLUMN: parent_id, TYPE_COLUMN: parent_type}
-            db_response = self.table.get_item(Key=parent_key)
+            db_response = self._call_table("get_item", Key=parent_key)
             parent_exists = "Item" in db_response
             log_add(dynamodb_parent_exists=parent_exists)
             if not parent_exists:
@@ -131,9 +197,7 @@ class CommonRepository:
         content[ID_COLUMN] = item_id
         content[TYPE_COLUMN] = self.type
 
-        db_response = log_duration(
-            lambda: self._create_item(content, update_on_exists), "dynamodb_duration_ms"
-        )
+        db_response = self._create_item(content, update_on_exists)
 
         status_code = db_response["ResponseMetadata"]["HTTPStatusCode"]
         log_add(dynamodb_status_code=status_code)
@@ -157,10 +221,11 @@ class CommonRepository:
         try:
             log_add(dynamodb_update_on_exists=update_on_exists)
             if update_on_exists:
-                return self.table.put_item(Item=content)
+                return self._call_table("put_item", Item=content)
             else:
                 cond = "attribute_not_exists(Id) AND attribute_not_exists(#Type)"
-                return self.table.put_item(
+                return self._call_table(
+                    "put_item",
                     Item=content,
                     ExpressionAttributeNames={"#Type": TYPE_COLUMN},
                     ConditionExpression=cond,
@@ -185,7 +250,9 @@ class CommonRepository:
 
     def _update_item(self, item_id, content, patch):
         log_add(dynamodb_item_id=item_id, dynamodb_item_type=self.type)
-        old_item = self.get_item(item_id)
+        # The whole item is replaced, so it must be based on its current
+        # content, not on a possibly stale copy from the item cache.
+        old_item = self.get_item(item_id, use_cache=False)
 
         item_exists = old_item is not None
         log_add(dynamodb_item_exists=item_exists)
@@ -204,9 +271,7 @@ class CommonRepository:
             if old_value is not None and old_value != new_value:
                 raise ValidationError(f"The value of {key} cannot be changed.")
 
-        db_response = log_duration(
-            lambda: self.table.put_item(Item=new_content), "dynamodb_duration_ms"
-        )
+        db_response = self._call_table("put_item", Item=new_content)
 
         status_code = db_response["ResponseMetadata"]["HTTPStatusCode"]
         log_add(dynamodb_status_code=status_code)
@@ -238,11 +303,8 @@ class CommonRepository:
                 raise DeleteConflict(f"Item '{item_id}' has children; cannot delete.")
 
         try:
-            log_duration(
-                lambda: self.table.delete_item(
-                    Key=key, ConditionExpression="attribute_exists(Id)"
-                ),
-                "dynamodb_duration_ms",
+            self._call_table(
+                "delete_item", Key=key, ConditionExpression="attribute_exists(Id)"
             )
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
@@ -255,8 +317,65 @@ class CommonRepository:
                 log.error(msg)
                 raise ValueError(f"Error deleting item ({error_code}): {msg}")
 
+    def _put_action(self, item, update_on_exists=True):
+        """Return a transaction action for putting `item` into `self.table`.
+
+        When `update_on_exists` is false, the transaction fails if an entry
+        with the same ID already exists.
+        """
+        action = {"TableName": self.table.name, "Item": item}
+        if not update_on_exists:
+            action["ExpressionAttributeNames"] = {"#Type": TYPE_COLUMN}
+            action["ConditionExpression"] = (
+                "attribute_not_exists(Id) AND attribute_not_exists(#Type)"
+            )
+        return {"Put": action}
+
+    def _exists_action(self, item_id, item_type):
+        """Return a transaction action checking that `item_id` exists."""
+        return {
+            "ConditionCheck": {
+                "TableName": self.table.name,
+                "Key": {ID_COLUMN: item_id, TYPE_COLUMN: item_type},
+                "ConditionExpression": "attribute_exists(Id)",
+            }
+        }
+
+    def _transact_write_items(self, transact_items):
+        """Perform `transact_items` in a single DynamoDB transaction.
+
+        Raise `MissingParentError` if an action made by `_exists_action`
+        fails, and `ResourceConflict` if a conditional put fails.
+        """
+        try:
+            return self._call_table(
+                "transact_write_items", client=True, TransactItems=transact_items
+            )
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            reasons = e.response.get("CancellationReasons", [])
+
+            for action, reason in zip(transact_items, reasons):
+                if reason.get("Code") != "ConditionalCheckFailed":
+                    continue
+                if "ConditionCheck" in action:
+                    item_id = action["ConditionCheck"]["Key"][ID_COLUMN]
+                    msg = f"Parent item with id {item_id} does not exist"
+                    log.error(msg)
+                    raise MissingParentError(msg)
+                if "Put" in action:
+                    item_id = action["Put"]["Item"][ID_COLUMN]
+                    msg = f"Item with id {item_id} already exists"
+                    log.error(msg)
+                    raise ResourceConflict(msg, e)
+
+            msg = e.response["Error"]["Message"]
+            log.error(msg)
+            raise ValueError(f"Error writing items ({error_code}): {msg}")
+
     def _query_children(self, item_id, child_type):
-        return self.table.query(
+        return self._call_table(
+            "query",
             IndexName="IdByTypeIndex",
             KeyConditionExpression=Key(TYPE_COLUMN).eq(child_type)
             & Key(ID_COLUMN).begins_with(f"{item_id}/"),
@@ -0,0 +1,4 @@
+from metadata import coldstart
+
+# Installed first thing, to record as much of the cold start as possible.
+coldstart.install()
@@ -0,0 +1,178 @@
+"""Profiling of what a Lambda container spends its cold start on.
+
+The profiler is installed as soon as the `metadata` package is imported. From
+then on it records the time spent executing each imported module, and the time
+spent in named initialization phases (see `phase`). The logging wrapper emits
+the profile as a structured log line after the first invocation of the
+container, which also uninstalls the profiler, leaving later imports untimed.
+
+See `metadata.profile_coldstart` for profiling the cold start of handler
+modules locally.
+"""
+
+# Anything imported before `install` goes unrecorded, so only standard library
+# modules that are loaded at startup anyway are imported at the top.
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Number of modules included in the cold start log line, slowest first.
+MAX_LOGGED_IMPORTS = 25
+
+_lock = threading.Lock()
+_installed_at = None
+_profiler = None
+_logged = False
+
+# Module name -> [cumulative ms, self ms]. Cumulative time includes the imports
+# made while executing the module, self time doesn't.
+_imports = {}
+
+# Per thread stack of the modules currently being executed, with the time spent
+# in their nested imports so far.
+_local = threading.local()
+
+# Phase name -> [total ms, count].
+_phases = {}
+
+
+class _ImportProfiler:
+    """Meta path finder timing the execution of every module imported.
+
+    It finds nothing itself, but wraps the `exec_module` method of the loaders
+    found by the finders after it.
+    """
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path[sys.meta_path.index(self) + 1 :]:
+            find_spec = getattr(finder, "find_spec", None)
+            spec = find_spec and find_spec(name, path, target)
+
+            if spec is not None:
+                loader = spec.loader
+                # Loaders that are classes (built-in and frozen modules) are
+                # shared between modules, so leave them be.
+                if hasattr(loader, "exec_module") and not isinstance(loader, type):
+                    loader.exec_module = _timed_exec_module(name, loader.exec_module)
+                return spec
+
+        return None
+
+
+def _timed_exec_module(name, exec_module):
+    def wrapper(module):
+        if not hasattr(_local, "import_stack"):
+            _local.import_stack = []
+        import_stack = _local.import_stack
+
+        import_stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return exec_module(module)
+        finally:
+            cumulative_ms = (time.perf_counter() - start) * 1000
+            nested_ms = import_stack.pop()
+            if import_stack:
+                import_stack[-1] += cumulative_ms
+            _imports[name] = [cumulative_ms, cumulative_ms - nested_ms]
+
+    return wrapper
+
+
+def install():
+    """Start profiling the cold start, unless already started."""
+    global _installed_at, _profiler
+
+    with _lock:
+        if _installed_at is None:
+            _installed_at = time.perf_counter()
+            _profiler = _ImportProfiler()
+            sys.meta_path.insert(0, _profiler)
+
+
+def uninstall():
+    """Stop recording imports, keeping what's been recorded so far."""
+    global _profiler
+
+    with _lock:
+        if _profiler is not None:
+            if _profiler in sys.meta_path:
+                sys.meta_path.remove(_profiler)
+            _profiler = None
+
+
+@contextmanager
+def phase(name):
+    """Record the time spent in the block as initialization phase `name`.
+
+    Phases entered several times add up.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        with _lock:
+            total_ms, count = _phases.get(name, [0.0, 0])
+            _phases[name] = [total_ms + duration_ms, count + 1]
+
+
+def init_duration_ms():
+    """Return the time since profiling started, in milliseconds."""
+    return round((time.perf_counter() - _installed_at) * 1000, 3)
+
+
+def report(max_imports=None):
+    """Return the profile recorded so far.
+
+    Modules are sorted by cumulative import time, slowest first, and limited
+    to the `max_imports` slowest if given.
+    """
+    imports = sorted(_imports.items(), key=lambda i: i[1][0], reverse=True)
+
+    return {
+        "init_duration_ms": init_duration_ms(),
+        "num_imports": len(imports),
+        "imports": [
+            {
+                "module": name,
+                "cumulative_ms": round(cumulative_ms, 3),
+                "self_ms": round(self_ms, 3),
+            }
+            for name, (cumulative_ms, self_ms) in imports[:max_imports]
+        ],
+        "phases": {
+            name: {"duration_ms": round(total_ms, 3), "count": count}
+            for name, (total_ms, count) in _phases.items()
+        },
+    }
+
+
+def log_once(handler_name, init_ms, first_invocation_ms):
+    """Emit the cold start profile as a log line, once per container.
+
+    `init_ms` is the time from profiling started until the first invocation,
+    and `first_invocation_ms` the duration of that invocation. The cold start
+    is over by then, so the profiler is uninstalled.
+    """
+    from okdata.aws.logging import logger
+
+    global _logged
+
+    with _lock:
+        if _logged:
+            return
+        _logged = True
+
+    uninstall()
+
+    profile = report(MAX_LOGGED_IMPORTS)
+    profile["init_duration_ms"] = init_ms
+    logger.msg(
+        "Cold start profile",
+        level="info",
+        handler_method=handler_name,
+        first_invocation_ms=round(first_invocation_ms, 3),
+        **profile,
+    )
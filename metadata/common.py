@@ -54,6 +54,13 @@ def validate_input(validator):
 
 
 def response(statusCode, body, headers=None):
+    return serialized_response(
+        statusCode, simplejson.dumps(body, use_decimal=True), headers
+    )
+
+
+def serialized_response(statusCode, body, headers=None):
+    """Like `response`, but with `body` already serialized to JSON."""
     if not headers:
         headers = {}
 
@@ -62,7 +69,7 @@ def response(statusCode, body, headers=None):
     return {
         "statusCode": statusCode,
         "headers": headers,
-        "body": simplejson.dumps(body, use_decimal=True),
+        "body": body,
     }
 
 
@@ -12,6 +12,7 @@ import isort
 import jinja2
 from black import FileMode, format_str
 
+from metadata import warmup
 from metadata.dataset.repository import DatasetRepository
 from metadata.distribution.repository import DistributionRepository
 from metadata.edition.repository import EditionRepository
@@ -41,6 +42,15 @@ template_env = jinja2.Environment(
 template = template_env.get_template("main.jinja")
 
 
+@warmup.warmer
+def _compile_templates():
+    """Compile the templates included by the main template, and load black."""
+    for name in template_env.list_templates(extensions=["jinja"]):
+        template_env.get_template(name)
+
+    format_str(isort.code("import os\n"), mode=FileMode())
+
+
 class NoCodeExamples(Exception):
     """Raised when sensible code examples can't be produced for a dataset."""
 
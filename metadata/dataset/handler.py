@@ -3,19 +3,22 @@ import os
 import requests
 import simplejson as json
 from aws_xray_sdk.core import xray_recorder
-from okdata.aws.logging import logging_wrapper, log_add, log_exception
+from okdata.aws.logging import log_add, log_exception
 
 from metadata import common
 from metadata.auth import Auth, check_auth
 from metadata.common import validate_input
 from metadata.dataset.code_examples import NoCodeExamples, code_examples
 from metadata.dataset.repository import DatasetRepository
+from metadata.dataset.snapshot import ListingSnapshotRepository, snapshot_enabled
 from metadata.error import ResourceConflict, ValidationError
+from metadata.instrumentation import logging_wrapper
 from metadata.validator import Validator
 from metadata.version.handler import add_self_url as add_version_url
 from metadata.version.repository import VersionRepository
 
 dataset_repository = DatasetRepository()
+snapshot_repository = ListingSnapshotRepository()
 version_repository = VersionRepository()
 
 OKDATA_PERMISSION_API_URL = os.environ["OKDATA_PERMISSION_API_URL"]
@@ -87,6 +90,14 @@ def get_datasets(event, context):
 
     query_params = event.get("queryStringParameters") or {}
 
+    if snapshot_enabled() and not any(
+        query_params.get(f) for f in ["parent_id", "api_id", "was_derived_from_name"]
+    ):
+        if (body := snapshot_repository.get_body()) is not None:
+            log_add(catalog_snapshot=True)
+            return common.serialized_response(200, body)
+        log_add(catalog_snapshot=False)
+
     datasets = dataset_repository.get_datasets(
         parent_id=query_params.get("parent_id"),
         api_id=query_params.get("api_id"),
@@ -2,15 +2,14 @@ import random
 import re
 import string
 
-import boto3
 from aws_xray_sdk.core import patch
 from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
-from okdata.aws.logging import log_dynamodb, log_exception
+from okdata.aws.logging import log_exception
 
-from metadata.common import BOTO_RESOURCE_COMMON_KWARGS
 from metadata.CommonRepository import CommonRepository, TYPE_COLUMN, ID_COLUMN
-from metadata.error import ValidationError
+from metadata.error import ResourceNotFoundError, ValidationError
+from metadata.storage import metadata_table
 from metadata.version.repository import VersionRepository
 
 patch(["boto3"])
@@ -18,9 +17,7 @@ patch(["boto3"])
 
 class DatasetRepository(CommonRepository):
     def __init__(self):
-        dynamodb = boto3.resource("dynamodb", **BOTO_RESOURCE_COMMON_KWARGS)
-
-        self.metadata_table = dynamodb.Table("dataset-metadata")
+        self.metadata_table = metadata_table()
 
         super().__init__(self.metadata_table, "Dataset")
 
@@ -55,11 +52,10 @@ class DatasetRepository(CommonRepository):
         datasets = self.get_items(parent_id, was_derived_from_name)
 
         if api_id:
-            db_response = log_dynamodb(
-                lambda: self.metadata_table.query(
-                    IndexName="IdByApiIdSparseIndex",
-                    KeyConditionExpression=Key("api_id").eq(api_id),
-                )
+            db_response = self._call_table(
+                "query",
+                IndexName="IdByApiIdSparseIndex",
+                KeyConditionExpression=Key("api_id").eq(api_id),
             )
             distributions = db_response["Items"]
             dataset_ids = {dist["Id"].split("/")[0] for dist in distributions}
@@ -100,13 +96,13 @@ class DatasetRepository(CommonRepository):
         latest[ID_COLUMN] = f"{dataset_id}/latest"
 
         try:
-            db_response = log_dynamodb(
-                lambda: self.metadata_table.meta.client.transact_write_items(
-                    TransactItems=[
-                        {"Put": {"Item": item, "TableName": "dataset-metadata"}}
-                        for item in [content, version, latest]
-                    ]
-                )
+            db_response = self._call_table(
+                "transact_write_items",
+                client=True,
+                TransactItems=[
+                    {"Put": {"Item": item, "TableName": "dataset-metadata"}}
+                    for item in [content, version, latest]
+                ],
             )
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
@@ -128,6 +124,40 @@ class DatasetRepository(CommonRepository):
     def patch_dataset(self, dataset_id, content):
         return self.patch_item(dataset_id, content)
 
+    def update_last_read(self, dataset_id, last_read):
+        """Set the `last_read` field of dataset `dataset_id` to `last_read`.
+
+        This is a single conditional update, so it never moves `last_read`
+        backwards in time, nor does it interfere with concurrent edits of the
+        dataset. Unlike the table resource, the underlying client is thread
+        safe, so this may be called from several threads at once.
+
+        Return true if the dataset was updated, and false if it had already
+        been read at or after `last_read`. Raise `ResourceNotFoundError` if the
+        dataset doesn't exist.
+        """
+        try:
+            self._call_table(
+                "update_item",
+                client=True,
+                Key={ID_COLUMN: dataset_id, TYPE_COLUMN: self.type},
+                UpdateExpression="SET last_read = :t",
+                ConditionExpression=(
+                    "attribute_exists(Id) AND "
+                    "(attribute_not_exists(last_read) OR last_read < :t)"
+                ),
+                ExpressionAttributeValues={":t": last_read},
+                ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            if "Item" not in e.response:
+                raise ResourceNotFoundError(f"Dataset {dataset_id} does not exist")
+            return False
+
+        return True
+
     def children(self, item_id):
         return self._query_children(item_id, "Version")
 
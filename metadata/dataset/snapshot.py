@@ -0,0 +1,216 @@
+"""A precomputed snapshot of the full dataset listing.
+
+The catalog changes a few times an hour, but is listed far more often. Rather
+than querying and serializing every dataset on each unfiltered `GET
+/datasets`, the response body is kept serialized and gzip compressed in a
+single item of the metadata table, served as is.
+
+The snapshot is kept up to date by the metadata stream consumer (see
+`jobs.metadata_stream`), which applies the changes of each batch of dataset
+writes to it. It's built from scratch when missing.
+
+A listing too large to store leaves a marker in place of the snapshot, so
+that the following batches don't each rebuild it only to throw it away. It's
+rebuilt again once `TOO_LARGE_RECHECK_SECONDS` have passed, in case the
+catalog has shrunk since.
+"""
+
+import gzip
+import logging
+import os
+import time
+
+import simplejson
+from boto3.dynamodb.types import Binary
+from botocore.exceptions import ClientError
+from okdata.aws.logging import log_add
+
+from metadata.CommonRepository import ID_COLUMN, TYPE_COLUMN, CommonRepository
+from metadata.storage import metadata_table
+
+log = logging.getLogger()
+
+BASE_URL = os.environ.get("BASE_URL", "")
+
+SNAPSHOT_ID = "datasets"
+
+# DynamoDB items are limited to 400 KB. Snapshots compressing to more than
+# this aren't stored, leaving `GET /datasets` to query the datasets instead.
+MAX_SNAPSHOT_SIZE = 350 * 1024
+
+# How long to wait before checking whether a listing too large to store has
+# shrunk enough to fit.
+TOO_LARGE_RECHECK_SECONDS = 3600
+
+# Number of times to retry applying changes that raced with another update.
+MAX_UPDATE_ATTEMPTS = 5
+
+
+def snapshot_enabled():
+    """Return true if `GET /datasets` should be served from the snapshot.
+
+    Enable with the environment variable `ENABLE_CATALOG_SNAPSHOT=true`, but
+    only where the metadata stream consumer keeps the snapshot up to date.
+    """
+    return os.environ.get("ENABLE_CATALOG_SNAPSHOT", "").lower() == "true"
+
+
+def _listing_entry(dataset):
+    """Return `dataset` as it's listed by `GET /datasets`."""
+    return {
+        **dataset,
+        "_links": {"self": {"href": f'{BASE_URL}/datasets/{dataset["Id"]}'}},
+    }
+
+
+def _bytes(value):
+    """Return binary attribute `value` as bytes.
+
+    It's a `Binary` when read from DynamoDB, but plain bytes in memory.
+    """
+    return value.value if isinstance(value, Binary) else bytes(value)
+
+
+class SnapshotConflict(Exception):
+    pass
+
+
+class ListingSnapshotRepository(CommonRepository):
+    """The snapshot of the full dataset listing.
+
+    It's a single item holding the gzip compressed response body, along with
+    a version number increasing with every update. When the listing is too
+    large to store, the item holds the time it was found to be so
+    (`too_large_at`) instead of a body.
+    """
+
+    def __init__(self):
+        self.metadata_table = metadata_table()
+
+        super().__init__(self.metadata_table, "ListingSnapshot")
+
+        # The version and decompressed body of the snapshot last served.
+        self._decompressed = (None, None)
+
+    def get_body(self):
+        """Return the serialized listing, or `None` if there's no snapshot.
+
+        The body is only decompressed when the snapshot has changed since the
+        last call.
+        """
+        item = self.get_item(SNAPSHOT_ID)
+
+        if item is None or "body" not in item:
+            return None
+
+        version, body = self._decompressed
+        if version != item["version"]:
+            body = gzip.decompress(_bytes(item["body"])).decode("utf-8")
+            self._decompressed = (item["version"], body)
+
+        return body
+
+    def _load(self):
+        """Return the listed datasets, version, and `too_large_at` of the snapshot.
+
+        The listing is `None` if it was too large to store, and all three are
+        `None` if there's no snapshot.
+        """
+        item = self.get_item(SNAPSHOT_ID, consistent_read=True)
+
+        if item is None:
+            return None, None, None
+
+        if "body" not in item:
+            return None, item["version"], item["too_large_at"]
+
+        body = gzip.decompress(_bytes(item["body"]))
+        return simplejson.loads(body, use_decimal=True), item["version"], None
+
+    def _store(self, datasets, version):
+        """Store the listing of `datasets` as the snapshot after `version`.
+
+        `version` is the version of the snapshot the listing was based on, or
+        `None` if there wasn't one. Raise `SnapshotConflict` if the snapshot
+        has been updated since. A listing too large to store is replaced by a
+        marker saying so.
+        """
+        body = gzip.compress(
+            simplejson.dumps(datasets, use_decimal=True).encode("utf-8"), mtime=0
+        )
+        key = {ID_COLUMN: SNAPSHOT_ID, TYPE_COLUMN: self.type}
+
+        if version is None:
+            condition = {"ConditionExpression": "attribute_not_exists(Id)"}
+        else:
+            condition = {
+                "ConditionExpression": "version = :version",
+                "ExpressionAttributeValues": {":version": version},
+            }
+
+        log_add(
+            catalog_snapshot_datasets=len(datasets),
+            catalog_snapshot_bytes=len(body),
+        )
+
+        if len(body) > MAX_SNAPSHOT_SIZE:
+            log.warning(f"Catalog snapshot too large: {len(body)} bytes")
+            item = {**key, "too_large_at": int(time.time())}
+        else:
+            item = {**key, "body": body}
+
+        try:
+            self._call_table(
+                "put_item", Item={**item, "version": (version or 0) + 1}, **condition
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            raise SnapshotConflict(f"Snapshot changed since version {version}")
+
+    def _query_listing(self):
+        """Return the listing of every dataset, queried from scratch.
+
+        The query is made on a secondary index, so it's only eventually
+        consistent; datasets written moments ago may be missing or stale.
+        """
+        from metadata.dataset.repository import DatasetRepository
+
+        return [_listing_entry(d) for d in DatasetRepository().get_datasets()]
+
+    def apply(self, datasets):
+        """Apply changes of datasets to the snapshot.
+
+        `datasets` maps the IDs of the changed datasets to their new content,
+        or `None` for deleted datasets. If there's no snapshot yet, it's built
+        from a query of every dataset, with the changes applied on top, as the
+        query may not see them yet. If the listing was too large to store, it's
+        only rebuilt every `TOO_LARGE_RECHECK_SECONDS`.
+        """
+        for attempt in range(1, MAX_UPDATE_ATTEMPTS + 1):
+            listing, version, too_large_at = self._load()
+
+            if (
+                too_large_at is not None
+                and time.time() < too_large_at + TOO_LARGE_RECHECK_SECONDS
+            ):
+                log_add(catalog_snapshot_too_large=True)
+                return
+
+            if listing is None:
+                listing = self._query_listing()
+
+            entries = {d["Id"]: d for d in listing}
+            for dataset_id, dataset in datasets.items():
+                if dataset is None:
+                    entries.pop(dataset_id, None)
+                else:
+                    entries[dataset_id] = _listing_entry(dataset)
+
+            try:
+                self._store([entries[k] for k in sorted(entries)], version)
+                return
+            except SnapshotConflict:
+                if attempt == MAX_UPDATE_ATTEMPTS:
+                    raise
+                log.info(f"Catalog snapshot update conflicted (attempt {attempt})")
@@ -2,15 +2,18 @@ import os
 
 import simplejson as json
 from aws_xray_sdk.core import xray_recorder
-from okdata.aws.logging import logging_wrapper, log_add, log_exception
+from okdata.aws.logging import log_add, log_exception
 
 from metadata.error import ResourceConflict, ResourceNotFoundError, ValidationError
 from metadata.common import error_response, response, validate_input
 from metadata.auth import check_auth
+from metadata.CommonRepository import MissingParentError
 from metadata.distribution.repository import DistributionRepository
+from metadata.instrumentation import logging_wrapper
 from metadata.validator import Validator
 
 validator = Validator("distribution")
+batch_validator = Validator("distribution_batch")
 BASE_URL = os.environ.get("BASE_URL", "")
 
 
@@ -59,6 +62,48 @@ def create_distribution(event, context):
         return response(500, {"message": message})
 
 
+@logging_wrapper
+@validate_input(batch_validator)
+@check_auth("okdata:dataset:write", use_whitelist=True)
+@xray_recorder.capture("create_distributions")
+def create_distributions(event, context):
+    """POST /datasets/:dataset-id/versions/:version/editions/:edition/distributions/batch"""
+
+    contents = json.loads(event["body"])
+
+    dataset_id = event["pathParameters"]["dataset-id"]
+    version = event["pathParameters"]["version"]
+    edition = event["pathParameters"]["edition"]
+    log_add(
+        dataset_id=dataset_id,
+        version=version,
+        edition=edition,
+        num_distributions=len(contents),
+    )
+
+    try:
+        for content in contents:
+            # FIXME Remove once 'distribution_type' is required
+            if "distribution_type" not in content:
+                content["distribution_type"] = "file"
+
+        body = DistributionRepository().create_distributions(
+            dataset_id, version, edition, contents
+        )
+        for distribution in body:
+            add_self_url(distribution)
+        return response(201, body)
+    except ValidationError as e:
+        log_exception(e)
+        return error_response(400, str(e))
+    except MissingParentError:
+        return error_response(404, f"Edition {edition} does not exist")
+    except Exception as e:
+        log_exception(e)
+        message = f"Error creating distributions. RequestId: {context.aws_request_id}"
+        return response(500, {"message": message})
+
+
 @logging_wrapper
 @validate_input(validator)
 @check_auth("okdata:dataset:write", use_whitelist=True)
@@ -2,13 +2,22 @@ import logging
 import mimetypes
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 import boto3
 from aws_xray_sdk.core import patch
-
-from metadata.common import BOTO_RESOURCE_COMMON_KWARGS, CONFIDENTIALITY_MAP, STAGES
-from metadata.CommonRepository import CommonRepository
+from okdata.aws.logging import log_add
+
+from metadata.common import CONFIDENTIALITY_MAP, STAGES
+from metadata.CommonRepository import (
+    ID_COLUMN,
+    MAX_TRANSACTION_SIZE,
+    TYPE_COLUMN,
+    CommonRepository,
+)
 from metadata.error import ResourceNotFoundError, ValidationError
+from metadata.storage import metadata_table
 from metadata.util import getenv
 
 logger = logging.getLogger()
@@ -18,6 +27,15 @@ patch(["boto3"])
 
 API_NAMESPACES = ["okdata-api-catalog"]
 
+# `delete_objects` accepts at most 1000 keys per request.
+S3_DELETE_BATCH_SIZE = 1000
+
+# One transaction action is spent on checking that the parent edition exists.
+MAX_BATCH_SIZE = MAX_TRANSACTION_SIZE - 1
+
+# Number of concurrent S3 requests to make when listing and deleting data.
+S3_MAX_WORKERS = 8
+
 # Parquet doesn't have an IANA-registered MIME type
 # (yet? https://issues.apache.org/jira/browse/PARQUET-1889).
 mimetypes.add_type("application/parquet", ".parq")
@@ -26,9 +44,7 @@ mimetypes.add_type("application/parquet", ".parquet")
 
 class DistributionRepository(CommonRepository):
     def __init__(self):
-        dynamodb = boto3.resource("dynamodb", **BOTO_RESOURCE_COMMON_KWARGS)
-
-        self.metadata_table = dynamodb.Table("dataset-metadata")
+        self.metadata_table = metadata_table()
 
         super().__init__(self.metadata_table, "Distribution")
 
@@ -96,9 +112,17 @@ class DistributionRepository(CommonRepository):
             item["content_type"] = mime_type
 
     def _delete_data(self, dataset_id, version, edition, distribution):
-        """Delete data from S3 belonging to the given distribution."""
+        """Delete data from S3 belonging to the given distribution.
+
+        Every stage prefix is listed concurrently, and the matching keys are
+        then deleted in batches of `S3_DELETE_BATCH_SIZE`, also concurrently.
+
+        Return a report dictionary with the lists of `deleted` keys and
+        `errors` as reported by S3.
+        """
         from metadata.dataset.repository import DatasetRepository
 
+        report = {"deleted": [], "errors": []}
         distribution_id = f"{dataset_id}/{version}/{edition}/{distribution}"
         distribution_ = self.get_item(distribution_id)
 
@@ -115,32 +139,47 @@ class DistributionRepository(CommonRepository):
             logger.info(
                 f"Unknown confidentiality for dataset '{dataset_id}'; skipping data deletion"
             )
-            return
+            return report
 
         if not filenames:
             logger.info(
                 f"No filenames listed for distribution '{distribution_id}'; skipping data deletion"
             )
-            return
+            return report
 
         s3 = boto3.client("s3", region_name=getenv("AWS_REGION"))
-
-        for stage in STAGES:
-            for filename in filenames:
-                prefix = f"{stage}/{confidentiality}/{dataset_id}/version={version}/edition={edition}/{filename}"
-                logger.debug(f"Looking for {prefix}")
-                objects = s3.list_objects_v2(Bucket=bucket, Prefix=prefix)
-
-                if not objects or "Contents" not in objects:
-                    logger.debug(f"No data to delete for stage '{stage}'")
-                    continue
-
-                s3_keys = [c["Key"] for c in objects["Contents"]]
-                logger.debug(f"To delete: {s3_keys}")
-                response = s3.delete_objects(
-                    Bucket=bucket, Delete={"Objects": [{"Key": k for k in s3_keys}]}
-                )
-                logger.debug(f"Deleted: {response.get('Deleted')}")
+        prefixes = [
+            f"{stage}/{confidentiality}/{dataset_id}/version={version}/edition={edition}/{filename}"
+            for stage in STAGES
+            for filename in filenames
+        ]
+
+        with ThreadPoolExecutor(max_workers=S3_MAX_WORKERS) as executor:
+            listings = executor.map(lambda p: _list_keys(s3, bucket, p), prefixes)
+            # Prefixes may overlap (e.g. `foo.csv` and `foo.csv.gz`), so make
+            # sure each key is only deleted once.
+            s3_keys = list(dict.fromkeys(chain.from_iterable(listings)))
+
+            if not s3_keys:
+                logger.debug(f"No data to delete for distribution '{distribution_id}'")
+                return report
+
+            logger.debug(f"To delete: {s3_keys}")
+            batches = [
+                s3_keys[i : i + S3_DELETE_BATCH_SIZE]
+                for i in range(0, len(s3_keys), S3_DELETE_BATCH_SIZE)
+            ]
+            for deleted, errors in executor.map(
+                lambda b: _delete_keys(s3, bucket, b), batches
+            ):
+                report["deleted"].extend(deleted)
+                report["errors"].extend(errors)
+
+        logger.debug(f"Deleted: {report['deleted']}")
+        if report["errors"]:
+            logger.error(f"Errors deleting data: {report['errors']}")
+
+        return report
 
     def get_distribution(
         self, dataset_id, version, edition, distribution, consistent_read=False
@@ -170,6 +209,57 @@ class DistributionRepository(CommonRepository):
 
         return self.create_item(distribution_id, content, edition_id, "Edition")
 
+    def prepare_distributions(self, edition_id, contents):
+        """Validate `contents` and return new distribution items for them.
+
+        The returned items are given fresh IDs under `edition_id`, but aren't
+        written to the database.
+        """
+        for i, content in enumerate(contents):
+            try:
+                self._validate_content(content)
+            except ValidationError as e:
+                raise ValidationError(f"{i}: {e}")
+
+        return [
+            {
+                **content,
+                ID_COLUMN: f"{edition_id}/{uuid.uuid4()}",
+                TYPE_COLUMN: self.type,
+            }
+            for content in contents
+        ]
+
+    def create_distributions(self, dataset_id, version, edition, contents):
+        """Create a distribution for each element in `contents` at once.
+
+        The distributions are written in a single transaction together with a
+        check that the parent edition exists, so either every distribution is
+        created or none of them are.
+
+        Return the list of created distribution items.
+        """
+        if len(contents) > MAX_BATCH_SIZE:
+            raise ValidationError(
+                f"Can't create more than {MAX_BATCH_SIZE} distributions at once."
+            )
+
+        edition_id = f"{dataset_id}/{version}/{edition}"
+        log_add(dynamodb_parent_id=edition_id, dynamodb_num_items=len(contents))
+        items = self.prepare_distributions(edition_id, contents)
+
+        self._transact_write_items(
+            [
+                self._exists_action(edition_id, "Edition"),
+                *[self._put_action(item) for item in items],
+            ]
+        )
+
+        for item in items:
+            self._derive_content_type(item)
+
+        return items
+
     def update_distribution(self, dataset_id, version, edition, distribution, content):
         self._validate_content(content)
 
@@ -186,3 +276,29 @@ class DistributionRepository(CommonRepository):
 
     def child_repository(self):
         return None
+
+
+def _list_keys(s3, bucket, prefix):
+    """Return every S3 key in `bucket` starting with `prefix`."""
+    logger.debug(f"Looking for {prefix}")
+    paginator = s3.get_paginator("list_objects_v2")
+
+    return [
+        obj["Key"]
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+        for obj in page.get("Contents", [])
+    ]
+
+
+def _delete_keys(s3, bucket, keys):
+    """Delete `keys` from `bucket` in a single request.
+
+    Return a tuple of the deleted keys and the errors reported by S3.
+    """
+    response = s3.delete_objects(
+        Bucket=bucket, Delete={"Objects": [{"Key": k} for k in keys]}
+    )
+    return (
+        [d["Key"] for d in response.get("Deleted", [])],
+        response.get("Errors", []),
+    )
@@ -2,15 +2,23 @@ import os
 
 import simplejson as json
 from aws_xray_sdk.core import xray_recorder
-from okdata.aws.logging import logging_wrapper, log_add, log_exception
+from okdata.aws.logging import log_add, log_exception
 
 from metadata.auth import check_auth
 from metadata.common import error_response, response, validate_input
-from metadata.edition.repository import EditionRepository
-from metadata.error import DeleteConflict, ResourceConflict, ResourceNotFoundError
+from metadata.distribution.handler import add_self_url as add_distribution_url
+from metadata.edition.repository import EditionRepository, edition_name
+from metadata.error import (
+    DeleteConflict,
+    ResourceConflict,
+    ResourceNotFoundError,
+    ValidationError,
+)
+from metadata.instrumentation import logging_wrapper
 from metadata.validator import Validator
 
 validator = Validator("edition")
+publish_validator = Validator("edition_publish")
 BASE_URL = os.environ.get("BASE_URL", "")
 
 
@@ -51,6 +59,53 @@ def create_edition(event, context):
         return response(500, {"message": message})
 
 
+@logging_wrapper
+@validate_input(publish_validator)
+@check_auth("okdata:dataset:write", use_whitelist=True)
+@xray_recorder.capture("publish_edition")
+def publish_edition(event, context):
+    """POST /datasets/:dataset-id/versions/:version/editions/publish"""
+
+    content = json.loads(event["body"])
+
+    dataset_id = event["pathParameters"]["dataset-id"]
+    version = event["pathParameters"]["version"]
+    log_add(dataset_id=dataset_id, version=version)
+
+    try:
+        distributions = content["distributions"]
+        for distribution in distributions:
+            # FIXME Remove once 'distribution_type' is required
+            if "distribution_type" not in distribution:
+                distribution["distribution_type"] = "file"
+
+        body, distributions = EditionRepository().publish_edition(
+            dataset_id, version, content["edition"], distributions
+        )
+
+        edition = body["Id"].split("/")[-1]
+        log_add(edition=edition, num_distributions=len(distributions))
+
+        location = f"/datasets/{dataset_id}/versions/{version}/editions/{edition}"
+        headers = {"Location": location}
+        add_self_url(body)
+        for distribution in distributions:
+            add_distribution_url(distribution)
+        body["_embedded"] = {"distributions": distributions}
+        return response(201, body, headers)
+    except ValidationError as e:
+        log_exception(e)
+        return error_response(400, str(e))
+    except ResourceConflict as d:
+        return error_response(409, f"Resource Conflict: {d}")
+    except KeyError as ke:
+        return error_response(404, str(ke))
+    except Exception as e:
+        log_exception(e)
+        message = f"Error publishing edition. RequestId: {context.aws_request_id}"
+        return response(500, {"message": message})
+
+
 @logging_wrapper
 @validate_input(validator)
 @check_auth("okdata:dataset:write")
@@ -88,9 +143,40 @@ def get_editions(event, context):
 
     dataset_id = event["pathParameters"]["dataset-id"]
     version = event["pathParameters"]["version"]
+    query_params = event.get("queryStringParameters") or {}
     log_add(dataset_id=dataset_id, version=version)
 
-    editions = EditionRepository().get_editions(dataset_id, version)
+    try:
+        since = query_params.get("since")
+        since = since and edition_name(since)
+        until = query_params.get("until")
+        until = until and edition_name(until)
+    except ValueError:
+        return error_response(
+            400, "'since' and 'until' must be ISO 8601 formatted timestamps."
+        )
+
+    limit = query_params.get("limit")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return error_response(400, "'limit' must be a positive integer.")
+        if limit < 1:
+            return error_response(400, "'limit' must be a positive integer.")
+
+    order = query_params.get("order", "asc")
+    if order not in ["asc", "desc"]:
+        return error_response(400, "'order' must be one of 'asc' or 'desc'.")
+
+    editions = EditionRepository().get_editions(
+        dataset_id,
+        version,
+        since=since,
+        until=until,
+        limit=limit,
+        descending=order == "desc",
+    )
     log_add(num_editions=len(editions))
     for edition in editions:
         add_self_url(edition)
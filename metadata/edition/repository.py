@@ -1,23 +1,42 @@
 from datetime import datetime, timezone
 
-import boto3
 from aws_xray_sdk.core import patch
+from boto3.dynamodb.conditions import Key
 from botocore.exceptions import ClientError
-
-from metadata.common import BOTO_RESOURCE_COMMON_KWARGS
-from metadata.CommonRepository import CommonRepository
+from okdata.aws.logging import log_add
+
+from metadata.CommonRepository import (
+    ID_COLUMN,
+    MAX_TRANSACTION_SIZE,
+    TYPE_COLUMN,
+    CommonRepository,
+)
 from metadata.distribution.repository import DistributionRepository
+from metadata.storage import metadata_table
 
 patch(["boto3"])
 
 edition_fmt = "%Y%m%dT%H%M%S"
 
 
+def edition_name(timestamp):
+    """Return the edition name corresponding to ISO 8601 `timestamp`.
+
+    Edition names are UTC timestamps on the format `edition_fmt`, meaning
+    that they sort chronologically. Timestamps without a UTC offset are
+    assumed to be in UTC. Raise `ValueError` if `timestamp` doesn't parse.
+    """
+    dt = datetime.fromisoformat(timestamp)
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+
+    return dt.astimezone(timezone.utc).strftime(edition_fmt)
+
+
 class EditionRepository(CommonRepository):
     def __init__(self):
-        dynamodb = boto3.resource("dynamodb", **BOTO_RESOURCE_COMMON_KWARGS)
-
-        self.metadata_table = dynamodb.Table("dataset-metadata")
+        self.metadata_table = metadata_table()
 
         super().__init__(self.metadata_table, "Edition")
 
@@ -29,18 +48,79 @@ class EditionRepository(CommonRepository):
         edition_id = f"{dataset_id}/{version}/{edition}"
         return self.get_item(edition_id, consistent_read)
 
-    def get_editions(self, dataset_id, version, exclude_latest=True):
+    def get_editions(
+        self,
+        dataset_id,
+        version,
+        exclude_latest=True,
+        since=None,
+        until=None,
+        limit=None,
+        descending=False,
+    ):
+        """Return the editions of `version` of `dataset_id`.
+
+        When `since` and/or `until` are given (as edition names), only return
+        editions within that range, inclusive. The editions are returned in
+        chronological order, or reverse chronological order when `descending`
+        is true. At most `limit` editions are returned when given.
+        """
         version_id = f"{dataset_id}/{version}"
-        editions = self.get_items(version_id)
+
+        if not any([since, until, limit, descending]):
+            editions = self.get_items(version_id)
+        else:
+            editions = self._query_editions(
+                version_id, since, until, limit, descending, exclude_latest
+            )
 
         if exclude_latest:
             # Remove 'latest' edition
-            return list(filter(lambda i: "latest" not in i, editions))
-        return editions
+            editions = list(filter(lambda i: "latest" not in i, editions))
+        return editions[:limit] if limit else editions
+
+    def _query_editions(
+        self, version_id, since, until, limit, descending, exclude_latest
+    ):
+        log_add(
+            dynamodb_item_type=self.type,
+            dynamodb_parent_id=version_id,
+            dynamodb_since=since,
+            dynamodb_until=until,
+            dynamodb_limit=limit,
+            dynamodb_descending=descending,
+        )
+        key_condition = Key(TYPE_COLUMN).eq(self.type)
+
+        if since or until:
+            # The "latest" edition sorts after every timestamp, so it's never
+            # part of a closed range.
+            key_condition &= Key(ID_COLUMN).between(
+                f"{version_id}/{since or ''}",
+                f"{version_id}/{until or '99999999T999999'}",
+            )
+        else:
+            key_condition &= Key(ID_COLUMN).begins_with(f"{version_id}/")
+            if limit and exclude_latest:
+                # Make room for the "latest" edition which is filtered out
+                # afterwards.
+                limit += 1
+
+        return self._query(
+            {
+                "IndexName": "IdByTypeIndex",
+                "KeyConditionExpression": key_condition,
+                "ScanIndexForward": not descending,
+            },
+            limit,
+        )
+
+    @staticmethod
+    def _edition_id(dataset_id, version, content):
+        return f"{dataset_id}/{version}/{edition_name(content['edition'])}"
 
     def create_edition(self, dataset_id, version, content):
-        edition_ts = datetime.fromisoformat(content["edition"]).astimezone(timezone.utc)
-        edition_id = f"{dataset_id}/{version}/{edition_ts.strftime(edition_fmt)}"
+        edition_id = self._edition_id(dataset_id, version, content)
         version_id = f"{dataset_id}/{version}"
 
         result = self.create_item(edition_id, content, version_id, "Version")
@@ -52,6 +132,52 @@ class EditionRepository(CommonRepository):
 
         return result
 
+    def publish_edition(self, dataset_id, version, content, distributions):
+        """Create a new edition of `dataset_id` together with its distributions.
+
+        The edition, its distributions and the "latest" edition pointer are
+        written in a single transaction, so readers never see a "latest"
+        edition without distributions.
+
+        When there are too many distributions to fit in one transaction, the
+        writes are split into several transactions with the "latest" pointer
+        in the final one. A failure halfway may then leave the new edition
+        partially written, but never pointed to by "latest".
+
+        Return a tuple of the new edition item and its distribution items.
+        """
+        edition_id = self._edition_id(dataset_id, version, content)
+        version_id = f"{dataset_id}/{version}"
+        log_add(dynamodb_item_id=edition_id, dynamodb_item_type=self.type)
+
+        distribution_repository = self.child_repository()
+        distribution_items = distribution_repository.prepare_distributions(
+            edition_id, distributions
+        )
+        edition = {**content, ID_COLUMN: edition_id, TYPE_COLUMN: self.type}
+        latest = {
+            **content,
+            "latest": edition_id,
+            ID_COLUMN: f"{dataset_id}/{version}/latest",
+            TYPE_COLUMN: self.type,
+        }
+
+        actions = [
+            self._exists_action(version_id, "Version"),
+            self._put_action(edition, update_on_exists=False),
+            *[self._put_action(item) for item in distribution_items],
+            self._put_action(latest),
+        ]
+        log_add(dynamodb_num_items=len(actions) - 1)
+
+        for i in range(0, len(actions), MAX_TRANSACTION_SIZE):
+            self._transact_write_items(actions[i : i + MAX_TRANSACTION_SIZE])
+
+        for item in distribution_items:
+            distribution_repository._derive_content_type(item)
+
+        return edition, distribution_items
+
     def update_latest_edition(self, dataset_id, version, edition, content):
         current_edition_id = f"{dataset_id}/{version}/{edition}"
         latest = content.copy()
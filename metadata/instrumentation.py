@@ -0,0 +1,154 @@
+import threading
+import time
+from functools import wraps
+
+from botocore.exceptions import ClientError
+from okdata.aws.logging import log_add
+from okdata.aws.logging import logging_wrapper as okdata_logging_wrapper
+
+from metadata import coldstart, warmup
+
+# Operations consuming read capacity. Every other operation consumes write
+# capacity.
+READ_OPERATIONS = {"get_item", "query"}
+
+# Maximum number of individual calls included in the request log. Calls beyond
+# this are still counted in the totals.
+MAX_LOGGED_CALLS = 50
+
+
+def _capacity_units(consumed_capacity):
+    """Return the total capacity units of a `ConsumedCapacity` response field.
+
+    That's a single dictionary for most operations, but a list of them for
+    transactions.
+    """
+    if isinstance(consumed_capacity, dict):
+        consumed_capacity = [consumed_capacity]
+    return sum(c.get("CapacityUnits", 0) for c in consumed_capacity or [])
+
+
+def _num_items(response):
+    if "Count" in response:
+        return response["Count"]
+    if "Item" in response:
+        return 1
+    return 0
+
+
+class DynamoDBCalls:
+    """Accumulator of the DynamoDB calls made while handling a request.
+
+    Calls may be recorded from several threads at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+            self.count = 0
+            self.duration_ms = 0.0
+            self.read_capacity_units = 0.0
+            self.write_capacity_units = 0.0
+            self.operations = {}
+
+    def record(self, operation, index, num_items, duration_ms, capacity_units):
+        """Record a call of `operation` on `index` (`None` for the table)."""
+        name = f"{operation}:{index}" if index else operation
+
+        with self._lock:
+            if len(self.calls) < MAX_LOGGED_CALLS:
+                self.calls.append(
+                    {
+                        "operation": name,
+                        "items": num_items,
+                        "duration_ms": round(duration_ms, 3),
+                        "capacity_units": capacity_units,
+                    }
+                )
+            self.count += 1
+            self.duration_ms += duration_ms
+            if operation in READ_OPERATIONS:
+                self.read_capacity_units += capacity_units
+            else:
+                self.write_capacity_units += capacity_units
+            self.operations[name] = self.operations.get(name, 0) + 1
+
+    def log(self):
+        """Add the recorded calls to the request log."""
+        with self._lock:
+            log_add(
+                dynamodb_calls=self.calls,
+                dynamodb_call_count=self.count,
+                dynamodb_duration_ms=round(self.duration_ms, 3),
+                dynamodb_read_capacity_units=self.read_capacity_units,
+                dynamodb_write_capacity_units=self.write_capacity_units,
+                dynamodb_operations=self.operations,
+            )
+
+
+dynamodb_calls = DynamoDBCalls()
+
+
+def record_dynamodb_call(f, operation, index=None):
+    """Call `f` making a DynamoDB `operation` and record it in `dynamodb_calls`.
+
+    `f` should ask for the consumed capacity with `ReturnConsumedCapacity`.
+    Failed calls are recorded as well, before the error is reraised.
+    """
+    start_time = time.perf_counter_ns()
+    response = {}
+
+    try:
+        response = f()
+        return response
+    except ClientError as e:
+        response = e.response
+        raise
+    finally:
+        dynamodb_calls.record(
+            operation,
+            index,
+            _num_items(response),
+            (time.perf_counter_ns() - start_time) / 1000000.0,
+            _capacity_units(response.get("ConsumedCapacity")),
+        )
+
+
+def logging_wrapper(handler):
+    """Like okdata's `logging_wrapper`, logging every DynamoDB call as well.
+
+    The calls made while handling a request are accumulated in
+    `dynamodb_calls` and added to the request log line at the end. After the
+    first request of the container, the cold start profile is logged too.
+
+    Warm-up events aren't handled as requests, but warm up the container (see
+    `metadata.warmup`).
+    """
+
+    @okdata_logging_wrapper
+    @wraps(handler)
+    def logged(event, context):
+        init_ms = coldstart.init_duration_ms()
+        start_time = time.perf_counter_ns()
+        dynamodb_calls.reset()
+        try:
+            return handler(event, context)
+        finally:
+            dynamodb_calls.log()
+            coldstart.log_once(
+                handler.__name__,
+                init_ms,
+                (time.perf_counter_ns() - start_time) / 1000000.0,
+            )
+
+    @wraps(handler)
+    def wrapper(event, context):
+        if warmup.is_warmup_event(event):
+            return warmup.warm_up(handler.__name__)
+        return logged(event, context)
+
+    return wrapper
@@ -0,0 +1,105 @@
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+
+# Operations writing to a table, and where in their arguments the key of the
+# written item is found.
+WRITE_OPERATIONS = {
+    "put_item": "Item",
+    "update_item": "Key",
+    "delete_item": "Key",
+}
+
+
+class ItemCache:
+    """Least recently used cache of table items, expiring after `ttl` seconds.
+
+    Holds at most `max_size` items, evicting the least recently used ones
+    beyond that. Items are copied in and out, so that callers are free to
+    modify them. Safe to use from several threads at once.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """Return a copy of the item cached under `key`, or `None`."""
+        with self._lock:
+            entry = self._items.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key, item):
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl, copy.deepcopy(item))
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def written_keys(operation, kwargs):
+    """Yield the `(Id, Type)` keys written by DynamoDB `operation` `kwargs`."""
+    if operation in WRITE_OPERATIONS:
+        key = kwargs[WRITE_OPERATIONS[operation]]
+        yield key["Id"], key["Type"]
+
+    elif operation == "transact_write_items":
+        for action in kwargs["TransactItems"]:
+            if "Put" in action:
+                key = action["Put"]["Item"]
+            elif "Update" in action:
+                key = action["Update"]["Key"]
+            elif "Delete" in action:
+                key = action["Delete"]["Key"]
+            else:
+                continue
+            yield key["Id"], key["Type"]
+
+
+@cache
+def item_cache():
+    """Return the process wide item cache, or `None` if it's disabled.
+
+    The cache is opt-in, enabled by setting the environment variable
+    `ITEM_CACHE_MAX_SIZE` to the maximum number of items to cache. Items
+    expire after `ITEM_CACHE_TTL_SECONDS` seconds (default 5).
+
+    Writes only invalidate the cache of the container making them, so a
+    cached item can be up to that TTL out of date with writes made elsewhere.
+
+    Call `item_cache.cache_clear()` to read the configuration anew.
+    """
+    max_size = int(os.environ.get("ITEM_CACHE_MAX_SIZE", 0))
+
+    if max_size <= 0:
+        return None
+
+    return ItemCache(max_size, float(os.environ.get("ITEM_CACHE_TTL_SECONDS", 5)))
@@ -0,0 +1,214 @@
+"""Serve the API over HTTP locally, running the handlers in-process.
+
+HTTP requests are translated into API Gateway proxy events and dispatched by
+`metadata.router`, so the real handler code runs like it does in Lambda. Handy
+for exploring the API or load testing it with standard HTTP tools:
+
+    python -m metadata.local_server --port 8080 --workers 4 --storage dynamodb
+
+The metadata is kept either in memory (`--storage memory`, the default) or in
+DynamoDB, which may be a local stand-in like DynamoDB Local pointed to by
+`AWS_ENDPOINT_URL_DYNAMODB`. In-memory storage isn't shared between processes,
+so it's limited to a single worker.
+
+Endpoints requiring authorization check the bearer token against Keycloak like
+the deployed functions do, so they need the same environment.
+"""
+
+import argparse
+import logging
+import os
+import uuid
+from http import HTTPStatus
+from types import SimpleNamespace
+from urllib.parse import parse_qsl
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+log = logging.getLogger()
+
+# The principal ID set by the Keycloak authorizer in front of the deployed
+# API. There is no authorizer locally, so it's taken from here instead.
+LOCAL_PRINCIPAL_ID = os.environ.get("LOCAL_PRINCIPAL_ID", "local-user")
+
+
+def _headers(environ):
+    """Return the HTTP headers of WSGI `environ`, named like API Gateway does."""
+    headers = {
+        name[5:].replace("_", "-").title(): value
+        for name, value in environ.items()
+        if name.startswith("HTTP_")
+    }
+    for name in ["CONTENT_TYPE", "CONTENT_LENGTH"]:
+        if environ.get(name):
+            headers[name.replace("_", "-").title()] = environ[name]
+    return headers
+
+
+def proxy_event(environ):
+    """Return an API Gateway proxy event of the request in WSGI `environ`."""
+    content_length = int(environ.get("CONTENT_LENGTH") or 0)
+    body = environ["wsgi.input"].read(content_length) if content_length else b""
+    query = parse_qsl(environ.get("QUERY_STRING", ""), keep_blank_values=True)
+    multi_value_query = {}
+
+    for name, value in query:
+        multi_value_query.setdefault(name, []).append(value)
+
+    return {
+        "resource": "/{proxy+}",
+        "path": environ.get("PATH_INFO") or "/",
+        "httpMethod": environ["REQUEST_METHOD"],
+        "headers": _headers(environ),
+        "queryStringParameters": dict(query) or None,
+        "multiValueQueryStringParameters": multi_value_query or None,
+        "pathParameters": None,
+        "body": body.decode("utf-8") if body else None,
+        "isBase64Encoded": False,
+        "requestContext": {
+            "authorizer": {"principalId": LOCAL_PRINCIPAL_ID},
+            "identity": {"sourceIp": environ.get("REMOTE_ADDR")},
+            "requestId": str(uuid.uuid4()),
+            "stage": "local",
+        },
+    }
+
+
+def application(environ, start_response):
+    """WSGI application serving the API through `metadata.router`."""
+    from metadata.router import handler
+
+    event = proxy_event(environ)
+    context = SimpleNamespace(
+        aws_request_id=event["requestContext"]["requestId"],
+        function_name="metadata-api-local",
+        function_version="$LATEST",
+        memory_limit_in_mb=0,
+    )
+    response = handler(event, context)
+
+    status = HTTPStatus(response["statusCode"])
+    body = (response.get("body") or "").encode("utf-8")
+    headers = {
+        "Content-Type": "application/json",
+        **(response.get("headers") or {}),
+        "Content-Length": str(len(body)),
+    }
+    start_response(f"{status.value} {status.phrase}", list(headers.items()))
+
+    return [body]
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Request handler leaving the logging of requests to the handlers."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _create_table():
+    """Create the metadata table in DynamoDB, unless it already exists."""
+    import boto3
+
+    from metadata.common import BOTO_RESOURCE_COMMON_KWARGS
+    from metadata.storage import METADATA_TABLE_INDEXES, METADATA_TABLE_NAME
+
+    dynamodb = boto3.resource("dynamodb", **BOTO_RESOURCE_COMMON_KWARGS)
+    if METADATA_TABLE_NAME in [t.name for t in dynamodb.tables.all()]:
+        return
+
+    attributes = {"Id", "Type"}
+    indexes = []
+
+    for name, (hash_key, range_key, projection) in METADATA_TABLE_INDEXES.items():
+        key_schema = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+        attributes.add(hash_key)
+        if range_key:
+            key_schema.append({"AttributeName": range_key, "KeyType": "RANGE"})
+            attributes.add(range_key)
+        indexes.append(
+            {
+                "IndexName": name,
+                "KeySchema": key_schema,
+                "Projection": {"ProjectionType": projection},
+            }
+        )
+
+    dynamodb.create_table(
+        TableName=METADATA_TABLE_NAME,
+        KeySchema=[
+            {"AttributeName": "Id", "KeyType": "HASH"},
+            {"AttributeName": "Type", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": a, "AttributeType": "S"} for a in sorted(attributes)
+        ],
+        GlobalSecondaryIndexes=indexes,
+        BillingMode="PAY_PER_REQUEST",
+    ).wait_until_exists()
+
+
+def serve(host, port, workers):
+    """Serve the API on `host`:`port` with `workers` processes.
+
+    The workers share the listening socket, each handling one request at a
+    time like a Lambda container does.
+    """
+    server = make_server(host, port, application, handler_class=_QuietRequestHandler)
+    log.info(f"Serving the API on http://{host}:{server.server_port}/")
+
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for pid in children:
+            os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind to")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes"
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["memory", "dynamodb"],
+        default="memory",
+        help="Where to keep the metadata",
+    )
+    parser.add_argument(
+        "--create-table",
+        action="store_true",
+        help="Create the metadata table in DynamoDB if it doesn't exist",
+    )
+    args = parser.parse_args()
+
+    if args.storage == "memory" and args.workers > 1:
+        parser.error("In-memory storage can't be shared by several workers")
+
+    os.environ.setdefault("SERVICE_NAME", "metadata-api")
+    if args.storage == "memory":
+        os.environ["METADATA_STORAGE"] = "memory"
+    else:
+        os.environ.pop("METADATA_STORAGE", None)
+        if args.create_table:
+            _create_table()
+
+    serve(args.host, args.port, args.workers)
@@ -0,0 +1,883 @@
+"""A pure Python, in-memory stand-in for a DynamoDB table resource.
+
+`MemoryTable` implements the subset of the boto3 `Table` API used by the
+repositories, with the same request and response shapes, and the same
+`ClientError`s on failure:
+
+- `get_item`, `put_item`, `delete_item`, and `update_item`
+- `query` on the table or a global secondary index, with key conditions,
+  filters, `Limit`, `ScanIndexForward`, and pagination
+- `meta.client.transact_write_items` and `meta.client.update_item`
+
+Condition expressions of writes are accepted both as boto3 condition objects
+(`Key`/`Attr`) and as expression strings, supporting comparisons, `BETWEEN`,
+`IN`, `AND`/`OR`/`NOT`, `attribute_exists`, `attribute_not_exists`,
+`begins_with`, and `contains`. The key conditions and filters of queries must
+be boto3 condition objects; expression strings raise `ValueError`.
+Update expressions support `SET` (including `if_not_exists` and `+`/`-`),
+`REMOVE`, `ADD`, and `DELETE`.
+
+Items are kept sorted per index, so queries cost O(log n) plus the number of
+items returned, making it usable for benchmarks with a realistic number of
+items.
+"""
+
+import copy
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from types import SimpleNamespace
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+from botocore.exceptions import ClientError
+
+
+def _client_error(code, message, operation, **response):
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, **response}, operation
+    )
+
+
+def _normalize(value):
+    """Return `value` as it would be read back from DynamoDB.
+
+    Numbers are returned as `Decimal`s. Like boto3, floats are rejected.
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {_normalize(v) for v in value}
+    return value
+
+
+def _response(**kwargs):
+    return {**kwargs, "ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+# Expressions are evaluated from a small AST made of tuples:
+#
+# - ("path", [name, ...]) and ("value", value) are operands
+# - ("and", a, b), ("or", a, b), and ("not", a) combine conditions
+# - (function, operand, ...) call one of the functions in `_FUNCTIONS`
+# - (operator, a, b) compare two operands with one of `_COMPARISONS`
+# - ("between", a, low, high) and ("in", a, [b, ...])
+
+_MISSING = object()
+
+_COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def _comparable(a, b):
+    if isinstance(a, Decimal) and isinstance(b, Decimal):
+        return True
+    return type(a) is type(b) and isinstance(a, (str, bytes))
+
+
+def _begins_with(a, b):
+    return isinstance(a, (str, bytes)) and type(a) is type(b) and a.startswith(b)
+
+
+def _contains(a, b):
+    if isinstance(a, str):
+        return isinstance(b, str) and b in a
+    if isinstance(a, (set, list)):
+        return b in a
+    return False
+
+
+_FUNCTIONS = {
+    "attribute_exists": lambda a: a is not _MISSING,
+    "attribute_not_exists": lambda a: a is _MISSING,
+    "begins_with": _begins_with,
+    "contains": _contains,
+}
+
+
+def _resolve(operand, item):
+    kind, value = operand
+    if kind == "value":
+        return value
+    for name in value:
+        if not isinstance(item, dict) or name not in item:
+            return _MISSING
+        item = item[name]
+    return item
+
+
+def _evaluate(node, item):
+    """Return true if the condition AST `node` holds for `item`."""
+    op = node[0]
+
+    if op == "and":
+        return _evaluate(node[1], item) and _evaluate(node[2], item)
+    if op == "or":
+        return _evaluate(node[1], item) or _evaluate(node[2], item)
+    if op == "not":
+        return not _evaluate(node[1], item)
+    if op in _FUNCTIONS:
+        args = [_resolve(operand, item) for operand in node[1:]]
+        if op not in ("attribute_exists", "attribute_not_exists") and any(
+            arg is _MISSING for arg in args
+        ):
+            return False
+        return _FUNCTIONS[op](*args)
+    if op == "between":
+        a, low, high = (_resolve(operand, item) for operand in node[1:])
+        return _comparable(a, low) and _comparable(a, high) and low <= a <= high
+    if op == "in":
+        a = _resolve(node[1], item)
+        return a is not _MISSING and a in [_resolve(o, item) for o in node[2]]
+
+    a, b = _resolve(node[1], item), _resolve(node[2], item)
+    if a is _MISSING or b is _MISSING:
+        return False
+    if op in ("=", "<>"):
+        return _COMPARISONS[op](a, b)
+    return _comparable(a, b) and _COMPARISONS[op](a, b)
+
+
+def _condition_ast(condition):
+    """Return the AST of the boto3 condition object `condition`."""
+    if isinstance(condition, AttributeBase):
+        return ("path", condition.name.split("."))
+    if not isinstance(condition, ConditionBase):
+        return ("value", _normalize(condition))
+
+    expression = condition.get_expression()
+    op = expression["operator"]
+    values = expression["values"]
+
+    if op in ("AND", "OR", "NOT"):
+        return (op.lower(), *map(_condition_ast, values))
+    if op in ("BETWEEN", "IN"):
+        a, *rest = values
+        if op == "IN":
+            return ("in", _condition_ast(a), [_condition_ast(v) for v in rest[0]])
+        return ("between", _condition_ast(a), *map(_condition_ast, rest))
+    if op in _FUNCTIONS or op in _COMPARISONS:
+        return (op, *map(_condition_ast, values))
+
+    raise NotImplementedError(f"Unsupported condition operator: {op}")
+
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<op><>|<=|>=|[=<>(),.+\-\[\]])|(?P<word>[#:]?[A-Za-z0-9_]+))"
+)
+
+
+class _ExpressionParser:
+    """Parser of condition and update expression strings."""
+
+    def __init__(self, expression, names=None, values=None):
+        self.names = names or {}
+        self.values = {k: _normalize(v) for k, v in (values or {}).items()}
+        self.tokens = []
+        pos = 0
+
+        while pos < len(expression.rstrip()):
+            m = _TOKEN_PATTERN.match(expression, pos)
+            if not m:
+                raise self._error(f"Invalid syntax at position {pos}: {expression}")
+            self.tokens.append(m.group("op") or m.group("word"))
+            pos = m.end()
+
+        self.pos = 0
+
+    @staticmethod
+    def _error(message):
+        return _client_error("ValidationException", message, "ParseExpression")
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _peek_keyword(self, *keywords):
+        token = self._peek()
+        return token is not None and token.upper() in keywords
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise self._error("Unexpected end of expression")
+        self.pos += 1
+        return token
+
+    def _expect(self, expected):
+        token = self._next()
+        if token.upper() != expected:
+            raise self._error(f"Expected {expected}, got {token}")
+
+    def _done(self):
+        if self._peek() is not None:
+            raise self._error(f"Unexpected token: {self._peek()}")
+
+    def _name(self):
+        token = self._next()
+        if token.startswith("#"):
+            if token not in self.names:
+                raise self._error(f"Undefined attribute name: {token}")
+            return self.names[token]
+        return token
+
+    def path(self):
+        parts = [self._name()]
+        while self._peek() == ".":
+            self._next()
+            parts.append(self._name())
+        return ("path", parts)
+
+    def operand(self):
+        token = self._peek()
+        if token is not None and token.startswith(":"):
+            self._next()
+            if token not in self.values:
+                raise self._error(f"Undefined attribute value: {token}")
+            return ("value", self.values[token])
+        return self.path()
+
+    def parse_condition(self):
+        """Parse a condition expression into an AST."""
+        node = self.condition()
+        self._done()
+        return node
+
+    def condition(self):
+        node = self._and()
+        while self._peek_keyword("OR"):
+            self._next()
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._peek_keyword("AND"):
+            self._next()
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self):
+        if self._peek_keyword("NOT"):
+            self._next()
+            return ("not", self._not())
+        return self._primary()
+
+    def _primary(self):
+        if self._peek() == "(":
+            self._next()
+            node = self.condition()
+            self._expect(")")
+            return node
+
+        token = self._peek()
+        if token in _FUNCTIONS:
+            self._next()
+            self._expect("(")
+            args = [self.operand()]
+            while self._peek() == ",":
+                self._next()
+                args.append(self.operand())
+            self._expect(")")
+            return (token, *args)
+
+        a = self.operand()
+
+        if self._peek_keyword("BETWEEN"):
+            self._next()
+            low = self.operand()
+            self._expect("AND")
+            return ("between", a, low, self.operand())
+
+        if self._peek_keyword("IN"):
+            self._next()
+            self._expect("(")
+            options = [self.operand()]
+            while self._peek() == ",":
+                self._next()
+                options.append(self.operand())
+            self._expect(")")
+            return ("in", a, options)
+
+        op = self._next()
+        if op not in _COMPARISONS:
+            raise self._error(f"Unexpected token: {op}")
+        return (op, a, self.operand())
+
+    def _set_value(self):
+        if self._peek() == "if_not_exists":
+            self._next()
+            self._expect("(")
+            path = self.path()
+            self._expect(",")
+            default = self.operand()
+            self._expect(")")
+            value = ("if_not_exists", path, default)
+        else:
+            value = self.operand()
+
+        if self._peek() in ("+", "-"):
+            return (self._next(), value, self._set_value())
+        return value
+
+    def update(self):
+        """Parse an update expression into a list of `(action, path, value)`."""
+        actions = []
+
+        while self._peek() is not None:
+            clause = self._next().upper()
+            if clause not in ("SET", "REMOVE", "ADD", "DELETE"):
+                raise self._error(f"Unexpected token: {clause}")
+
+            while True:
+                path = self.path()
+                if clause == "SET":
+                    self._expect("=")
+                    actions.append((clause, path, self._set_value()))
+                elif clause == "REMOVE":
+                    actions.append((clause, path, None))
+                else:
+                    actions.append((clause, path, self.operand()))
+
+                if self._peek() != ",":
+                    break
+                self._next()
+
+        return actions
+
+
+def _set_path(item, path, value):
+    *parents, name = path[1]
+    for parent in parents:
+        item = item.setdefault(parent, {})
+    item[name] = value
+
+
+def _remove_path(item, path):
+    *parents, name = path[1]
+    for parent in parents:
+        item = item.get(parent, {})
+    item.pop(name, None)
+
+
+def _update_value(node, item):
+    if node[0] in ("path", "value"):
+        value = _resolve(node, item)
+        if value is _MISSING:
+            raise _client_error(
+                "ValidationException",
+                "The provided expression refers to an attribute that does not "
+                "exist in the item",
+                "UpdateItem",
+            )
+        return value
+    if node[0] == "if_not_exists":
+        value = _resolve(node[1], item)
+        return _resolve(node[2], item) if value is _MISSING else value
+
+    a, b = _update_value(node[1], item), _update_value(node[2], item)
+    return a + b if node[0] == "+" else a - b
+
+
+def _apply_update(item, actions):
+    # Every value is computed from the item before the update.
+    old_item = copy.deepcopy(item)
+
+    for action, path, value in actions:
+        if action == "SET":
+            _set_path(item, path, _update_value(value, old_item))
+        elif action == "REMOVE":
+            _remove_path(item, path)
+        else:
+            current = _resolve(path, item)
+            value = _resolve(value, old_item)
+            if action == "ADD":
+                if current is _MISSING:
+                    new_value = value
+                elif isinstance(current, set):
+                    new_value = current | value
+                else:
+                    new_value = current + value
+            else:
+                new_value = current - value if current is not _MISSING else set()
+            if new_value == set():
+                _remove_path(item, path)
+            else:
+                _set_path(item, path, new_value)
+
+
+class _Index:
+    """Items of a table sorted by the keys of the table or one of its indexes."""
+
+    def __init__(self, hash_key, range_key, table_keys, projection):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.table_keys = table_keys
+        self.projection = projection
+        # Maps hash key values to sorted lists of `(range key, table key)`.
+        self.partitions = {}
+
+    def _entry(self, table_key, item):
+        range_value = item.get(self.range_key, "") if self.range_key else ""
+        return (range_value, table_key)
+
+    def add(self, table_key, item):
+        if self.hash_key in item and (not self.range_key or self.range_key in item):
+            partition = self.partitions.setdefault(item[self.hash_key], [])
+            insort(partition, self._entry(table_key, item))
+
+    def remove(self, table_key, item):
+        if self.hash_key in item and (not self.range_key or self.range_key in item):
+            partition = self.partitions[item[self.hash_key]]
+            entry = self._entry(table_key, item)
+            del partition[bisect_left(partition, entry)]
+            if not partition:
+                del self.partitions[item[self.hash_key]]
+
+    def project(self, item):
+        if self.projection == "ALL":
+            return copy.deepcopy(item)
+        keys = {*self.table_keys, self.hash_key, self.range_key}
+        return {k: copy.deepcopy(v) for k, v in item.items() if k in keys}
+
+    def last_evaluated_key(self, item):
+        keys = {*self.table_keys, self.hash_key, self.range_key} - {None}
+        return {k: item[k] for k in keys}
+
+
+class MemoryTable:
+    """An in-memory table, see the module docstring.
+
+    `hash_key` and `range_key` are the names of the table's key attributes,
+    while `indexes` maps the names of its global secondary indexes to tuples
+    of their hash key, range key (or `None`), and projection type (`ALL` or
+    `KEYS_ONLY`). When `page_size` is given, queries return at most that many
+    items per page, to emulate DynamoDB's page size limit.
+    """
+
+    def __init__(self, name, hash_key, range_key=None, indexes=None, page_size=None):
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.page_size = page_size
+        self.meta = SimpleNamespace(client=_MemoryClient(self))
+        self._keys = [k for k in [hash_key, range_key] if k]
+        self._items = {}
+        self._lock = threading.RLock()
+        self._indexes = {
+            None: _Index(self.hash_key, self.range_key, self._keys, "ALL"),
+            **{
+                name: _Index(index_hash_key, index_range_key, self._keys, projection)
+                for name, (index_hash_key, index_range_key, projection) in (
+                    indexes or {}
+                ).items()
+            },
+        }
+
+    def __len__(self):
+        return len(self._items)
+
+    def _key(self, key, operation):
+        if set(key) != set(self._keys) or None in key.values():
+            raise _client_error(
+                "ValidationException",
+                "The provided key element does not match the schema",
+                operation,
+            )
+        return tuple(key[k] for k in self._keys)
+
+    def _check_condition(
+        self, condition, item, names, values, operation, return_item=False
+    ):
+        if condition is None:
+            return
+        if isinstance(condition, str):
+            ast = _ExpressionParser(condition, names, values).parse_condition()
+        else:
+            ast = _condition_ast(condition)
+
+        if not _evaluate(ast, item or {}):
+            response = {"Item": copy.deepcopy(item)} if item and return_item else {}
+            raise _client_error(
+                "ConditionalCheckFailedException",
+                "The conditional request failed",
+                operation,
+                **response,
+            )
+
+    def _store(self, table_key, item):
+        if old_item := self._items.get(table_key):
+            for index in self._indexes.values():
+                index.remove(table_key, old_item)
+        if item is None:
+            self._items.pop(table_key, None)
+            return
+        self._items[table_key] = item
+        for index in self._indexes.values():
+            index.add(table_key, item)
+
+    def get_item(self, Key, ConsistentRead=False, **kwargs):
+        with self._lock:
+            item = self._items.get(self._key(Key, "GetItem"))
+            if item is None:
+                return _response()
+            return _response(Item=copy.deepcopy(item))
+
+    def put_item(
+        self,
+        Item,
+        ConditionExpression=None,
+        ExpressionAttributeNames=None,
+        ExpressionAttributeValues=None,
+        ReturnValuesOnConditionCheckFailure=None,
+        **kwargs,
+    ):
+        item = _normalize(Item)
+        with self._lock:
+            table_key = self._key({k: item.get(k) for k in self._keys}, "PutItem")
+            self._check_condition(
+                ConditionExpression,
+                self._items.get(table_key),
+                ExpressionAttributeNames,
+                ExpressionAttributeValues,
+                "PutItem",
+                ReturnValuesOnConditionCheckFailure == "ALL_OLD",
+            )
+            self._store(table_key, item)
+        return _response()
+
+    def delete_item(
+        self,
+        Key,
+        ConditionExpression=None,
+        ExpressionAttributeNames=None,
+        ExpressionAttributeValues=None,
+        ReturnValuesOnConditionCheckFailure=None,
+        **kwargs,
+    ):
+        with self._lock:
+            table_key = self._key(Key, "DeleteItem")
+            self._check_condition(
+                ConditionExpression,
+                self._items.get(table_key),
+                ExpressionAttributeNames,
+                ExpressionAttributeValues,
+                "DeleteItem",
+                ReturnValuesOnConditionCheckFailure == "ALL_OLD",
+            )
+            self._store(table_key, None)
+        return _response()
+
+    def update_item(
+        self,
+        Key,
+        UpdateExpression,
+        ConditionExpression=None,
+        ExpressionAttributeNames=None,
+        ExpressionAttributeValues=None,
+        ReturnValues="NONE",
+        ReturnValuesOnConditionCheckFailure=None,
+        **kwargs,
+    ):
+        parser = _ExpressionParser(
+            UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues
+        )
+        actions = parser.update()
+
+        with self._lock:
+            table_key = self._key(Key, "UpdateItem")
+            old_item = self._items.get(table_key)
+            self._check_condition(
+                ConditionExpression,
+                old_item,
+                ExpressionAttributeNames,
+                ExpressionAttributeValues,
+                "UpdateItem",
+                ReturnValuesOnConditionCheckFailure == "ALL_OLD",
+            )
+            item = copy.deepcopy(old_item) if old_item else dict(Key)
+            _apply_update(item, actions)
+            self._store(table_key, item)
+
+        if ReturnValues == "ALL_NEW":
+            return _response(Attributes=copy.deepcopy(item))
+        if ReturnValues == "ALL_OLD" and old_item:
+            return _response(Attributes=copy.deepcopy(old_item))
+        return _response()
+
+    @staticmethod
+    def _key_range(condition, hash_key, range_key):
+        """Split the key condition `condition` into a hash key value and a range.
+
+        The range is a tuple of the range key operator and its operands, or
+        `None` when the condition only concerns the hash key.
+        """
+        ast = _condition_ast(condition)
+        hash_condition, range_condition = (
+            (ast[1], ast[2]) if ast[0] == "and" else (ast, None)
+        )
+
+        if range_condition and range_condition[1] == ("path", [hash_key]):
+            hash_condition, range_condition = range_condition, hash_condition
+
+        if hash_condition[:2] != ("=", ("path", [hash_key])):
+            raise _client_error(
+                "ValidationException",
+                f"Query condition missed key schema element: {hash_key}",
+                "Query",
+            )
+
+        if range_condition is None:
+            return hash_condition[2][1], None
+        if range_condition[1] != ("path", [range_key]):
+            raise _client_error(
+                "ValidationException",
+                "Query key condition not supported",
+                "Query",
+            )
+        return hash_condition[2][1], (
+            range_condition[0],
+            *[operand[1] for operand in range_condition[2:]],
+        )
+
+    @staticmethod
+    def _range_slice(partition, key_range):
+        """Return the start and stop positions of `key_range` in `partition`."""
+        if key_range is None:
+            return 0, len(partition)
+
+        op, *operands = key_range
+        # Every table key sorts after the empty tuple and before `(_MAX,)`.
+        low, high = (operands[0], ()), (operands[-1], (_MAX,))
+
+        if op == "=" or op == "between":
+            return bisect_left(partition, low), bisect_right(partition, high)
+        if op == "<":
+            return 0, bisect_left(partition, low)
+        if op == "<=":
+            return 0, bisect_right(partition, high)
+        if op == ">":
+            return bisect_right(partition, high), len(partition)
+        if op == ">=":
+            return bisect_left(partition, low), len(partition)
+        if op == "begins_with":
+            start = bisect_left(partition, low)
+            stop = start
+            while stop < len(partition) and _begins_with(
+                partition[stop][0], operands[0]
+            ):
+                stop += 1
+            return start, stop
+
+        raise _client_error(
+            "ValidationException", f"Unsupported key condition: {op}", "Query"
+        )
+
+    def query(
+        self,
+        KeyConditionExpression,
+        IndexName=None,
+        FilterExpression=None,
+        Limit=None,
+        ExclusiveStartKey=None,
+        ScanIndexForward=True,
+        **kwargs,
+    ):
+        if IndexName not in self._indexes:
+            raise _client_error(
+                "ValidationException",
+                f"The table does not have the specified index: {IndexName}",
+                "Query",
+            )
+        for name, expression in [
+            ("KeyConditionExpression", KeyConditionExpression),
+            ("FilterExpression", FilterExpression),
+        ]:
+            if isinstance(expression, str):
+                raise ValueError(
+                    f"{name} must be a boto3 condition object, not a string"
+                )
+
+        index = self._indexes[IndexName]
+        filter_ast = FilterExpression and _condition_ast(FilterExpression)
+        hash_value, key_range = self._key_range(
+            KeyConditionExpression, index.hash_key, index.range_key
+        )
+
+        with self._lock:
+            partition = index.partitions.get(hash_value, [])
+            start, stop = self._range_slice(partition, key_range)
+
+            if ExclusiveStartKey:
+                table_key = tuple(ExclusiveStartKey[k] for k in self._keys)
+                entry = index._entry(table_key, ExclusiveStartKey)
+                if ScanIndexForward:
+                    start = max(start, bisect_right(partition, entry))
+                else:
+                    stop = min(stop, bisect_left(partition, entry))
+
+            max_items = min(filter(None, [Limit, self.page_size]), default=None)
+            if max_items and stop - start > max_items:
+                if ScanIndexForward:
+                    evaluated = partition[start : start + max_items]
+                else:
+                    evaluated = partition[stop - max_items : stop]
+                more = True
+            else:
+                evaluated = partition[start:stop]
+                more = False
+
+            if not ScanIndexForward:
+                evaluated.reverse()
+
+            items = [self._items[table_key] for _, table_key in evaluated]
+            response = _response(
+                Items=[
+                    index.project(item)
+                    for item in items
+                    if not filter_ast or _evaluate(filter_ast, item)
+                ],
+                ScannedCount=len(items),
+            )
+            if more:
+                response["LastEvaluatedKey"] = index.last_evaluated_key(items[-1])
+
+        response["Count"] = len(response["Items"])
+        return response
+
+    def transact_write_items(self, TransactItems, **kwargs):
+        actions = []
+
+        for transact_item in TransactItems:
+            (action, params), *_ = transact_item.items()
+            if params["TableName"] != self.name:
+                raise _client_error(
+                    "ResourceNotFoundException",
+                    "Requested resource not found",
+                    "TransactWriteItems",
+                )
+            key = params["Item"] if action == "Put" else params["Key"]
+            table_key = self._key(
+                {k: key.get(k) for k in self._keys}, "TransactWriteItems"
+            )
+            actions.append((action, params, table_key))
+
+        if len({table_key for *_, table_key in actions}) < len(actions):
+            raise _client_error(
+                "ValidationException",
+                "Transaction request cannot include multiple operations on one item",
+                "TransactWriteItems",
+            )
+
+        with self._lock:
+            reasons = []
+            for action, params, table_key in actions:
+                try:
+                    self._check_condition(
+                        params.get("ConditionExpression"),
+                        self._items.get(table_key),
+                        params.get("ExpressionAttributeNames"),
+                        params.get("ExpressionAttributeValues"),
+                        "TransactWriteItems",
+                    )
+                    reasons.append({"Code": "None"})
+                except ClientError:
+                    reasons.append(
+                        {
+                            "Code": "ConditionalCheckFailed",
+                            "Message": "The conditional request failed",
+                        }
+                    )
+
+            if any(reason["Code"] != "None" for reason in reasons):
+                raise _client_error(
+                    "TransactionCanceledException",
+                    "Transaction cancelled, please refer cancellation reasons "
+                    "for specific reasons "
+                    f"[{', '.join(reason['Code'] for reason in reasons)}]",
+                    "TransactWriteItems",
+                    CancellationReasons=reasons,
+                )
+
+            for action, params, table_key in actions:
+                if action == "Put":
+                    self._store(table_key, _normalize(params["Item"]))
+                elif action == "Delete":
+                    self._store(table_key, None)
+                elif action == "Update":
+                    self.update_item(
+                        **{
+                            k: v
+                            for k, v in params.items()
+                            if k not in ("TableName", "ConditionExpression")
+                        }
+                    )
+
+        return _response()
+
+
+class _Max:
+    """A value sorting after every other value."""
+
+    def __lt__(self, other):
+        return False
+
+    def __gt__(self, other):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, _Max)
+
+    def __le__(self, other):
+        return isinstance(other, _Max)
+
+    def __ge__(self, other):
+        return True
+
+
+_MAX = _Max()
+
+
+class _MemoryClient:
+    """The low-level client of a `MemoryTable`, found at `table.meta.client`."""
+
+    def __init__(self, table):
+        self._table = table
+
+    def _check_table(self, table_name, operation):
+        if table_name != self._table.name:
+            raise _client_error(
+                "ResourceNotFoundException", "Requested resource not found", operation
+            )
+
+    def transact_write_items(self, TransactItems, **kwargs):
+        return self._table.transact_write_items(TransactItems, **kwargs)
+
+    def update_item(self, TableName, **kwargs):
+        self._check_table(TableName, "UpdateItem")
+        return self._table.update_item(**kwargs)
+
+    def put_item(self, TableName, **kwargs):
+        self._check_table(TableName, "PutItem")
+        return self._table.put_item(**kwargs)
+
+    def get_item(self, TableName, **kwargs):
+        self._check_table(TableName, "GetItem")
+        return self._table.get_item(**kwargs)
+
+    def delete_item(self, TableName, **kwargs):
+        self._check_table(TableName, "DeleteItem")
+        return self._table.delete_item(**kwargs)
@@ -0,0 +1,62 @@
+"""Profile the cold start of handler modules.
+
+Each module is imported in a fresh interpreter, reporting the slowest imports
+and the initialization phases recorded by `metadata.coldstart`:
+
+    python -m metadata.profile_coldstart metadata.dataset.handler jobs.update_last_read.handler
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+
+def _profile_in_subprocess(module, max_imports):
+    """Return the cold start profile of importing `module` in a fresh interpreter."""
+    code = (
+        "import importlib, json, sys\n"
+        "from metadata import coldstart\n"
+        f"importlib.import_module({module!r})\n"
+        f"json.dump(coldstart.report({max_imports!r}), sys.stdout)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+
+def _print_profile(module, profile):
+    print(f"{module}: {profile['init_duration_ms']:.1f} ms")
+    print(f"  {profile['num_imports']} modules imported, the slowest being:")
+    print(f"  {'cumulative ms':>13} {'self ms':>9}  module")
+    for i in profile["imports"]:
+        print(f"  {i['cumulative_ms']:>13.1f} {i['self_ms']:>9.1f}  {i['module']}")
+
+    if profile["phases"]:
+        print("  Initialization phases:")
+        for name, p in sorted(profile["phases"].items()):
+            print(f"  {p['duration_ms']:>13.1f} {p['count']:>9}x {name}")
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Profile the cold start of handler modules."
+    )
+    parser.add_argument("modules", nargs="+", help="Handler modules to import")
+    parser.add_argument(
+        "--top", type=int, default=20, help="Number of modules to show per handler"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print the profiles as JSON"
+    )
+    args = parser.parse_args()
+
+    profiles = {m: _profile_in_subprocess(m, args.top) for m in args.modules}
+
+    if args.json:
+        print(json.dumps(profiles, indent=2))
+    else:
+        for module, profile in profiles.items():
+            _print_profile(module, profile)
@@ -0,0 +1,187 @@
+"""A single entry point dispatching API Gateway proxy events to the handlers.
+
+Every endpoint is normally deployed as a function of its own. Deploying this
+router as one function serving every endpoint instead (see
+`serverless/functions/router.yaml`) means the endpoints share warm containers,
+so the rarely used ones are seldom cold.
+"""
+
+import importlib
+import logging
+import re
+from functools import cache
+from urllib.parse import unquote
+
+from metadata import warmup
+from metadata.common import error_response
+
+log = logging.getLogger()
+
+_DATASET = "/datasets/{dataset-id}"
+_VERSION = f"{_DATASET}/versions/{{version}}"
+_EDITION = f"{_VERSION}/editions/{{edition}}"
+_DISTRIBUTION = f"{_EDITION}/distributions/{{distribution}}"
+
+# The HTTP method and path template of every endpoint, and the handler function
+# serving it. Keep in sync with `serverless/functions/`.
+ROUTES = [
+    ("GET", "/datasets", "metadata.dataset.handler.get_datasets"),
+    ("POST", "/datasets", "metadata.dataset.handler.create_dataset"),
+    ("GET", _DATASET, "metadata.dataset.handler.get_dataset"),
+    ("PUT", _DATASET, "metadata.dataset.handler.update_dataset"),
+    ("PATCH", _DATASET, "metadata.dataset.handler.patch_dataset"),
+    ("GET", f"{_DATASET}/code-examples", "metadata.dataset.handler.get_code_examples"),
+    (
+        "GET",
+        f"{_DATASET}/statistics",
+        "metadata.statistics.handler.get_read_statistics",
+    ),
+    ("GET", f"{_DATASET}/versions", "metadata.version.handler.get_versions"),
+    ("POST", f"{_DATASET}/versions", "metadata.version.handler.create_version"),
+    ("GET", _VERSION, "metadata.version.handler.get_version"),
+    ("PUT", _VERSION, "metadata.version.handler.update_version"),
+    ("DELETE", _VERSION, "metadata.version.handler.delete_version"),
+    ("GET", f"{_VERSION}/editions", "metadata.edition.handler.get_editions"),
+    ("POST", f"{_VERSION}/editions", "metadata.edition.handler.create_edition"),
+    (
+        "POST",
+        f"{_VERSION}/editions/publish",
+        "metadata.edition.handler.publish_edition",
+    ),
+    ("GET", _EDITION, "metadata.edition.handler.get_edition"),
+    ("PUT", _EDITION, "metadata.edition.handler.update_edition"),
+    ("DELETE", _EDITION, "metadata.edition.handler.delete_edition"),
+    (
+        "GET",
+        f"{_EDITION}/distributions",
+        "metadata.distribution.handler.get_distributions",
+    ),
+    (
+        "POST",
+        f"{_EDITION}/distributions",
+        "metadata.distribution.handler.create_distribution",
+    ),
+    (
+        "POST",
+        f"{_EDITION}/distributions/batch",
+        "metadata.distribution.handler.create_distributions",
+    ),
+    ("GET", _DISTRIBUTION, "metadata.distribution.handler.get_distribution"),
+    ("PUT", _DISTRIBUTION, "metadata.distribution.handler.update_distribution"),
+    ("DELETE", _DISTRIBUTION, "metadata.distribution.handler.delete_distribution"),
+]
+
+_PARAMETER = re.compile(r"{([^}]+)}")
+
+
+class NoRoute(Exception):
+    pass
+
+
+class MethodNotAllowed(NoRoute):
+    pass
+
+
+def _compile(template):
+    """Return a regex matching paths of `template`, and its parameter names.
+
+    Parameters are matched by position, as names like `dataset-id` aren't valid
+    regex group names.
+    """
+    pattern = "".join(
+        "([^/]+)" if i % 2 else re.escape(part)
+        for i, part in enumerate(_PARAMETER.split(template))
+    )
+    return re.compile(f"{pattern}/?"), _PARAMETER.findall(template)
+
+
+def _route_table(routes):
+    """Return `routes` compiled and ordered for matching.
+
+    Templates with fewer parameters are tried first, so that fixed segments
+    like `editions/publish` win over parameters like `editions/{edition}`, as
+    they do in API Gateway.
+    """
+    table = []
+
+    for method, template, handler_name in routes:
+        regex, parameter_names = _compile(template)
+        table.append((method, template, regex, parameter_names, handler_name))
+
+    return sorted(table, key=lambda route: len(route[3]))
+
+
+ROUTE_TABLE = _route_table(ROUTES)
+
+# Handler names by method and template, for events from API Gateway routes
+# that already name the template as their resource.
+HANDLERS_BY_RESOURCE = {(method, template): name for method, template, name in ROUTES}
+
+
+@cache
+def _handler(handler_name):
+    """Return the handler function called `handler_name`.
+
+    Handler modules are imported on first use, so that a cold start only pays
+    for the endpoints actually requested.
+    """
+    module_name, function_name = handler_name.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def match(method, path):
+    """Return the handler name, template and path parameters of `method` `path`.
+
+    Raise `NoRoute` if no route matches, or `MethodNotAllowed` if only routes
+    of other methods match the path.
+    """
+    path_matches = False
+
+    for route_method, template, regex, parameter_names, handler_name in ROUTE_TABLE:
+        if not (m := regex.fullmatch(path)):
+            continue
+        if route_method != method:
+            path_matches = True
+            continue
+        parameters = dict(zip(parameter_names, map(unquote, m.groups())))
+        return handler_name, template, parameters
+
+    if path_matches:
+        raise MethodNotAllowed(f"Method {method} not allowed for {path}")
+    raise NoRoute(f"No such resource: {path}")
+
+
+def handler(event, context):
+    """Route API Gateway proxy `event` to the handler of its method and path.
+
+    Events from the routes of `ROUTES` are dispatched on their resource as is.
+    Other events (e.g. from a catch-all `{proxy+}` resource) are matched by
+    their path, with path parameters set accordingly.
+
+    On warm-up, every handler module is imported before warming up.
+    """
+    if warmup.is_warmup_event(event):
+        for handler_name in HANDLERS_BY_RESOURCE.values():
+            _handler(handler_name)
+        return warmup.warm_up("handler")
+
+    method = event.get("httpMethod", "")
+    handler_name = HANDLERS_BY_RESOURCE.get((method, event.get("resource")))
+
+    if handler_name:
+        return _handler(handler_name)(event, context)
+
+    path = event.get("path", "")
+
+    try:
+        handler_name, template, parameters = match(method, path)
+    except MethodNotAllowed as e:
+        log.info(str(e))
+        return error_response(405, str(e))
+    except NoRoute as e:
+        log.info(str(e))
+        return error_response(404, str(e))
+
+    event = {**event, "resource": template, "pathParameters": parameters or None}
+
+    return _handler(handler_name)(event, context)
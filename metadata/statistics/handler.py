@@ -0,0 +1,35 @@
+from aws_xray_sdk.core import xray_recorder
+from okdata.aws.logging import log_add
+
+from metadata.common import error_response, response
+from metadata.dataset.repository import DatasetRepository
+from metadata.instrumentation import logging_wrapper
+from metadata.statistics.repository import StatisticsRepository, statistics_hour
+
+
+@logging_wrapper
+@xray_recorder.capture("get_read_statistics")
+def get_read_statistics(event, context):
+    """GET /datasets/:dataset-id/statistics"""
+
+    dataset_id = event["pathParameters"]["dataset-id"]
+    query_params = event.get("queryStringParameters") or {}
+    log_add(dataset_id=dataset_id)
+
+    try:
+        since = query_params.get("since")
+        since = since and statistics_hour(since)
+        until = query_params.get("until")
+        until = until and statistics_hour(until)
+    except ValueError:
+        return error_response(
+            400, "'since' and 'until' must be ISO 8601 formatted timestamps."
+        )
+
+    if not DatasetRepository().dataset_exists(dataset_id):
+        return error_response(404, f"Dataset {dataset_id} does not exist")
+
+    statistics = StatisticsRepository().get_read_statistics(dataset_id, since, until)
+    log_add(num_statistics=len(statistics))
+
+    return response(200, statistics)
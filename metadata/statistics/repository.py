@@ -0,0 +1,142 @@
+import hashlib
+import math
+from datetime import datetime, timezone
+
+from aws_xray_sdk.core import patch
+from boto3.dynamodb.conditions import Key
+from okdata.aws.logging import log_add
+
+from metadata.CommonRepository import ID_COLUMN, TYPE_COLUMN, CommonRepository
+from metadata.storage import metadata_table
+
+patch(["boto3"])
+
+# Format of the hours that read statistics are rolled up by.
+hour_fmt = "%Y%m%d%H"
+
+# Number of buckets that requesters are hashed into when counting the distinct
+# requesters of an hour. Only the buckets are stored, never the requesters
+# themselves, bounding the size of the rollups. The count is an estimate,
+# accurate to a few percent up to a few hundred requesters.
+REQUESTER_BUCKETS = 1024
+
+
+def requester_bucket(requester):
+    """Return the bucket that `requester` is counted in."""
+    digest = hashlib.blake2b(requester.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % REQUESTER_BUCKETS
+
+
+def estimate_requesters(buckets):
+    """Return the estimated number of distinct requesters filling `buckets`.
+
+    This is linear counting, correcting for requesters colliding in the same
+    bucket.
+    """
+    empty = REQUESTER_BUCKETS - len(buckets)
+
+    if empty == 0:
+        # Saturated; there are at least this many.
+        return REQUESTER_BUCKETS
+
+    return round(REQUESTER_BUCKETS * math.log(REQUESTER_BUCKETS / empty))
+
+
+def statistics_hour(timestamp):
+    """Return the statistics hour containing ISO 8601 `timestamp`.
+
+    Timestamps without a UTC offset are assumed to be in UTC. Raise
+    `ValueError` if `timestamp` doesn't parse.
+    """
+    dt = datetime.fromisoformat(timestamp)
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+
+    return dt.astimezone(timezone.utc).strftime(hour_fmt)
+
+
+class StatisticsRepository(CommonRepository):
+    """Hourly rollups of the reads of each dataset.
+
+    Each rollup item has the ID `{dataset_id}/{hour}`, where `hour` is on the
+    format `hour_fmt`, making the rollups of a dataset sort chronologically.
+    """
+
+    def __init__(self):
+        self.metadata_table = metadata_table()
+
+        super().__init__(self.metadata_table, "ReadStatistics")
+
+    def add_read_statistics(
+        self, dataset_id, hour, reads, bytes_sent, errors, requesters
+    ):
+        """Add read counters to the rollup of `dataset_id` in `hour`.
+
+        The counters are added atomically to any existing ones, and the
+        buckets of `requesters` are merged into the hour's set of requester
+        buckets (see `REQUESTER_BUCKETS`). Like
+        `DatasetRepository.update_last_read`, this uses the thread safe
+        underlying client.
+        """
+        self._call_table(
+            "update_item",
+            client=True,
+            Key={ID_COLUMN: f"{dataset_id}/{hour}", TYPE_COLUMN: self.type},
+            UpdateExpression=(
+                "SET dataset_id = :dataset_id, #hour = :hour "
+                "ADD #reads :reads, bytes_sent :bytes_sent, #errors :errors, "
+                "requester_buckets :requester_buckets"
+            ),
+            ExpressionAttributeNames={
+                "#hour": "hour",
+                "#reads": "reads",
+                "#errors": "errors",
+            },
+            ExpressionAttributeValues={
+                ":dataset_id": dataset_id,
+                ":hour": hour,
+                ":reads": reads,
+                ":bytes_sent": bytes_sent,
+                ":errors": errors,
+                ":requester_buckets": {requester_bucket(r) for r in requesters},
+            },
+        )
+
+    def get_read_statistics(self, dataset_id, since=None, until=None):
+        """Return the hourly read statistics of `dataset_id`.
+
+        When `since` and/or `until` are given (as statistics hours), only
+        return statistics within that range, inclusive. The statistics are
+        returned in chronological order, with the number of distinct
+        requesters estimated.
+        """
+        log_add(
+            dynamodb_item_type=self.type,
+            dynamodb_parent_id=dataset_id,
+            dynamodb_since=since,
+            dynamodb_until=until,
+        )
+        items = self._query(
+            {
+                "IndexName": "IdByTypeIndex",
+                "KeyConditionExpression": Key(TYPE_COLUMN).eq(self.type)
+                & Key(ID_COLUMN).between(
+                    f"{dataset_id}/{since or ''}",
+                    f"{dataset_id}/{until or '9999999999'}",
+                ),
+            }
+        )
+
+        return [
+            {
+                "hour": datetime.strptime(item["hour"], hour_fmt)
+                .replace(tzinfo=timezone.utc)
+                .isoformat(),
+                "reads": int(item["reads"]),
+                "bytes_sent": int(item["bytes_sent"]),
+                "errors": int(item["errors"]),
+                "requesters": estimate_requesters(item["requester_buckets"]),
+            }
+            for item in items
+        ]
@@ -0,0 +1,62 @@
+import os
+from functools import cache
+
+import boto3
+
+from metadata import coldstart, warmup
+from metadata.common import BOTO_RESOURCE_COMMON_KWARGS
+from metadata.memory_table import MemoryTable
+
+METADATA_TABLE_NAME = "dataset-metadata"
+
+# The global secondary indexes of the metadata table, as given to
+# `MemoryTable`.
+METADATA_TABLE_INDEXES = {
+    "IdByTypeIndex": ("Type", "Id", "ALL"),
+    "IdByApiIdSparseIndex": ("api_id", None, "KEYS_ONLY"),
+}
+
+
+def metadata_table():
+    """Return the table holding the metadata.
+
+    This is the `dataset-metadata` DynamoDB table, unless the environment
+    variable `METADATA_STORAGE` is set to `memory`. Then a process wide
+    `MemoryTable` is returned instead, for running without AWS (e.g. locally
+    or in benchmarks).
+    """
+    if os.environ.get("METADATA_STORAGE") == "memory":
+        return memory_metadata_table()
+
+    return _dynamodb_resource().Table(METADATA_TABLE_NAME)
+
+
+@cache
+def _dynamodb_resource():
+    """Return the process wide DynamoDB resource.
+
+    It's shared by every table, so that they share connections too.
+    """
+    with coldstart.phase("dynamodb_resource"):
+        return boto3.resource("dynamodb", **BOTO_RESOURCE_COMMON_KWARGS)
+
+
+@warmup.warmer
+def _open_dynamodb_connection():
+    """Load the DynamoDB service model and open a connection to DynamoDB."""
+    if os.environ.get("METADATA_STORAGE") == "memory":
+        return
+
+    metadata_table().get_item(Key={"Id": "warmup", "Type": "Warmup"})
+
+
+@cache
+def memory_metadata_table():
+    """Return the process wide in-memory metadata table.
+
+    Call `memory_metadata_table.cache_clear()` to start over with an empty
+    table.
+    """
+    return MemoryTable(
+        METADATA_TABLE_NAME, "Id", "Type", indexes=METADATA_TABLE_INDEXES
+    )
@@ -1,19 +1,37 @@
 import json
 from pathlib import Path
 from jsonschema import Draft7Validator, FormatChecker
+from referencing import Registry, Resource
+
+from metadata import coldstart
 
 
 class Validator:
     def __init__(self, object_type):
         self.path = Path(__file__).parent
-        try:
-            with open(f"{self.path.parent}/schema/{object_type}.json", "r") as f:
-                schema = json.loads(f.read())
-                self.validator = Draft7Validator(
-                    schema=schema, format_checker=FormatChecker()
-                )
-        except IOError:
-            raise Exception(f"Missing schema for object {object_type}!")
+        with coldstart.phase("schema_validators"):
+            try:
+                schema = self._load_schema(object_type)
+            except IOError:
+                raise Exception(f"Missing schema for object {object_type}!")
+
+            self.validator = Draft7Validator(
+                schema=schema,
+                format_checker=FormatChecker(),
+                # Resolve references like `{"$ref": "distribution.json"}` to the
+                # other schemas in the schema directory.
+                registry=Registry(retrieve=self._retrieve),
+            )
+
+    def _load_schema(self, filename):
+        if not filename.endswith(".json"):
+            filename = f"{filename}.json"
+
+        with open(f"{self.path.parent}/schema/{filename}", "r") as f:
+            return json.loads(f.read())
+
+    def _retrieve(self, uri):
+        return Resource.from_contents(self._load_schema(uri))
 
     def validate(self, validation_object):
         errors = []
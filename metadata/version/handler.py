@@ -2,12 +2,13 @@ import os
 
 import simplejson as json
 from aws_xray_sdk.core import xray_recorder
-from okdata.aws.logging import logging_wrapper, log_add, log_exception
+from okdata.aws.logging import log_add, log_exception
 
 from metadata.auth import check_auth
 from metadata.common import error_response, response, validate_input
 from metadata.error import DeleteConflict, ResourceConflict, ResourceNotFoundError
 from metadata.error import InvalidVersionError
+from metadata.instrumentation import logging_wrapper
 from metadata.validator import Validator
 from metadata.version.repository import VersionRepository
 
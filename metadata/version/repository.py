@@ -1,20 +1,17 @@
-import boto3
 from aws_xray_sdk.core import patch
 from botocore.exceptions import ClientError
 
-from metadata.common import BOTO_RESOURCE_COMMON_KWARGS
 from metadata.CommonRepository import CommonRepository
 from metadata.edition.repository import EditionRepository
 from metadata.error import InvalidVersionError
+from metadata.storage import metadata_table
 
 patch(["boto3"])
 
 
 class VersionRepository(CommonRepository):
     def __init__(self):
-        dynamodb = boto3.resource("dynamodb", **BOTO_RESOURCE_COMMON_KWARGS)
-
-        self.metadata_table = dynamodb.Table("dataset-metadata")
+        self.metadata_table = metadata_table()
 
         super().__init__(self.metadata_table, "Version")
 
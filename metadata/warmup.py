@@ -0,0 +1,52 @@
+"""Warm-up of fresh Lambda containers before they serve real requests.
+
+Containers started for provisioned concurrency are sent a warm-up event, like
+the one sent by `serverless-plugin-warmup`. Instead of handling it as a
+request, every warmer registered with `warmer` is run, paying the lazy costs
+of the first request up front: loading boto3 service models, opening
+connections, compiling templates, and so on.
+
+Modules register their own warmers when imported, so a container only warms up
+what its handler actually uses.
+"""
+
+import time
+
+from metadata import coldstart
+from metadata.common import response
+
+WARMUP_SOURCE = "serverless-plugin-warmup"
+
+_warmers = []
+
+
+def warmer(f):
+    """Register `f` to be called on warm-up."""
+    _warmers.append(f)
+    return f
+
+
+def is_warmup_event(event):
+    return isinstance(event, dict) and (
+        event.get("source") == WARMUP_SOURCE or event.get("warmup") is True
+    )
+
+
+def warm_up(handler_name):
+    """Run every registered warmer and return a response saying so.
+
+    The cold start profile is logged afterwards, if it hasn't been already.
+    """
+    init_ms = coldstart.init_duration_ms()
+    start_time = time.perf_counter_ns()
+
+    with coldstart.phase("warmup"):
+        for f in _warmers:
+            f()
+
+    duration_ms = (time.perf_counter_ns() - start_time) / 1000000.0
+    coldstart.log_once(handler_name, init_ms, duration_ms)
+
+    return response(
+        200, {"warmers": len(_warmers), "duration_ms": round(duration_ms, 3)}
+    )
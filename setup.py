@@ -39,6 +39,7 @@ setuptools.setup(
         "okdata-aws>=6",
         "python-keycloak",
         "okdata-resource-auth",
+        "zstandard",
     ],
     python_requires="==3.13.*",
 )
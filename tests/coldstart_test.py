@@ -0,0 +1,83 @@
+import importlib
+import sys
+
+import pytest
+
+from metadata import coldstart
+from metadata.dataset import handler as dataset_handler
+from metadata.profile_coldstart import _profile_in_subprocess
+from tests import common_test_helper
+
+
+@pytest.fixture
+def logged(mocker):
+    mocker.patch.object(coldstart, "_logged", False)
+    return mocker.patch("okdata.aws.logging.logger.msg")
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    """A fresh import profiler, as the first invocation uninstalls it."""
+    profiler = coldstart._ImportProfiler()
+    meta_path = [f for f in sys.meta_path if f is not coldstart._profiler]
+    monkeypatch.setattr(sys, "meta_path", [profiler, *meta_path])
+    monkeypatch.setattr(coldstart, "_profiler", profiler)
+    return profiler
+
+
+def test_imports_are_recorded(tmp_path, monkeypatch, profiler):
+    (tmp_path / "coldstart_outer.py").write_text("import coldstart_inner\n")
+    (tmp_path / "coldstart_inner.py").write_text("import time\ntime.sleep(0.01)\n")
+    monkeypatch.syspath_prepend(tmp_path)
+
+    importlib.import_module("coldstart_outer")
+    imports = {i["module"]: i for i in coldstart.report()["imports"]}
+
+    assert imports["coldstart_inner"]["self_ms"] >= 10
+    assert imports["coldstart_outer"]["cumulative_ms"] >= 10
+    assert imports["coldstart_outer"]["self_ms"] < 10
+
+    for name in ["coldstart_outer", "coldstart_inner"]:
+        del sys.modules[name]
+
+
+def test_phases_add_up():
+    with coldstart.phase("test_phase"):
+        pass
+    with coldstart.phase("test_phase"):
+        pass
+
+    assert coldstart.report()["phases"]["test_phase"]["count"] == 2
+
+
+def test_report_is_limited():
+    assert len(coldstart.report(3)["imports"]) == 3
+
+
+def test_logged_once_per_container(dynamodb, event, logged):
+    common_test_helper.create_metadata_table(dynamodb)
+
+    dataset_handler.get_dataset(event(dataset="foo"), None)
+    dataset_handler.get_dataset(event(dataset="foo"), None)
+
+    logged.assert_called_once()
+    args, kwargs = logged.call_args
+    assert args == ("Cold start profile",)
+    assert kwargs["handler_method"] == "get_dataset"
+    assert kwargs["first_invocation_ms"] > 0
+    assert {"init_duration_ms", "imports", "phases"} <= kwargs.keys()
+    assert len(kwargs["imports"]) <= coldstart.MAX_LOGGED_IMPORTS
+
+
+def test_uninstalled_after_logging(profiler, logged):
+    coldstart.log_once("get_dataset", 1.0, 1.0)
+
+    assert profiler not in sys.meta_path
+    assert coldstart._profiler is None
+
+
+def test_profile_in_subprocess():
+    profile = _profile_in_subprocess("metadata.validator", 5)
+
+    assert profile["imports"][0]["module"] == "metadata.validator"
+    assert len(profile["imports"]) == 5
@@ -7,6 +7,7 @@ from boto3.dynamodb.conditions import Key
 import metadata.dataset.repository as dataset_repository
 import tests.common_test_helper as common
 from metadata.CommonRepository import ID_COLUMN, TYPE_COLUMN
+from metadata.error import ResourceNotFoundError
 
 
 @pytest.fixture(autouse=True)
@@ -459,6 +460,32 @@ class TestPatchDataset:
         ]
 
 
+class TestUpdateLastRead:
+    def test_update_last_read(self, metadata_table):
+        metadata_table.put_item(Item={"Id": "foo", "Type": "Dataset", "title": "Foo"})
+        dataset_repo = dataset_repository.DatasetRepository()
+
+        assert dataset_repo.update_last_read("foo", "2020-01-02T00:00:00+00:00")
+        # Never moved backwards
+        assert not dataset_repo.update_last_read("foo", "2020-01-01T00:00:00+00:00")
+        assert not dataset_repo.update_last_read("foo", "2020-01-02T00:00:00+00:00")
+
+        dataset = dataset_repo.get_dataset("foo")
+        assert dataset["last_read"] == "2020-01-02T00:00:00+00:00"
+        assert dataset["title"] == "Foo"
+
+    def test_dataset_not_exist(self, metadata_table):
+        dataset_repo = dataset_repository.DatasetRepository()
+
+        with pytest.raises(ResourceNotFoundError):
+            dataset_repo.update_last_read("foo", "2020-01-01T00:00:00+00:00")
+
+        # The update didn't create the dataset
+        assert "Item" not in metadata_table.get_item(
+            Key={ID_COLUMN: "foo", TYPE_COLUMN: "Dataset"}
+        )
+
+
 class TestGetDataset:
     def test_get_all_datasets(self, event, auth_event, metadata_table, raw_dataset):
         import metadata.dataset.handler as dataset_handler
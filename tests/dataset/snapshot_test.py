@@ -0,0 +1,160 @@
+import json
+
+import pytest
+from freezegun import freeze_time
+
+import metadata.dataset.handler as dataset_handler
+import tests.common_test_helper as common
+from metadata.dataset import snapshot
+from metadata.dataset.repository import DatasetRepository
+from metadata.dataset.snapshot import ListingSnapshotRepository, SnapshotConflict
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return common.create_metadata_table(dynamodb)
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setenv("ENABLE_CATALOG_SNAPSHOT", "true")
+
+
+def _listing(event):
+    response = dataset_handler.get_datasets(event(), None)
+    assert response["statusCode"] == 200
+    return json.loads(response["body"])
+
+
+def test_rebuild_matches_listing(event, put_dataset):
+    repository = ListingSnapshotRepository()
+    repository.apply({})
+
+    assert json.loads(repository.get_body()) == _listing(event)
+
+
+def test_apply_changes(event, put_dataset):
+    repository = ListingSnapshotRepository()
+    repository.apply({})
+    dataset = {"Id": "aaa", "Type": "Dataset", "title": "First"}
+
+    repository.apply({"aaa": dataset, put_dataset: None})
+
+    assert json.loads(repository.get_body()) == [
+        {**dataset, "_links": {"self": {"href": "/datasets/aaa"}}}
+    ]
+
+    repository.apply({"aaa": {**dataset, "title": "Changed"}})
+
+    assert [d["title"] for d in json.loads(repository.get_body())] == ["Changed"]
+
+
+def test_build_applies_changes_missed_by_query(put_dataset, mocker):
+    # The index queried hasn't caught up with the dataset just inserted.
+    mocker.patch.object(
+        DatasetRepository,
+        "get_datasets",
+        return_value=[{"Id": put_dataset, "Type": "Dataset"}],
+    )
+    repository = ListingSnapshotRepository()
+
+    repository.apply({"aaa": {"Id": "aaa", "Type": "Dataset"}})
+
+    assert [d["Id"] for d in json.loads(repository.get_body())] == [
+        "aaa",
+        put_dataset,
+    ]
+
+
+def test_store_conflict():
+    repository = ListingSnapshotRepository()
+    repository.apply({})
+
+    with pytest.raises(SnapshotConflict):
+        repository._store([], None)
+
+    with pytest.raises(SnapshotConflict):
+        repository._store([], 42)
+
+
+def test_apply_retries_conflicts(mocker):
+    repository = ListingSnapshotRepository()
+    store = mocker.patch.object(
+        repository, "_store", side_effect=[SnapshotConflict, None]
+    )
+
+    repository.apply({})
+
+    assert store.call_count == 2
+
+
+def test_too_large_snapshot_is_marked(monkeypatch, mocker, put_dataset):
+    repository = ListingSnapshotRepository()
+    query_listing = mocker.spy(repository, "_query_listing")
+
+    with freeze_time("2020-01-01T00:00:00Z"):
+        repository.apply({})
+        monkeypatch.setattr(snapshot, "MAX_SNAPSHOT_SIZE", 10)
+        repository.apply({"aaa": {"Id": "aaa", "Type": "Dataset"}})
+
+        assert repository.get_body() is None
+
+    # Not rebuilt until it's time to check whether it fits again.
+    with freeze_time("2020-01-01T00:59:59Z"):
+        repository.apply({"bbb": {"Id": "bbb", "Type": "Dataset"}})
+        assert query_listing.call_count == 1
+
+    with freeze_time("2020-01-01T01:00:00Z"):
+        monkeypatch.setattr(snapshot, "MAX_SNAPSHOT_SIZE", 350 * 1024)
+        repository.apply({"bbb": {"Id": "bbb", "Type": "Dataset"}})
+
+        assert query_listing.call_count == 2
+        assert [d["Id"] for d in json.loads(repository.get_body())] == [
+            put_dataset,
+            "bbb",
+        ]
+
+
+def test_get_body_decompresses_once(put_dataset, mocker):
+    repository = ListingSnapshotRepository()
+    repository.apply({})
+    decompress = mocker.spy(snapshot.gzip, "decompress")
+
+    assert repository.get_body() == repository.get_body()
+    assert decompress.call_count == 1
+
+    repository.apply({"aaa": {"Id": "aaa", "Type": "Dataset"}})
+
+    assert "aaa" in repository.get_body()
+
+
+def test_get_datasets_from_snapshot(event, enabled, put_dataset, mocker):
+    ListingSnapshotRepository().apply({})
+    get_datasets = mocker.spy(dataset_handler.dataset_repository, "get_datasets")
+
+    response = dataset_handler.get_datasets(event(), None)
+
+    assert [d["Id"] for d in json.loads(response["body"])] == [put_dataset]
+    assert response["headers"]["Access-Control-Allow-Origin"] == "*"
+    get_datasets.assert_not_called()
+
+
+def test_get_datasets_filtered(event, enabled, put_dataset, mocker):
+    ListingSnapshotRepository().apply({})
+    get_datasets = mocker.spy(dataset_handler.dataset_repository, "get_datasets")
+
+    dataset_handler.get_datasets(event(query_params={"parent_id": "foo"}), None)
+
+    get_datasets.assert_called_once()
+
+
+def test_get_datasets_without_snapshot(event, enabled, put_dataset):
+    assert [d["Id"] for d in _listing(event)] == [put_dataset]
+
+
+def test_get_datasets_snapshot_disabled(event, put_dataset, mocker):
+    ListingSnapshotRepository().apply({"aaa": {"Id": "aaa", "Type": "Dataset"}})
+    get_body = mocker.spy(dataset_handler.snapshot_repository, "get_body")
+
+    assert [d["Id"] for d in _listing(event)] == [put_dataset]
+    get_body.assert_not_called()
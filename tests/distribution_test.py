@@ -8,6 +8,7 @@ from boto3.dynamodb.conditions import Key
 from metadata.CommonRepository import ID_COLUMN
 from metadata.distribution.handler import (
     create_distribution,
+    create_distributions,
     delete_distribution,
     get_distribution,
     get_distributions,
@@ -286,6 +287,142 @@ class TestCreateDistribution:
         ]
 
 
+class TestCreateDistributions:
+    def test_create_distributions(self, metadata_table, auth_event, put_edition):
+        dataset_id, version, edition = put_edition
+        create_event = auth_event(
+            [
+                common_test_helper.raw_file_distribution,
+                common_test_helper.raw_api_distribution,
+                {"filenames": ["foo.parquet"]},
+            ],
+            dataset=dataset_id,
+            version=version,
+            edition=edition,
+        )
+
+        response = create_distributions(create_event, None)
+        body = json.loads(response["body"])
+
+        assert response["statusCode"] == 201
+        assert len(body) == 3
+        assert [d["distribution_type"] for d in body] == ["file", "api", "file"]
+        assert [d["content_type"] for d in body] == [
+            "text/csv",
+            "text/csv",
+            "application/parquet",
+        ]
+
+        id_regex = f"{dataset_id}/{version}/{edition}/[0-9a-f-]+"
+        for distribution in body:
+            assert re.fullmatch(id_regex, distribution["Id"])
+            assert distribution["_links"]["self"]["href"].endswith(
+                distribution["Id"].split("/")[-1]
+            )
+
+        db_response = metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Distribution")
+            & Key(ID_COLUMN).begins_with(f"{dataset_id}/{version}/{edition}/"),
+        )
+        assert db_response["Count"] == 3
+
+    def test_create_distributions_schema_error(
+        self, metadata_table, auth_event, put_edition
+    ):
+        dataset_id, version, edition = put_edition
+        bad_content = common_test_helper.raw_file_distribution.copy()
+        bad_content["distribution_type"] = "foo"
+        create_event = auth_event(
+            [common_test_helper.raw_file_distribution, bad_content],
+            dataset=dataset_id,
+            version=version,
+            edition=edition,
+        )
+
+        response = create_distributions(create_event, None)
+        body = json.loads(response["body"])
+
+        assert response["statusCode"] == 400
+        assert body["errors"] == [
+            "1.distribution_type: 'foo' is not one of ['file', 'api']"
+        ]
+
+    def test_create_distributions_empty(self, metadata_table, auth_event, put_edition):
+        dataset_id, version, edition = put_edition
+        create_event = auth_event(
+            [], dataset=dataset_id, version=version, edition=edition
+        )
+
+        response = create_distributions(create_event, None)
+
+        assert response["statusCode"] == 400
+
+    def test_create_distributions_content_error(
+        self, metadata_table, auth_event, put_edition
+    ):
+        dataset_id, version, edition = put_edition
+        bad_content = common_test_helper.raw_api_distribution.copy()
+        del bad_content["api_url"]
+        create_event = auth_event(
+            [common_test_helper.raw_file_distribution, bad_content],
+            dataset=dataset_id,
+            version=version,
+            edition=edition,
+        )
+
+        response = create_distributions(create_event, None)
+        body = json.loads(response["body"])
+
+        assert response["statusCode"] == 400
+        assert body[0]["message"] == (
+            "1: Missing 'api_url', required when 'distribution_type' is 'api'."
+        )
+
+        db_response = metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Distribution"),
+        )
+        assert db_response["Count"] == 0
+
+    def test_create_distributions_non_existing_edition(
+        self, metadata_table, auth_event, put_edition
+    ):
+        dataset_id, version, _ = put_edition
+        create_event = auth_event(
+            [common_test_helper.raw_file_distribution],
+            dataset=dataset_id,
+            version=version,
+            edition="20000101T000000",
+        )
+
+        response = create_distributions(create_event, None)
+
+        assert response["statusCode"] == 404
+        assert json.loads(response["body"]) == [
+            {"message": "Edition 20000101T000000 does not exist"}
+        ]
+
+        db_response = metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Distribution"),
+        )
+        assert db_response["Count"] == 0
+
+    def test_forbidden(self, metadata_table, event, put_edition):
+        dataset_id, version, edition = put_edition
+        create_event = event(
+            [common_test_helper.raw_file_distribution],
+            dataset=dataset_id,
+            version=version,
+            edition=edition,
+        )
+
+        response = create_distributions(create_event, None)
+
+        assert response["statusCode"] == 403
+
+
 class TestUpdateDistribution:
     def test_update_distribution(self, metadata_table, auth_event, put_edition):
         dataset_id, version, edition = put_edition
@@ -578,3 +715,75 @@ class TestDeleteData:
 
         objs = s3_client.list_objects_v2(Bucket=s3_bucket, Prefix=key)
         assert objs["KeyCount"] == 0
+
+    def test_delete_data_every_stage_and_filename(
+        self, s3_client, s3_bucket, metadata_table
+    ):
+        metadata_table.put_item(
+            Item={"Id": "foo", "Type": "Dataset", "accessRights": "public"}
+        )
+        metadata_table.put_item(
+            Item={
+                "Id": "foo/1/latest/bar",
+                "Type": "Distribution",
+                "filenames": ["a.csv", "b.csv"],
+            }
+        )
+        keys = [
+            f"{stage}/green/foo/version=1/edition=latest/{filename}"
+            for stage in ["raw", "intermediate", "processed"]
+            for filename in ["a.csv", "b.csv"]
+        ]
+        untouched_key = "raw/green/foo/version=1/edition=latest/c.csv"
+        for key in [*keys, untouched_key]:
+            s3_client.put_object(Bucket=s3_bucket, Key=key, Body="baz")
+
+        report = DistributionRepository()._delete_data("foo", "1", "latest", "bar")
+
+        assert sorted(report["deleted"]) == sorted(keys)
+        assert report["errors"] == []
+
+        objs = s3_client.list_objects_v2(Bucket=s3_bucket)
+        assert [o["Key"] for o in objs["Contents"]] == [untouched_key]
+
+    def test_delete_data_paginated(self, s3_client, s3_bucket, metadata_table):
+        metadata_table.put_item(
+            Item={"Id": "foo", "Type": "Dataset", "accessRights": "non-public"}
+        )
+        metadata_table.put_item(
+            Item={
+                "Id": "foo/1/latest/bar",
+                "Type": "Distribution",
+                "filenames": ["part"],
+            }
+        )
+        prefix = "raw/red/foo/version=1/edition=latest/part"
+        for i in range(1005):
+            s3_client.put_object(Bucket=s3_bucket, Key=f"{prefix}-{i:04}", Body="")
+
+        with (
+            patch("metadata.distribution.repository.S3_DELETE_BATCH_SIZE", 400),
+            patch.object(
+                s3_client, "delete_objects", wraps=s3_client.delete_objects
+            ) as delete_objects,
+            patch(
+                "metadata.distribution.repository.boto3.client", return_value=s3_client
+            ),
+        ):
+            report = DistributionRepository()._delete_data("foo", "1", "latest", "bar")
+
+        assert len(report["deleted"]) == 1005
+        assert delete_objects.call_count == 3
+
+        objs = s3_client.list_objects_v2(Bucket=s3_bucket, Prefix=prefix)
+        assert objs["KeyCount"] == 0
+
+    def test_delete_data_no_filenames(self, s3_client, s3_bucket, metadata_table):
+        metadata_table.put_item(
+            Item={"Id": "foo", "Type": "Dataset", "accessRights": "public"}
+        )
+        metadata_table.put_item(Item={"Id": "foo/1/latest/bar", "Type": "Distribution"})
+
+        report = DistributionRepository()._delete_data("foo", "1", "latest", "bar")
+
+        assert report == {"deleted": [], "errors": []}
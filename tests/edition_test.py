@@ -8,8 +8,11 @@ from metadata.edition.handler import (
     create_edition,
     delete_edition,
     get_edition,
+    get_editions,
+    publish_edition,
     update_edition,
 )
+from metadata.edition.repository import EditionRepository, edition_name
 from tests import common_test_helper
 
 
@@ -112,6 +115,160 @@ class TestCreateEdition:
         ]
 
 
+class TestPublishEdition:
+    def test_publish_edition(self, metadata_table, auth_event, put_version):
+        dataset_id, version = put_version
+        publish_event = auth_event(
+            {
+                "edition": common_test_helper.raw_edition,
+                "distributions": [
+                    common_test_helper.raw_file_distribution,
+                    common_test_helper.raw_api_distribution,
+                ],
+            },
+            dataset=dataset_id,
+            version=version,
+        )
+
+        response = publish_edition(publish_event, None)
+        body = json.loads(response["body"])
+        edition_id = f"{dataset_id}/6/20190528T133700"
+
+        assert response["statusCode"] == 201
+        assert (
+            response["headers"]["Location"]
+            == f"/datasets/{dataset_id}/versions/6/editions/20190528T133700"
+        )
+        assert body["Id"] == edition_id
+        assert body["description"] == "Data for one hour"
+
+        distributions = body["_embedded"]["distributions"]
+        assert [d["distribution_type"] for d in distributions] == ["file", "api"]
+        for distribution in distributions:
+            assert distribution["Id"].startswith(f"{edition_id}/")
+            assert "self" in distribution["_links"]
+
+        latest = metadata_table.query(
+            KeyConditionExpression=Key(ID_COLUMN).eq(f"{dataset_id}/6/latest")
+        )["Items"][0]
+        assert latest["latest"] == edition_id
+
+        db_response = metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Distribution")
+            & Key(ID_COLUMN).begins_with(f"{edition_id}/"),
+        )
+        assert db_response["Count"] == 2
+
+    def test_publish_edition_many_distributions(
+        self, metadata_table, auth_event, put_version, mocker
+    ):
+        dataset_id, version = put_version
+        mocker.patch("metadata.edition.repository.MAX_TRANSACTION_SIZE", 4)
+        transact = mocker.spy(EditionRepository, "_transact_write_items")
+
+        edition, distributions = EditionRepository().publish_edition(
+            dataset_id,
+            version,
+            common_test_helper.raw_edition.copy(),
+            [
+                {"distribution_type": "file", "filenames": [f"{i}.csv"]}
+                for i in range(7)
+            ],
+        )
+
+        # 1 parent check + 1 edition + 7 distributions + 1 latest pointer
+        assert transact.call_count == 3
+        assert "latest" in transact.call_args.args[1][-1]["Put"]["Item"]
+        assert len(distributions) == 7
+
+        db_response = metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Distribution")
+            & Key(ID_COLUMN).begins_with(f"{edition['Id']}/"),
+        )
+        assert db_response["Count"] == 7
+
+    def test_publish_duplicate_edition(self, metadata_table, auth_event, put_edition):
+        dataset_id, version, _ = put_edition
+        publish_event = auth_event(
+            {
+                "edition": common_test_helper.raw_edition,
+                "distributions": [common_test_helper.raw_file_distribution],
+            },
+            dataset=dataset_id,
+            version=version,
+        )
+
+        response = publish_edition(publish_event, None)
+
+        assert response["statusCode"] == 409
+        db_response = metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Distribution"),
+        )
+        assert db_response["Count"] == 0
+
+    def test_publish_edition_version_not_exist(
+        self, metadata_table, auth_event, put_version
+    ):
+        dataset_id, _ = put_version
+        publish_event = auth_event(
+            {
+                "edition": common_test_helper.raw_edition,
+                "distributions": [common_test_helper.raw_file_distribution],
+            },
+            dataset=dataset_id,
+            version="10",
+        )
+
+        response = publish_edition(publish_event, None)
+
+        assert response["statusCode"] == 404
+        assert json.loads(response["body"]) == [
+            {
+                "message": f"'Parent item with id {dataset_id}/10 does not exist'",
+            }
+        ]
+
+    def test_publish_edition_invalid_distribution(
+        self, metadata_table, auth_event, put_version
+    ):
+        dataset_id, version = put_version
+        publish_event = auth_event(
+            {
+                "edition": common_test_helper.raw_edition,
+                "distributions": [{"distribution_type": "file"}],
+            },
+            dataset=dataset_id,
+            version=version,
+        )
+
+        response = publish_edition(publish_event, None)
+
+        assert response["statusCode"] == 400
+        assert json.loads(response["body"]) == [
+            {
+                "message": "0: Missing 'filenames', required when 'distribution_type' is 'file'."
+            }
+        ]
+
+    def test_forbidden(self, metadata_table, event, put_version):
+        dataset_id, version = put_version
+        publish_event = event(
+            {
+                "edition": common_test_helper.raw_edition,
+                "distributions": [common_test_helper.raw_file_distribution],
+            },
+            dataset=dataset_id,
+            version=version,
+        )
+
+        response = publish_edition(publish_event, None)
+
+        assert response["statusCode"] == 403
+
+
 class TestUpdateEdition:
     def test_update_edition(self, metadata_table, auth_event, put_version):
         dataset_id, version = put_version
@@ -225,6 +382,102 @@ class TestUpdateEdition:
         ]
 
 
+class TestGetEditions:
+    @pytest.fixture
+    def editions(self, metadata_table):
+        edition_names = [f"202001{day:02}T120000" for day in range(1, 11)]
+        for name in edition_names:
+            metadata_table.put_item(Item={"Id": f"foo/1/{name}", "Type": "Edition"})
+        metadata_table.put_item(
+            Item={
+                "Id": "foo/1/latest",
+                "Type": "Edition",
+                "latest": f"foo/1/{edition_names[-1]}",
+            }
+        )
+        # Editions of another version shouldn't be included
+        metadata_table.put_item(Item={"Id": "foo/2/20200105T120000", "Type": "Edition"})
+        return edition_names
+
+    @staticmethod
+    def _edition_names(response):
+        assert response["statusCode"] == 200
+        return [e["Id"].split("/")[-1] for e in json.loads(response["body"])]
+
+    def test_get_editions(self, event, editions):
+        response = get_editions(event(dataset="foo", version="1"), None)
+        assert self._edition_names(response) == editions
+
+    def test_get_editions_range(self, event, editions):
+        response = get_editions(
+            event(
+                dataset="foo",
+                version="1",
+                query_params={
+                    "since": "2020-01-03T12:00:00+00:00",
+                    "until": "2020-01-05T13:00:00+01:00",
+                },
+            ),
+            None,
+        )
+        assert self._edition_names(response) == editions[2:5]
+
+    def test_get_editions_since(self, event, editions):
+        response = get_editions(
+            event(dataset="foo", version="1", query_params={"since": "2020-01-09"}),
+            None,
+        )
+        assert self._edition_names(response) == editions[8:]
+
+    def test_get_editions_newest(self, event, editions):
+        response = get_editions(
+            event(
+                dataset="foo",
+                version="1",
+                query_params={"order": "desc", "limit": "3"},
+            ),
+            None,
+        )
+        assert self._edition_names(response) == editions[::-1][:3]
+
+    def test_get_editions_limit(self, event, editions):
+        response = get_editions(
+            event(dataset="foo", version="1", query_params={"limit": "20"}),
+            None,
+        )
+        assert self._edition_names(response) == editions
+
+    @pytest.mark.parametrize(
+        "query_params",
+        [
+            {"since": "yesterday"},
+            {"limit": "0"},
+            {"limit": "-1"},
+            {"limit": "ten"},
+            {"limit": "²"},
+            {"order": "random"},
+        ],
+    )
+    def test_get_editions_bad_params(self, event, editions, query_params):
+        response = get_editions(
+            event(dataset="foo", version="1", query_params=query_params), None
+        )
+        assert response["statusCode"] == 400
+
+
+@pytest.mark.parametrize(
+    "timestamp,name",
+    [
+        ("2019-05-28T15:37:00+02:00", "20190528T133700"),
+        ("2019-05-28T13:37:00", "20190528T133700"),
+        ("2019-05-28", "20190528T000000"),
+        ("20190528T133700", "20190528T133700"),
+    ],
+)
+def test_edition_name(timestamp, name):
+    assert edition_name(timestamp) == name
+
+
 class TestEdition:
     def test_edition_not_found(self, event):
         event_for_get = event({}, "1234", "1", "20190401T133700")
@@ -0,0 +1,82 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from metadata.dataset import handler as dataset_handler
+from metadata.instrumentation import (
+    MAX_LOGGED_CALLS,
+    DynamoDBCalls,
+    dynamodb_calls,
+    record_dynamodb_call,
+)
+from tests import common_test_helper
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return common_test_helper.create_metadata_table(dynamodb)
+
+
+@pytest.fixture
+def log_add(mocker):
+    return mocker.patch("metadata.instrumentation.log_add")
+
+
+def test_handler_logs_every_call(event, put_dataset, log_add):
+    dataset_handler.get_dataset(
+        event(dataset=put_dataset, query_params={"embed": "versions"}), None
+    )
+
+    log_add.assert_called_once()
+    logged = log_add.call_args.kwargs
+    assert logged["dynamodb_call_count"] == 2
+    assert logged["dynamodb_operations"] == {"get_item": 1, "query:IdByTypeIndex": 1}
+    assert [c["operation"] for c in logged["dynamodb_calls"]] == [
+        "get_item",
+        "query:IdByTypeIndex",
+    ]
+    assert [c["items"] for c in logged["dynamodb_calls"]] == [1, 2]
+    assert logged["dynamodb_read_capacity_units"] > 0
+    assert logged["dynamodb_write_capacity_units"] == 0
+
+
+def test_calls_are_reset_per_request(event, put_dataset, log_add):
+    dataset_handler.get_dataset(event(dataset=put_dataset), None)
+    dataset_handler.get_dataset(event(dataset=put_dataset), None)
+
+    assert [c.kwargs["dynamodb_call_count"] for c in log_add.call_args_list] == [1, 1]
+
+
+def test_write_capacity(auth_event, put_dataset, log_add):
+    dataset_handler.patch_dataset(
+        auth_event({"title": "Patched"}, dataset=put_dataset), None
+    )
+
+    logged = log_add.call_args.kwargs
+    assert logged["dynamodb_operations"]["put_item"] == 1
+    assert logged["dynamodb_write_capacity_units"] > 0
+
+
+def test_failed_calls_are_recorded():
+    dynamodb_calls.reset()
+
+    def fail():
+        raise ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem"
+        )
+
+    with pytest.raises(ClientError):
+        record_dynamodb_call(fail, "put_item")
+
+    assert dynamodb_calls.count == 1
+    assert dynamodb_calls.operations == {"put_item": 1}
+
+
+def test_logged_calls_are_limited():
+    calls = DynamoDBCalls()
+
+    for _ in range(MAX_LOGGED_CALLS + 10):
+        calls.record("query", "IdByTypeIndex", 1, 1.0, 0.5)
+
+    assert len(calls.calls) == MAX_LOGGED_CALLS
+    assert calls.count == MAX_LOGGED_CALLS + 10
+    assert calls.read_capacity_units == (MAX_LOGGED_CALLS + 10) * 0.5
@@ -0,0 +1,164 @@
+import pytest
+
+from metadata.dataset.repository import DatasetRepository
+from metadata.instrumentation import dynamodb_calls
+from metadata.item_cache import ItemCache, item_cache, written_keys
+from tests import common_test_helper
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return common_test_helper.create_metadata_table(dynamodb)
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    monkeypatch.setenv("ITEM_CACHE_MAX_SIZE", "100")
+    item_cache.cache_clear()
+    yield item_cache()
+    item_cache.cache_clear()
+
+
+def _get_item_calls():
+    return dynamodb_calls.operations.get("get_item", 0)
+
+
+def test_lru_eviction():
+    cache = ItemCache(max_size=2, ttl=60)
+    cache.put("a", {"Id": "a"})
+    cache.put("b", {"Id": "b"})
+    cache.get("a")
+    cache.put("c", {"Id": "c"})
+
+    assert len(cache) == 2
+    assert cache.get("a") == {"Id": "a"}
+    assert cache.get("b") is None
+    assert cache.get("c") == {"Id": "c"}
+
+
+def test_ttl_expiry(mocker):
+    monotonic = mocker.patch("metadata.item_cache.time.monotonic", return_value=100)
+    cache = ItemCache(max_size=10, ttl=30)
+    cache.put("a", {"Id": "a"})
+
+    monotonic.return_value = 130
+    assert cache.get("a") == {"Id": "a"}
+
+    monotonic.return_value = 131
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_items_are_copied():
+    cache = ItemCache(max_size=10, ttl=60)
+    item = {"Id": "a", "keywords": ["x"]}
+    cache.put("a", item)
+    item["keywords"].append("y")
+    cache.get("a")["keywords"].append("z")
+
+    assert cache.get("a") == {"Id": "a", "keywords": ["x"]}
+
+
+def test_written_keys():
+    assert list(written_keys("get_item", {"Key": {"Id": "a", "Type": "T"}})) == []
+    assert list(written_keys("put_item", {"Item": {"Id": "a", "Type": "T"}})) == [
+        ("a", "T")
+    ]
+    assert list(
+        written_keys(
+            "transact_write_items",
+            {
+                "TransactItems": [
+                    {"Put": {"Item": {"Id": "a", "Type": "T"}}},
+                    {"Update": {"Key": {"Id": "b", "Type": "T"}}},
+                    {"Delete": {"Key": {"Id": "c", "Type": "T"}}},
+                    {"ConditionCheck": {"Key": {"Id": "d", "Type": "T"}}},
+                ]
+            },
+        )
+    ) == [("a", "T"), ("b", "T"), ("c", "T")]
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("ITEM_CACHE_MAX_SIZE", raising=False)
+    item_cache.cache_clear()
+
+    assert item_cache() is None
+
+
+def test_default_ttl(enabled_cache):
+    assert enabled_cache.ttl == 5
+
+
+def test_repeated_reads_hit_cache(put_dataset, enabled_cache):
+    repository = DatasetRepository()
+    dynamodb_calls.reset()
+
+    first = repository.get_dataset(put_dataset)
+    second = repository.get_dataset(put_dataset)
+
+    assert first == second
+    assert _get_item_calls() == 1
+    assert enabled_cache.hits == 1
+
+
+def test_consistent_read_bypasses_cache(put_dataset, enabled_cache):
+    repository = DatasetRepository()
+    repository.get_dataset(put_dataset)
+    dynamodb_calls.reset()
+
+    repository.get_dataset(put_dataset, consistent_read=True)
+
+    assert _get_item_calls() == 1
+
+
+def test_missing_items_are_not_cached(enabled_cache):
+    repository = DatasetRepository()
+
+    assert repository.get_dataset("missing") is None
+    assert len(enabled_cache) == 0
+
+
+def test_writes_invalidate(put_dataset, enabled_cache):
+    repository = DatasetRepository()
+    repository.get_dataset(put_dataset)
+
+    repository.patch_dataset(put_dataset, {"title": "Patched"})
+    dynamodb_calls.reset()
+
+    assert repository.get_dataset(put_dataset)["title"] == "Patched"
+    assert _get_item_calls() == 1
+
+
+def test_update_is_based_on_current_item(metadata_table, put_dataset, enabled_cache):
+    repository = DatasetRepository()
+    repository.get_dataset(put_dataset)
+    metadata_table.update_item(
+        Key={"Id": put_dataset, "Type": "Dataset"},
+        UpdateExpression="SET last_read = :t",
+        ExpressionAttributeValues={":t": "2020-01-01T00:00:00+00:00"},
+    )
+
+    repository.patch_dataset(put_dataset, {"title": "Patched"})
+
+    item = metadata_table.get_item(Key={"Id": put_dataset, "Type": "Dataset"})["Item"]
+    assert item["title"] == "Patched"
+    assert item["last_read"] == "2020-01-01T00:00:00+00:00"
+
+
+@pytest.mark.parametrize("cache_enabled", [False, True])
+def test_update_reads_eventually_consistent(
+    put_dataset, monkeypatch, mocker, cache_enabled
+):
+    if cache_enabled:
+        monkeypatch.setenv("ITEM_CACHE_MAX_SIZE", "100")
+    item_cache.cache_clear()
+    repository = DatasetRepository()
+    call_table = mocker.spy(repository, "_call_table")
+
+    repository.patch_dataset(put_dataset, {"title": "Patched"})
+
+    get_items = [c for c in call_table.call_args_list if c.args == ("get_item",)]
+    assert [c.kwargs["ConsistentRead"] for c in get_items] == [False]
+    item_cache.cache_clear()
@@ -0,0 +1,8 @@
+import pytest
+
+from tests.common_test_helper import create_metadata_table
+
+
+@pytest.fixture
+def metadata_table(dynamodb):
+    return create_metadata_table(dynamodb)
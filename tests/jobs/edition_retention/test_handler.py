@@ -0,0 +1,147 @@
+from boto3.dynamodb.conditions import Key
+from freezegun import freeze_time
+
+from jobs.edition_retention.handler import handler
+
+
+def _put_dataset(metadata_table, dataset_id, editions, latest, **kwargs):
+    metadata_table.put_item(
+        Item={
+            "Id": dataset_id,
+            "Type": "Dataset",
+            "accessRights": "public",
+            **kwargs,
+        }
+    )
+    metadata_table.put_item(Item={"Id": f"{dataset_id}/1", "Type": "Version"})
+    for edition in editions:
+        edition_id = f"{dataset_id}/1/{edition}"
+        metadata_table.put_item(Item={"Id": edition_id, "Type": "Edition"})
+        metadata_table.put_item(
+            Item={
+                "Id": f"{edition_id}/dist",
+                "Type": "Distribution",
+                "filenames": ["data.csv"],
+            }
+        )
+    metadata_table.put_item(
+        Item={
+            "Id": f"{dataset_id}/1/latest",
+            "Type": "Edition",
+            "latest": f"{dataset_id}/1/{latest}",
+        }
+    )
+
+
+def _edition_names(metadata_table, dataset_id):
+    return [
+        item["Id"].split("/")[-1]
+        for item in metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Edition")
+            & Key("Id").begins_with(f"{dataset_id}/1/"),
+        )["Items"]
+    ]
+
+
+def _distribution_ids(metadata_table):
+    return [
+        item["Id"]
+        for item in metadata_table.query(
+            IndexName="IdByTypeIndex",
+            KeyConditionExpression=Key("Type").eq("Distribution"),
+        )["Items"]
+    ]
+
+
+editions = [f"202001{day:02}T120000" for day in range(1, 6)]
+
+
+@freeze_time("2020-01-10T12:00:00+00:00")
+def test_handler(metadata_table, s3_client, s3_bucket, mocker):
+    mocker.patch("jobs.edition_retention.handler.BATCH_SIZE", 2)
+    sleep = mocker.patch("jobs.edition_retention.handler.time.sleep")
+
+    _put_dataset(
+        metadata_table,
+        "hourly",
+        editions,
+        # "latest" pointing to an old edition should keep it around
+        latest=editions[0],
+        retention={"keep_last": 2},
+    )
+    _put_dataset(metadata_table, "forever", editions, latest=editions[-1])
+    s3_client.put_object(
+        Bucket=s3_bucket,
+        Key=f"raw/green/hourly/version=1/edition={editions[1]}/data.csv",
+        Body="",
+    )
+
+    handler({}, {})
+
+    assert _edition_names(metadata_table, "hourly") == [
+        editions[0],
+        *editions[3:],
+        "latest",
+    ]
+    assert _edition_names(metadata_table, "forever") == [*editions, "latest"]
+    assert sorted(_distribution_ids(metadata_table)) == sorted(
+        [
+            f"hourly/1/{editions[0]}/dist",
+            *[f"hourly/1/{e}/dist" for e in editions[3:]],
+            *[f"forever/1/{e}/dist" for e in editions],
+        ]
+    )
+    assert s3_client.list_objects_v2(Bucket=s3_bucket)["KeyCount"] == 0
+    assert sleep.call_count == 0
+
+
+@freeze_time("2020-01-10T12:00:00+00:00")
+def test_handler_rate_limited(metadata_table, s3_client, s3_bucket, mocker):
+    mocker.patch("jobs.edition_retention.handler.BATCH_SIZE", 2)
+    mocker.patch("jobs.edition_retention.handler.MAX_DELETIONS_PER_RUN", 3)
+    sleep = mocker.patch("jobs.edition_retention.handler.time.sleep")
+
+    _put_dataset(
+        metadata_table,
+        "hourly",
+        editions,
+        latest=editions[-1],
+        retention={"keep_days": 1},
+    )
+
+    handler({}, {})
+
+    assert _edition_names(metadata_table, "hourly") == [*editions[3:], "latest"]
+    assert sleep.call_count == 1
+
+
+@freeze_time("2020-01-10T12:00:00+00:00")
+def test_handler_dry_run(metadata_table, s3_client, s3_bucket):
+    _put_dataset(
+        metadata_table,
+        "hourly",
+        editions,
+        latest=editions[-1],
+        retention={"keep_last": 1},
+    )
+
+    handler({"dry_run": True}, {})
+
+    assert _edition_names(metadata_table, "hourly") == [*editions, "latest"]
+
+
+@freeze_time("2020-01-10T12:00:00+00:00")
+def test_handler_maintenance(metadata_table, s3_client, s3_bucket):
+    _put_dataset(
+        metadata_table,
+        "hourly",
+        editions,
+        latest=editions[-1],
+        retention={"keep_last": 1},
+        state="maintenance",
+    )
+
+    handler({}, {})
+
+    assert _edition_names(metadata_table, "hourly") == [*editions, "latest"]
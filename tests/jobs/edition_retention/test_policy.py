@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from jobs.edition_retention.policy import RetentionPolicy
+
+now = datetime(2020, 1, 10, 12, tzinfo=timezone.utc)
+edition_ids = [f"foo/1/202001{day:02}T120000" for day in range(1, 11)]
+
+
+def test_from_dataset():
+    assert RetentionPolicy.from_dataset({"Id": "foo"}) is None
+    assert RetentionPolicy.from_dataset(
+        {"retention": {"keep_last": 3}}
+    ) == RetentionPolicy(keep_last=3)
+    assert RetentionPolicy.from_dataset(
+        {"retention": {"keep_days": 2, "keep_last": 3}}
+    ) == RetentionPolicy(keep_last=3, keep_days=2)
+
+
+@pytest.mark.parametrize(
+    "policy,expired",
+    [
+        (RetentionPolicy(), []),
+        (RetentionPolicy(keep_last=3), edition_ids[:7]),
+        (RetentionPolicy(keep_last=20), []),
+        (RetentionPolicy(keep_days=2), edition_ids[:7]),
+        (RetentionPolicy(keep_days=20), []),
+        # An edition is kept when it satisfies either rule
+        (RetentionPolicy(keep_last=5, keep_days=2), edition_ids[:5]),
+        (RetentionPolicy(keep_last=1, keep_days=4), edition_ids[:5]),
+    ],
+)
+def test_expired(policy, expired):
+    assert policy.expired(edition_ids, now) == expired
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [RetentionPolicy(keep_last=1), RetentionPolicy(keep_days=2)],
+)
+def test_untimed_editions_are_kept(policy):
+    untimed = ["foo/1/initial", "foo/1/20200132T120000"]
+
+    assert policy.expired(untimed + edition_ids, now) == policy.expired(
+        edition_ids, now
+    )
@@ -0,0 +1,119 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from jobs.metadata_stream import subscribers
+from jobs.metadata_stream.change import Change
+from jobs.metadata_stream.handler import handler
+from jobs.metadata_stream.replay import (
+    diff_records,
+    replay,
+    stream_event,
+    stream_record,
+)
+from metadata.dataset.snapshot import ListingSnapshotRepository
+from tests.common_test_helper import create_metadata_table
+
+DATASET = {"Id": "my-dataset", "Type": "Dataset", "title": "Mine", "n": Decimal(1)}
+VERSION = {"Id": "my-dataset/1", "Type": "Version", "version": "1"}
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return create_metadata_table(dynamodb)
+
+
+@pytest.fixture
+def log_add(mocker):
+    return mocker.patch("jobs.metadata_stream.subscribers.log_add")
+
+
+@pytest.fixture
+def received(monkeypatch):
+    received = []
+    monkeypatch.setitem(subscribers._subscribers, "test", received.extend)
+    return received
+
+
+def test_change_from_stream_record():
+    new_dataset = {**DATASET, "title": "Changed"}
+    change = Change.from_stream_record(stream_record(DATASET, new_dataset))
+
+    assert change.event_name == "MODIFY"
+    assert (change.item_id, change.item_type) == ("my-dataset", "Dataset")
+    assert change.old_image == DATASET
+    assert change.new_image == new_dataset
+    assert change.dataset_id == "my-dataset"
+
+
+def test_event_names():
+    assert stream_record(new_image=VERSION)["eventName"] == "INSERT"
+    assert stream_record(old_image=VERSION)["eventName"] == "REMOVE"
+    assert Change.from_stream_record(stream_record(VERSION)).new_image is None
+
+
+def test_diff_records():
+    new_dataset = {**DATASET, "title": "Changed"}
+    records = diff_records([DATASET, VERSION], [new_dataset])
+
+    assert [(r["eventName"], r["dynamodb"]["Keys"]["Id"]["S"]) for r in records] == [
+        ("MODIFY", "my-dataset"),
+        ("REMOVE", "my-dataset/1"),
+    ]
+    assert diff_records([DATASET], [DATASET]) == []
+
+
+def test_handler_calls_subscribers(received, log_add):
+    handler(stream_event([stream_record(new_image=DATASET)]), None)
+
+    assert [(c.event_name, c.item_id) for c in received] == [("INSERT", "my-dataset")]
+    log_add.assert_called_once_with(stream_changes={"Dataset:INSERT": 1})
+
+
+def test_enabled_subscribers(monkeypatch, received):
+    monkeypatch.setenv("METADATA_STREAM_SUBSCRIBERS", "test, counters")
+    assert [name for name, _ in subscribers.enabled_subscribers()] == [
+        "counters",
+        "test",
+    ]
+
+    monkeypatch.setenv("METADATA_STREAM_SUBSCRIBERS", "test,nope")
+    with pytest.raises(ValueError):
+        subscribers.enabled_subscribers()
+
+
+def test_failing_subscriber_fails_batch(monkeypatch):
+    def fail(changes):
+        raise RuntimeError("Oops")
+
+    monkeypatch.setitem(subscribers._subscribers, "fail", fail)
+
+    with pytest.raises(RuntimeError):
+        handler(stream_event([stream_record(new_image=DATASET)]), None)
+
+
+def test_replay_batches(received):
+    replay([{"NewImage": DATASET}, {"OldImage": VERSION}, {"NewImage": VERSION}], 2)
+
+    assert [(c.event_name, c.item_id) for c in received] == [
+        ("INSERT", "my-dataset"),
+        ("REMOVE", "my-dataset/1"),
+        ("INSERT", "my-dataset/1"),
+    ]
+
+
+def test_listing_snapshot(metadata_table):
+    metadata_table.put_item(Item=DATASET)
+    replay([{"NewImage": DATASET}])
+    repository = ListingSnapshotRepository()
+
+    assert [d["Id"] for d in json.loads(repository.get_body())] == ["my-dataset"]
+
+    replay([{"NewImage": {**DATASET, "Id": "other"}}, {"OldImage": DATASET}])
+
+    assert [d["Id"] for d in json.loads(repository.get_body())] == ["other"]
+
+    replay([{"NewImage": VERSION}])
+
+    assert [d["Id"] for d in json.loads(repository.get_body())] == ["other"]
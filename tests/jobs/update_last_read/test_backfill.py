@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from boto3.dynamodb.conditions import Key
+
+from jobs.update_last_read.backfill import _hour_prefixes, _parse_hour, backfill
+from metadata.CommonRepository import ID_COLUMN
+
+
+@pytest.fixture
+def log_data():
+    with open("tests/jobs/update_last_read/data/s3_access_log.txt", "rb") as f:
+        return f.read()
+
+
+def _put_log(s3_client, bucket, hour, log_data, read_time):
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=f"logs/s3/test-data-bucket/{hour}-00-00-E3257304837D19F5",
+        Body=log_data.replace(b"17/Feb/2020:06:31:44", read_time),
+    )
+
+
+def test_hour_prefixes():
+    start = datetime(2020, 1, 1, 22, 30, tzinfo=timezone.utc)
+    end = datetime(2020, 1, 2, 1, tzinfo=timezone.utc)
+
+    assert list(_hour_prefixes("bucket", start, end)) == [
+        "logs/s3/bucket/2020-01-01-22",
+        "logs/s3/bucket/2020-01-01-23",
+        "logs/s3/bucket/2020-01-02-00",
+    ]
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("2020-01-01T00", datetime(2020, 1, 1, 0, tzinfo=timezone.utc)),
+        ("2020-01-01T00+01:00", datetime(2019, 12, 31, 23, tzinfo=timezone.utc)),
+        ("2020-01-01T00:30-05:30", datetime(2020, 1, 1, 6, tzinfo=timezone.utc)),
+    ],
+)
+def test_parse_hour(value, expected):
+    dt = _parse_hour(value)
+
+    assert dt == expected
+    assert dt.utcoffset() == timedelta(0)
+
+
+def test_hour_prefixes_with_offset():
+    start = _parse_hour("2020-01-01T00+01:00")
+    end = _parse_hour("2020-01-01T02+01:00")
+
+    assert list(_hour_prefixes("bucket", start, end)) == [
+        "logs/s3/bucket/2019-12-31-23",
+        "logs/s3/bucket/2020-01-01-00",
+    ]
+
+
+def test_backfill(s3_client, s3_logs_bucket, metadata_table, log_data, mocker):
+    # Moto's mocks don't carry over to other processes, so use threads instead.
+    mocker.patch(
+        "jobs.update_last_read.backfill.ProcessPoolExecutor", ThreadPoolExecutor
+    )
+    mocker.patch("jobs.update_last_read.backfill.CHUNK_SIZE", 2)
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-00", log_data, b"01/Jan/2020:00:10:00"
+    )
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-05", log_data, b"01/Jan/2020:05:10:00"
+    )
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-06", log_data, b"01/Jan/2020:06:10:00"
+    )
+    # Outside of the backfilled range
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-07", log_data, b"01/Jan/2020:07:10:00"
+    )
+
+    datasets_read = backfill(
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        datetime(2020, 1, 1, 7, tzinfo=timezone.utc),
+    )
+
+    assert datasets_read == {"renovasjonsbiler-status": "20200101061000"}
+
+    res = metadata_table.query(
+        KeyConditionExpression=Key(ID_COLUMN).eq("renovasjonsbiler-status")
+    )
+    assert res["Items"][0]["last_read"] == "2020-01-01T06:10:00+00:00"
+
+
+def test_backfill_never_moves_backwards(
+    s3_client, s3_logs_bucket, metadata_table, log_data, mocker
+):
+    mocker.patch(
+        "jobs.update_last_read.backfill.ProcessPoolExecutor", ThreadPoolExecutor
+    )
+    metadata_table.put_item(
+        Item={
+            "Id": "renovasjonsbiler-status",
+            "Type": "Dataset",
+            "last_read": "2020-02-01T00:00:00+00:00",
+        }
+    )
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-00", log_data, b"01/Jan/2020:00:10:00"
+    )
+
+    backfill(
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        datetime(2020, 1, 2, tzinfo=timezone.utc),
+    )
+
+    res = metadata_table.query(
+        KeyConditionExpression=Key(ID_COLUMN).eq("renovasjonsbiler-status")
+    )
+    assert res["Items"][0]["last_read"] == "2020-02-01T00:00:00+00:00"
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from freezegun import freeze_time
+
+from jobs.update_last_read.checkpoint import CheckpointRepository
+
+HOUR = "2020-01-01-00"
+
+
+def _objects(n, prefix="logs/s3/test-data-bucket/"):
+    """Return `n` log objects under `prefix`, mapped to their ETags."""
+    return {
+        f"{prefix}2020-01-01-00-{i // 60 % 60:02}-{i % 60:02}-{i:016X}": (f'"{i:032x}"')
+        for i in range(n)
+    }
+
+
+def test_save_progress(metadata_table, mocker):
+    checkpoints = CheckpointRepository()
+    call_table = mocker.spy(checkpoints, "_call_table")
+    first, second = _objects(2).items()
+
+    checkpoints.save_progress(HOUR, dict([first]))
+    checkpoints.save_progress(HOUR, dict([second]))
+
+    assert checkpoints.processed_objects(HOUR) == dict([first, second])
+    # Read from the table itself, not an eventually consistent index.
+    query = call_table.call_args
+    assert query.args == ("query",)
+    assert query.kwargs["ConsistentRead"] is True
+    assert "IndexName" not in query.kwargs
+    assert checkpoints.processed_objects("2020-01-01-01") == {}
+
+
+def test_large_hour(metadata_table):
+    # Together about 450 KB of keys and ETags, more than fits in a single item.
+    objects = _objects(1000, prefix=f"logs/s3/{'long-bucket-name' * 20}/")
+    checkpoints = CheckpointRepository()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        checkpoints.save_progress(HOUR, objects, executor)
+        assert checkpoints.processed_objects(HOUR) == objects
+
+        checkpoints.complete_hour(HOUR, objects, executor)
+
+    assert checkpoints.last_complete_hour() == HOUR
+    assert checkpoints.processed_objects(HOUR) == {}
+
+
+@freeze_time("2020-01-01T00:00:00Z")
+def test_checkpoints_expire(metadata_table):
+    CheckpointRepository().save_progress(HOUR, _objects(1))
+
+    (item,) = metadata_table.scan()["Items"]
+    assert item["Id"] == f"update-last-read/{HOUR}"
+    assert item["expires_at"] == 1577836800 + 7 * 24 * 3600
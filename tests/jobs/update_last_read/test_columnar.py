@@ -0,0 +1,38 @@
+import gzip
+import json
+
+from jobs.update_last_read.columnar import ColumnarLog, columnar_key
+
+
+def test_columnar_log():
+    with open("tests/jobs/update_last_read/data/s3_access_log.txt") as f:
+        lines = f.read().strip().split("\n")
+
+    columnar_log = ColumnarLog()
+    # Lines are passed through untouched
+    assert list(columnar_log.tee(iter(lines))) == lines
+    assert len(columnar_log) == len(lines)
+
+    columns = json.loads(gzip.decompress(columnar_log.dumps()))
+
+    assert columns["time"][0] == 1581921104
+    assert columns["operation"] == [
+        "REST.GET.OBJECT",
+        "REST.PUT.OBJECT",
+        "REST.PUT.OBJECT",
+        "REST.COPY.OBJECT_GET",
+    ]
+    assert columns["http_status"][0] == 206
+    assert columns["bytes_sent"][:2] == [103845, None]
+    assert all(len(values) == len(lines) for values in columns.values())
+
+
+def test_columnar_key():
+    assert (
+        columnar_key("parsed", "logs/s3/bucket/2020-01-01-00-10-20-ABCDEF")
+        == "parsed/2020-01-01-00/2020-01-01-00-10-20-ABCDEF.json.gz"
+    )
+    assert (
+        columnar_key("parsed", "logs/s3/bucket/2020-01-01-00-10-20-ABCDEF.gz")
+        == "parsed/2020-01-01-00/2020-01-01-00-10-20-ABCDEF.json.gz"
+    )
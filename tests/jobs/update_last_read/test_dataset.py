@@ -30,3 +30,18 @@ def test_from_s3_key_invalid_stage():
 def test_from_s3_key_non_parsing():
     key = "processed/green/levekar-trangbodde-historisk/15.json"
     assert not DatasetEntry.from_s3_key(key)
+
+
+def test_from_s3_key_cached():
+    key = "raw/green/befolkningsframskrivninger/version=1/edition=20200207T070503/data.txt"
+    invalid_key = "processed/green/levekar-trangbodde-historisk/15.json"
+    DatasetEntry.from_s3_key.cache_clear()
+
+    entry = DatasetEntry.from_s3_key(key)
+    assert DatasetEntry.from_s3_key(key) is entry
+    assert DatasetEntry.from_s3_key(invalid_key) is None
+    assert DatasetEntry.from_s3_key(invalid_key) is None
+
+    cache_info = DatasetEntry.from_s3_key.cache_info()
+    assert cache_info.hits == 2
+    assert cache_info.misses == 2
@@ -1,8 +1,46 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+import zstandard
 from boto3.dynamodb.conditions import Key
 from freezegun import freeze_time
 
-from jobs.update_last_read.handler import handler, _two_hours_ago
+from jobs.update_last_read.checkpoint import CheckpointRepository
+from jobs.update_last_read.handler import (
+    _chunks,
+    _compression,
+    _hours_to_process,
+    _is_dataset_read,
+    _latest_reads,
+    _merge_reads,
+    _two_hours_ago,
+    handler,
+)
+from jobs.update_last_read.statistics import ReadStatistics
 from metadata.CommonRepository import ID_COLUMN
+from metadata.statistics.repository import StatisticsRepository
+
+
+def _log_data():
+    with open("tests/jobs/update_last_read/data/s3_access_log.txt", "rb") as f:
+        return f.read()
+
+
+def _put_log(s3_client, bucket, key, read_time):
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=f"logs/s3/test-data-bucket/{key}",
+        Body=_log_data().replace(b"17/Feb/2020:06:31:44", read_time),
+    )
+    return s3_client.head_object(Bucket=bucket, Key=f"logs/s3/test-data-bucket/{key}")[
+        "ETag"
+    ]
+
+
+def _last_read(metadata_table, dataset_id):
+    res = metadata_table.query(KeyConditionExpression=Key(ID_COLUMN).eq(dataset_id))
+    return res["Items"][0].get("last_read")
 
 
 @freeze_time("2020-01-02-12")
@@ -33,3 +71,238 @@ def test_handler(s3_client, s3_logs_bucket, metadata_table):
         KeyConditionExpression=Key(ID_COLUMN).eq("pipeline-ng-test")
     )
     assert "last_read" not in res["Items"][0]
+
+    assert StatisticsRepository().get_read_statistics("renovasjonsbiler-status") == [
+        {
+            "hour": "2020-02-17T06:00:00+00:00",
+            "reads": 1,
+            "bytes_sent": 103845,
+            "errors": 0,
+            "requesters": 1,
+        }
+    ]
+
+
+@freeze_time("2020-01-01-02")
+def test_handler_object_per_line(s3_client, s3_logs_bucket, metadata_table):
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+
+    log_data = _log_data()
+
+    # Spread the log over several objects to exercise concurrent fetching.
+    for i, line in enumerate(log_data.splitlines(keepends=True)):
+        s3_client.put_object(
+            Bucket=s3_logs_bucket,
+            Key=f"logs/s3/test-data-bucket/2020-01-01-00-00-00-E3257304837D19F{i}",
+            Body=line,
+        )
+    # Logs outside the processed hour should be ignored.
+    s3_client.put_object(
+        Bucket=s3_logs_bucket,
+        Key="logs/s3/test-data-bucket/2020-01-01-01-00-00-E3257304837D19F5",
+        Body=log_data.replace(b"17/Feb/2020:06:31:44", b"18/Feb/2020:06:31:44"),
+    )
+
+    handler({}, {})
+
+    assert _last_read(metadata_table, "renovasjonsbiler-status") == (
+        "2020-02-17T06:31:44+00:00"
+    )
+
+
+@freeze_time("2020-01-01-02")
+def test_handler_checkpoints(s3_client, s3_logs_bucket, metadata_table):
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-00-00-00-A", b"01/Jan/2020:00:10:00"
+    )
+
+    handler({}, {})
+
+    checkpoints = CheckpointRepository()
+    assert checkpoints.last_complete_hour() == "2020-01-01-00"
+    assert checkpoints.processed_objects("2020-01-01-00") == {}
+
+
+@freeze_time("2020-01-01-02")
+def test_handler_catches_up(s3_client, s3_logs_bucket, metadata_table):
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+    CheckpointRepository().complete_hour("2019-12-31-21")
+    # Already processed
+    _put_log(
+        s3_client, s3_logs_bucket, "2019-12-31-21-00-00-A", b"31/Dec/2019:21:10:00"
+    )
+    # Missed by earlier runs
+    _put_log(
+        s3_client, s3_logs_bucket, "2019-12-31-23-00-00-A", b"31/Dec/2019:23:10:00"
+    )
+    # Not yet due
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-01-00-00-A", b"01/Jan/2020:01:10:00"
+    )
+
+    handler({}, {})
+
+    assert _last_read(metadata_table, "renovasjonsbiler-status") == (
+        "2019-12-31T23:10:00+00:00"
+    )
+    assert CheckpointRepository().last_complete_hour() == "2020-01-01-00"
+
+
+@freeze_time("2020-01-01-02")
+def test_handler_resumes(s3_client, s3_logs_bucket, metadata_table):
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+    checkpoints = CheckpointRepository()
+    checkpoints.complete_hour("2019-12-31-23")
+    etag = _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-00-00-00-A", b"01/Jan/2020:00:50:00"
+    )
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-00-00-00-B", b"01/Jan/2020:00:10:00"
+    )
+    # An earlier run was interrupted after processing the first object.
+    checkpoints.save_progress(
+        "2020-01-01-00", {"logs/s3/test-data-bucket/2020-01-01-00-00-00-A": etag}
+    )
+
+    handler({}, {})
+
+    # Only the second object was processed this time around.
+    assert _last_read(metadata_table, "renovasjonsbiler-status") == (
+        "2020-01-01T00:10:00+00:00"
+    )
+    assert checkpoints.last_complete_hour() == "2020-01-01-00"
+
+
+@freeze_time("2020-01-01-02")
+def test_handler_gzip(s3_client, s3_logs_bucket, metadata_table):
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+    # Compression given by the file extension ...
+    s3_client.put_object(
+        Bucket=s3_logs_bucket,
+        Key="logs/s3/test-data-bucket/2020-01-01-00-00-00-A.gz",
+        Body=gzip.compress(_log_data()),
+    )
+    # ... or by the content encoding.
+    s3_client.put_object(
+        Bucket=s3_logs_bucket,
+        Key="logs/s3/test-data-bucket/2020-01-01-00-00-00-B",
+        Body=gzip.compress(
+            _log_data().replace(b"17/Feb/2020:06:31:44", b"18/Feb/2020:06:31:44")
+        ),
+        ContentEncoding="gzip",
+    )
+
+    handler({}, {})
+
+    assert _last_read(metadata_table, "renovasjonsbiler-status") == (
+        "2020-02-18T06:31:44+00:00"
+    )
+
+
+@freeze_time("2020-01-01-02")
+def test_handler_zstd(s3_client, s3_logs_bucket, metadata_table):
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+    s3_client.put_object(
+        Bucket=s3_logs_bucket,
+        Key="logs/s3/test-data-bucket/2020-01-01-00-00-00-A.zst",
+        Body=zstandard.ZstdCompressor().compress(_log_data()),
+    )
+
+    handler({}, {})
+
+    assert _last_read(metadata_table, "renovasjonsbiler-status") == (
+        "2020-02-17T06:31:44+00:00"
+    )
+
+
+@freeze_time("2020-01-01-02")
+def test_handler_columnar_logs(s3_client, s3_logs_bucket, metadata_table, mocker):
+    mocker.patch("jobs.update_last_read.handler.COLUMNAR_LOGS_PREFIX", "parsed")
+    metadata_table.put_item(Item={"Id": "renovasjonsbiler-status", "Type": "Dataset"})
+    _put_log(
+        s3_client, s3_logs_bucket, "2020-01-01-00-00-00-A", b"01/Jan/2020:00:10:00"
+    )
+
+    handler({}, {})
+
+    assert _last_read(metadata_table, "renovasjonsbiler-status") == (
+        "2020-01-01T00:10:00+00:00"
+    )
+    obj = s3_client.get_object(
+        Bucket=s3_logs_bucket, Key="parsed/2020-01-01-00/2020-01-01-00-00-00-A.json.gz"
+    )
+    columns = json.loads(gzip.decompress(obj["Body"].read()))
+    assert len(columns["time"]) == 4
+
+
+def test_compression():
+    assert _compression("foo", None) is None
+    assert _compression("foo.gz", None) == "gzip"
+    assert _compression("foo.zst", None) == "zstd"
+    assert _compression("foo", "gzip") == "gzip"
+    assert _compression("foo", "zstd") == "zstd"
+
+
+def test_hours_to_process():
+    assert _hours_to_process(None, "2020-01-01-00") == ["2020-01-01-00"]
+    assert _hours_to_process("2020-01-01-00", "2020-01-01-00") == []
+    assert _hours_to_process("2019-12-31-22", "2020-01-01-00") == [
+        "2019-12-31-23",
+        "2020-01-01-00",
+    ]
+    assert len(_hours_to_process("2019-01-01-00", "2020-01-01-00")) == 24
+    assert _hours_to_process("2019-01-01-00", "2020-01-01-00")[0] == "2019-01-01-01"
+
+
+def test_chunks():
+    assert list(_chunks(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(_chunks([], 2)) == []
+
+
+def test_latest_reads():
+    with open("tests/jobs/update_last_read/data/s3_access_log.txt") as f:
+        # Pass a lazy iterator to make sure the lines are consumed as a stream.
+        datasets_read = _latest_reads(line.strip() for line in f)
+
+    assert datasets_read == {"renovasjonsbiler-status": "20200217063144"}
+
+
+def test_latest_reads_statistics():
+    with open("tests/jobs/update_last_read/data/s3_access_log.txt") as f:
+        statistics = {}
+        _latest_reads((line.strip() for line in f), statistics)
+
+    assert statistics == {
+        ("renovasjonsbiler-status", "2020021706"): ReadStatistics(
+            reads=1,
+            bytes_sent=103845,
+            errors=0,
+            requesters={
+                "arn:aws:sts::123456789000:assumed-role/"
+                "AWSGlueServiceRole-Renovasjonsbiler-Status/AWS-Crawler"
+            },
+        )
+    }
+
+
+def test_merge_reads():
+    t1 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    t2 = datetime(2020, 1, 2, tzinfo=timezone.utc)
+    datasets_read = {"foo": t1, "bar": t2}
+
+    assert _merge_reads(datasets_read, {"foo": t2, "bar": t1, "baz": t1}) == {
+        "foo": t2,
+        "bar": t2,
+        "baz": t1,
+    }
+
+
+def test_is_dataset_read():
+    with open("tests/jobs/update_last_read/data/s3_access_log.txt") as f:
+        lines = f.read().strip().split("\n")
+
+    # Only the first line is a GET request; the rest are PUTs and COPYs.
+    assert [_is_dataset_read(line) for line in lines] == [True, False, False, False]
+    # GETs outside of the dataset stages are irrelevant.
+    assert not _is_dataset_read(lines[0].replace("OBJECT raw/", "OBJECT logs/"))
@@ -1,4 +1,16 @@
-from jobs.update_last_read.logrec import LogRecord
+from datetime import datetime
+
+import pytest
+
+from jobs.update_last_read.logrec import (
+    LogRecord,
+    LogRecordParseError,
+    PartialLogRecord,
+    _parse_time,
+    from_sortable_time,
+    sortable_time,
+    time_fmt,
+)
 
 
 def test_clean_field():
@@ -27,3 +39,60 @@ def test_from_log_line():
     assert len(log_records) == 4 and all(
         [isinstance(lr, LogRecord) for lr in log_records]
     )
+
+
+def test_partial_from_log_line():
+    with open("tests/jobs/update_last_read/data/s3_access_log.txt") as f:
+        lines = f.read().strip().split("\n")
+
+    for line in lines:
+        log_record = LogRecord.from_log_line(line)
+        partial_log_record = PartialLogRecord.from_log_line(line)
+
+        assert partial_log_record.time == log_record.time
+        assert partial_log_record.requester == log_record.requester
+        assert partial_log_record.operation == log_record.operation
+        assert partial_log_record.key == log_record.key
+        assert partial_log_record.http_status == log_record.http_status
+        assert partial_log_record.bytes_sent == log_record.bytes_sent
+        assert partial_log_record.datetime() == log_record.datetime()
+
+
+def test_partial_from_log_line_non_parsing():
+    with pytest.raises(LogRecordParseError):
+        PartialLogRecord.from_log_line("foo bar")
+
+
+@pytest.mark.parametrize(
+    "time",
+    [
+        "17/Feb/2020:06:31:44 +0000",
+        "01/Dec/1999:23:59:59 +0000",
+        "17/Feb/2020:06:31:44 +0130",
+        "17/Feb/2020:00:31:44 -0100",
+        # Not the usual fixed width format, should fall back to `strptime`
+        "7/Feb/2020:06:31:44 +0000",
+    ],
+)
+def test_parse_time(time):
+    expected = datetime.strptime(time, time_fmt)
+    parsed = _parse_time(time)
+
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+    assert from_sortable_time(sortable_time(time)) == expected
+
+
+def test_sortable_time_order():
+    times = [
+        "31/Dec/2019:23:59:59 +0000",
+        "01/Jan/2020:00:30:00 +0100",  # 23:30 UTC the day before
+        "01/Jan/2020:00:00:00 +0000",
+        "01/Jan/2020:00:00:01 +0000",
+        "09/Jan/2020:00:00:00 +0000",
+        "10/Jan/2020:00:00:00 +0000",
+        "01/Feb/2020:00:00:00 +0000",
+    ]
+    assert sorted(times, key=sortable_time) == sorted(
+        times, key=lambda t: datetime.strptime(t, time_fmt)
+    )
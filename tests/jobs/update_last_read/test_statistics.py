@@ -0,0 +1,42 @@
+from jobs.update_last_read.logrec import PartialLogRecord
+from jobs.update_last_read.statistics import ReadStatistics, merge_statistics
+
+
+def _record(requester="a", http_status="200", bytes_sent="100"):
+    return PartialLogRecord(
+        time="01/Jan/2020:00:00:00 +0000",
+        requester=requester,
+        operation="REST.GET.OBJECT",
+        key="raw/green/foo/version=1/edition=1/foo.json",
+        http_status=http_status,
+        bytes_sent=bytes_sent,
+    )
+
+
+def test_add():
+    read_statistics = ReadStatistics()
+    read_statistics.add(_record())
+    read_statistics.add(_record(requester="b", http_status="206"))
+    read_statistics.add(_record(http_status="403", bytes_sent=""))
+    read_statistics.add(_record(requester="", http_status="503", bytes_sent="10"))
+
+    assert read_statistics == ReadStatistics(
+        reads=4, bytes_sent=210, errors=2, requesters={"a", "b", "-"}
+    )
+
+
+def test_merge_statistics():
+    statistics = {
+        ("foo", "2020010100"): ReadStatistics(1, 10, 0, {"a"}),
+        ("bar", "2020010100"): ReadStatistics(2, 20, 1, {"a"}),
+    }
+    other = {
+        ("foo", "2020010100"): ReadStatistics(3, 30, 1, {"a", "b"}),
+        ("foo", "2020010101"): ReadStatistics(1, 10, 0, {"c"}),
+    }
+
+    assert merge_statistics(statistics, other) == {
+        ("foo", "2020010100"): ReadStatistics(4, 40, 1, {"a", "b"}),
+        ("foo", "2020010101"): ReadStatistics(1, 10, 0, {"c"}),
+        ("bar", "2020010100"): ReadStatistics(2, 20, 1, {"a"}),
+    }
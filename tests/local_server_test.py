@@ -0,0 +1,104 @@
+import io
+import json
+import threading
+import urllib.request
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+from metadata.local_server import _QuietRequestHandler, application, proxy_event
+from tests import common_test_helper
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return common_test_helper.create_metadata_table(dynamodb)
+
+
+def _environ(method, path, query="", body=b"", headers={}):
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        **{f"HTTP_{k.upper().replace('-', '_')}": v for k, v in headers.items()},
+    }
+    setup_testing_defaults(environ)
+    return environ
+
+
+def _request(environ):
+    started = {}
+
+    def start_response(status, headers):
+        started["status"] = status
+        started["headers"] = dict(headers)
+
+    body = b"".join(application(environ, start_response))
+    return started["status"], started["headers"], body
+
+
+def test_proxy_event():
+    event = proxy_event(
+        _environ(
+            "POST",
+            "/datasets/foo/versions",
+            query="a=1&b=2&b=3",
+            body=b'{"version": "2"}',
+            headers={"Authorization": "Bearer abc"},
+        )
+    )
+
+    assert event["httpMethod"] == "POST"
+    assert event["path"] == "/datasets/foo/versions"
+    assert event["headers"]["Authorization"] == "Bearer abc"
+    assert event["queryStringParameters"] == {"a": "1", "b": "3"}
+    assert event["multiValueQueryStringParameters"] == {"a": ["1"], "b": ["2", "3"]}
+    assert json.loads(event["body"]) == {"version": "2"}
+    assert event["requestContext"]["authorizer"]["principalId"]
+
+
+def test_get_dataset(put_dataset):
+    status, headers, body = _request(_environ("GET", f"/datasets/{put_dataset}"))
+
+    assert status == "200 OK"
+    assert headers["Content-Type"] == "application/json"
+    assert headers["Access-Control-Allow-Origin"] == "*"
+    assert json.loads(body)["Id"] == put_dataset
+
+
+def test_get_datasets_query(put_dataset):
+    status, _, body = _request(
+        _environ("GET", "/datasets", query="was_derived_from_name=foo")
+    )
+
+    assert status == "200 OK"
+    assert json.loads(body) == []
+
+
+def test_not_found():
+    status, _, body = _request(_environ("GET", "/foo"))
+
+    assert status == "404 Not Found"
+    assert json.loads(body) == [{"message": "No such resource: /foo"}]
+
+
+def test_serve(put_dataset):
+    from wsgiref.simple_server import make_server
+
+    server = make_server(
+        "127.0.0.1", 0, application, handler_class=_QuietRequestHandler
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/datasets/{put_dataset}"
+        with urllib.request.urlopen(url) as response:
+            assert response.status == 200
+            assert json.loads(response.read())["Id"] == put_dataset
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
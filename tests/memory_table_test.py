@@ -0,0 +1,330 @@
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from metadata.CommonRepository import ID_COLUMN, TYPE_COLUMN
+from metadata.dataset.repository import DatasetRepository
+from metadata.edition.repository import EditionRepository
+from metadata.error import ResourceNotFoundError
+from metadata.memory_table import MemoryTable
+from metadata.storage import METADATA_TABLE_INDEXES, memory_metadata_table
+from tests import common_test_helper
+
+
+@pytest.fixture(params=["moto", "memory"])
+def table(request):
+    """The metadata table, both through moto and in memory.
+
+    The tests using this fixture check that both behave the same.
+    """
+    if request.param == "moto":
+        return common_test_helper.create_metadata_table(
+            request.getfixturevalue("dynamodb")
+        )
+    return MemoryTable(
+        "dataset-metadata", ID_COLUMN, TYPE_COLUMN, indexes=METADATA_TABLE_INDEXES
+    )
+
+
+@pytest.fixture
+def editions(table):
+    for day in range(1, 11):
+        table.put_item(Item={"Id": f"foo/1/202001{day:02}", "Type": "Edition"})
+    table.put_item(Item={"Id": "foo/2/20200101", "Type": "Edition"})
+    table.put_item(Item={"Id": "foo/1", "Type": "Version", "version": 1})
+
+
+@pytest.fixture
+def memory_storage(monkeypatch):
+    monkeypatch.setenv("METADATA_STORAGE", "memory")
+    memory_metadata_table.cache_clear()
+    yield memory_metadata_table()
+    memory_metadata_table.cache_clear()
+
+
+def _ids(response):
+    return [item["Id"] for item in response["Items"]]
+
+
+def test_get_put_delete(table):
+    assert "Item" not in table.get_item(Key={"Id": "foo", "Type": "Dataset"})
+
+    table.put_item(Item={"Id": "foo", "Type": "Dataset", "n": 1, "s": {"a", "b"}})
+    item = table.get_item(Key={"Id": "foo", "Type": "Dataset"})["Item"]
+    assert item == {"Id": "foo", "Type": "Dataset", "n": Decimal(1), "s": {"a", "b"}}
+
+    # Returned items are copies
+    item["n"] = 2
+    assert table.get_item(Key={"Id": "foo", "Type": "Dataset"})["Item"]["n"] == 1
+
+    table.delete_item(Key={"Id": "foo", "Type": "Dataset"})
+    assert "Item" not in table.get_item(Key={"Id": "foo", "Type": "Dataset"})
+
+
+def test_conditional_put(table):
+    condition = "attribute_not_exists(Id) AND attribute_not_exists(#Type)"
+    kwargs = {
+        "ExpressionAttributeNames": {"#Type": "Type"},
+        "ConditionExpression": condition,
+    }
+    table.put_item(Item={"Id": "foo", "Type": "Dataset"}, **kwargs)
+
+    with pytest.raises(ClientError) as e:
+        table.put_item(Item={"Id": "foo", "Type": "Dataset"}, **kwargs)
+    assert e.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def test_conditional_delete(table):
+    with pytest.raises(ClientError) as e:
+        table.delete_item(
+            Key={"Id": "foo", "Type": "Dataset"},
+            ConditionExpression="attribute_exists(Id)",
+        )
+    assert e.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def test_update_item(table):
+    client = table.meta.client
+    kwargs = {
+        "TableName": "dataset-metadata",
+        "Key": {"Id": "foo", "Type": "Dataset"},
+        "UpdateExpression": "SET #s = :s ADD n :n, requesters :r",
+        "ExpressionAttributeNames": {"#s": "status"},
+    }
+
+    client.update_item(
+        **kwargs, ExpressionAttributeValues={":s": "a", ":n": 1, ":r": {"x"}}
+    )
+    client.update_item(
+        **kwargs, ExpressionAttributeValues={":s": "b", ":n": 2, ":r": {"x", "y"}}
+    )
+
+    assert table.get_item(Key={"Id": "foo", "Type": "Dataset"})["Item"] == {
+        "Id": "foo",
+        "Type": "Dataset",
+        "status": "b",
+        "n": Decimal(3),
+        "requesters": {"x", "y"},
+    }
+
+
+def test_update_item_condition(table):
+    table.put_item(Item={"Id": "foo", "Type": "Dataset", "last_read": "2"})
+    kwargs = {
+        "TableName": "dataset-metadata",
+        "UpdateExpression": "SET last_read = :t",
+        "ConditionExpression": (
+            "attribute_exists(Id) AND "
+            "(attribute_not_exists(last_read) OR last_read < :t)"
+        ),
+        "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+    }
+
+    for key, t, item in [
+        ("foo", "1", True),
+        ("bar", "1", False),
+    ]:
+        with pytest.raises(ClientError) as e:
+            table.meta.client.update_item(
+                Key={"Id": key, "Type": "Dataset"},
+                ExpressionAttributeValues={":t": t},
+                **kwargs,
+            )
+        assert e.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+        assert ("Item" in e.value.response) == item
+
+    table.meta.client.update_item(
+        Key={"Id": "foo", "Type": "Dataset"},
+        ExpressionAttributeValues={":t": "3"},
+        **kwargs,
+    )
+    assert table.get_item(Key={"Id": "foo", "Type": "Dataset"})["Item"] == {
+        "Id": "foo",
+        "Type": "Dataset",
+        "last_read": "3",
+    }
+
+
+def test_query(table, editions):
+    response = table.query(
+        IndexName="IdByTypeIndex",
+        KeyConditionExpression=Key("Type").eq("Edition")
+        & Key("Id").begins_with("foo/1/"),
+    )
+    assert _ids(response) == [f"foo/1/202001{day:02}" for day in range(1, 11)]
+
+    response = table.query(
+        IndexName="IdByTypeIndex",
+        KeyConditionExpression=Key("Type").eq("Edition")
+        & Key("Id").between("foo/1/20200103", "foo/1/20200105"),
+        ScanIndexForward=False,
+    )
+    assert _ids(response) == ["foo/1/20200105", "foo/1/20200104", "foo/1/20200103"]
+
+    response = table.query(KeyConditionExpression=Key("Id").eq("foo/1"))
+    assert _ids(response) == ["foo/1"]
+
+
+def test_query_filter(table, editions):
+    table.put_item(Item={"Id": "foo/3", "Type": "Version", "version": 3})
+    response = table.query(
+        IndexName="IdByTypeIndex",
+        KeyConditionExpression=Key("Type").eq("Version"),
+        FilterExpression=Attr("version").gt(1),
+    )
+    assert _ids(response) == ["foo/3"]
+
+
+@pytest.mark.parametrize(
+    "query_args",
+    [
+        {
+            "KeyConditionExpression": "#t = :t",
+            "ExpressionAttributeNames": {"#t": "Type"},
+            "ExpressionAttributeValues": {":t": "Version"},
+        },
+        {
+            "KeyConditionExpression": Key("Type").eq("Version"),
+            "FilterExpression": "version > :v",
+            "ExpressionAttributeValues": {":v": 1},
+        },
+    ],
+)
+def test_query_expression_strings(query_args):
+    table = MemoryTable(
+        "dataset-metadata", ID_COLUMN, TYPE_COLUMN, indexes=METADATA_TABLE_INDEXES
+    )
+
+    with pytest.raises(ValueError):
+        table.query(IndexName="IdByTypeIndex", **query_args)
+
+
+@pytest.mark.parametrize("forward", [True, False])
+def test_query_pagination(table, editions, forward):
+    query_args = {
+        "IndexName": "IdByTypeIndex",
+        "KeyConditionExpression": Key("Type").eq("Edition")
+        & Key("Id").begins_with("foo/1/"),
+        "ScanIndexForward": forward,
+        "Limit": 4,
+    }
+    pages = []
+
+    while True:
+        response = table.query(**query_args)
+        pages.append(_ids(response))
+        if "LastEvaluatedKey" not in response:
+            break
+        query_args["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    ids = [f"foo/1/202001{day:02}" for day in range(1, 11)]
+    if not forward:
+        ids.reverse()
+    assert [i for page in pages for i in page] == ids
+    assert [len(page) for page in pages[:3]] == [4, 4, 2]
+
+
+def test_query_sparse_index(table):
+    table.put_item(Item={"Id": "foo/1/1/a", "Type": "Distribution", "api_id": "x"})
+    table.put_item(Item={"Id": "bar/1/1/a", "Type": "Distribution"})
+
+    response = table.query(
+        IndexName="IdByApiIdSparseIndex", KeyConditionExpression=Key("api_id").eq("x")
+    )
+    assert _ids(response) == ["foo/1/1/a"]
+
+
+def test_transaction(table):
+    client = table.meta.client
+    table.put_item(Item={"Id": "foo", "Type": "Dataset"})
+
+    def transact(parent_id, item_id):
+        return client.transact_write_items(
+            TransactItems=[
+                {
+                    "ConditionCheck": {
+                        "TableName": "dataset-metadata",
+                        "Key": {"Id": parent_id, "Type": "Dataset"},
+                        "ConditionExpression": "attribute_exists(Id)",
+                    }
+                },
+                {
+                    "Put": {
+                        "TableName": "dataset-metadata",
+                        "Item": {"Id": item_id, "Type": "Version"},
+                        "ExpressionAttributeNames": {"#Type": "Type"},
+                        "ConditionExpression": (
+                            "attribute_not_exists(Id) AND attribute_not_exists(#Type)"
+                        ),
+                    }
+                },
+            ]
+        )
+
+    transact("foo", "foo/1")
+    assert "Item" in table.get_item(Key={"Id": "foo/1", "Type": "Version"})
+
+    for parent_id, item_id, reasons in [
+        ("bar", "bar/1", ["ConditionalCheckFailed", "None"]),
+        ("foo", "foo/1", ["None", "ConditionalCheckFailed"]),
+    ]:
+        with pytest.raises(ClientError) as e:
+            transact(parent_id, item_id)
+        assert e.value.response["Error"]["Code"] == "TransactionCanceledException"
+        assert [
+            reason["Code"] for reason in e.value.response["CancellationReasons"]
+        ] == reasons
+
+    assert "Item" not in table.get_item(Key={"Id": "bar/1", "Type": "Version"})
+
+
+def test_memory_table_page_size():
+    table = MemoryTable("t", "Id", "Type", page_size=2)
+    for i in range(5):
+        table.put_item(Item={"Id": "foo", "Type": str(i)})
+
+    response = table.query(KeyConditionExpression=Key("Id").eq("foo"))
+    assert len(response["Items"]) == 2
+    assert response["LastEvaluatedKey"] == {"Id": "foo", "Type": "1"}
+
+
+def test_memory_table_rejects_floats():
+    table = MemoryTable("t", "Id")
+    with pytest.raises(TypeError):
+        table.put_item(Item={"Id": "foo", "n": 1.5})
+
+
+class TestMemoryStorage:
+    def test_repositories(self, memory_storage):
+        dataset_repository = DatasetRepository()
+        dataset_repository.create_item("foo", {"title": "Foo"})
+        memory_storage.put_item(Item={"Id": "foo/1", "Type": "Version"})
+        edition_repository = EditionRepository()
+
+        for day in range(1, 4):
+            edition_repository.create_edition(
+                "foo", "1", {"edition": f"2020-01-0{day}T00:00:00+00:00"}
+            )
+
+        editions = edition_repository.get_editions(
+            "foo", "1", since="20200102T000000", descending=True
+        )
+        assert [e["Id"] for e in editions] == [
+            "foo/1/20200103T000000",
+            "foo/1/20200102T000000",
+        ]
+        assert edition_repository.get_item("foo/1/latest")["Id"] == (
+            "foo/1/20200103T000000"
+        )
+
+        assert dataset_repository.update_last_read("foo", "2020-01-01T00:00:00")
+        assert not dataset_repository.update_last_read("foo", "2019-01-01T00:00:00")
+        with pytest.raises(ResourceNotFoundError):
+            dataset_repository.update_last_read("bar", "2020-01-01T00:00:00")
+
+    def test_shared_table(self, memory_storage):
+        DatasetRepository().create_item("foo", {"title": "Foo"})
+        assert DatasetRepository().get_dataset("foo")["title"] == "Foo"
+        assert len(memory_storage) == 1
@@ -0,0 +1,123 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from metadata import router
+from tests import common_test_helper
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return common_test_helper.create_metadata_table(dynamodb)
+
+
+def _proxy_event(event, method, path):
+    return {**event(), "httpMethod": method, "path": path, "resource": "/{proxy+}"}
+
+
+def test_routes_match_serverless_functions():
+    yaml = pytest.importorskip("yaml")
+    functions = {}
+
+    for f in Path("serverless/functions").glob("*.yaml"):
+        if f.name == "router.yaml":
+            continue
+        with open(f) as fh:
+            # Skip the serverless variables, they don't parse as YAML.
+            function = yaml.safe_load(fh.read().replace("${", "$"))
+        http = function["events"][0]["http"]
+        functions[(http["method"].upper(), "/" + http["path"].lstrip("/"))] = function[
+            "image"
+        ]["command"][0]
+
+    assert router.HANDLERS_BY_RESOURCE == functions
+
+
+@pytest.mark.parametrize(
+    "method,path,handler_name,parameters",
+    [
+        ("GET", "/datasets", "metadata.dataset.handler.get_datasets", {}),
+        ("GET", "/datasets/", "metadata.dataset.handler.get_datasets", {}),
+        (
+            "GET",
+            "/datasets/foo/versions/1/editions/20200101T000000",
+            "metadata.edition.handler.get_edition",
+            {"dataset-id": "foo", "version": "1", "edition": "20200101T000000"},
+        ),
+        (
+            "POST",
+            "/datasets/foo/versions/1/editions/publish",
+            "metadata.edition.handler.publish_edition",
+            {"dataset-id": "foo", "version": "1"},
+        ),
+        (
+            "POST",
+            "/datasets/foo/versions/1/editions/e/distributions/batch",
+            "metadata.distribution.handler.create_distributions",
+            {"dataset-id": "foo", "version": "1", "edition": "e"},
+        ),
+        (
+            "GET",
+            "/datasets/foo/versions/1/editions/e/distributions/batch",
+            "metadata.distribution.handler.get_distribution",
+            {
+                "dataset-id": "foo",
+                "version": "1",
+                "edition": "e",
+                "distribution": "batch",
+            },
+        ),
+        (
+            "GET",
+            "/datasets/f%C3%B8%C3%B8",
+            "metadata.dataset.handler.get_dataset",
+            {"dataset-id": "føø"},
+        ),
+    ],
+)
+def test_match(method, path, handler_name, parameters):
+    assert router.match(method, path)[0] == handler_name
+    assert router.match(method, path)[2] == parameters
+
+
+def test_match_no_route():
+    with pytest.raises(router.MethodNotAllowed):
+        router.match("DELETE", "/datasets")
+
+    with pytest.raises(router.NoRoute):
+        router.match("GET", "/foo")
+
+    with pytest.raises(router.NoRoute):
+        router.match("GET", "/datasets/foo/bar")
+
+
+def test_dispatch_on_path(event, put_dataset):
+    response = router.handler(
+        _proxy_event(event, "GET", f"/datasets/{put_dataset}"), None
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["Id"] == put_dataset
+
+
+def test_dispatch_on_resource(event, put_dataset):
+    e = {
+        **event(dataset=put_dataset),
+        "httpMethod": "GET",
+        "resource": "/datasets/{dataset-id}",
+        # API Gateway includes the base path mapping of custom domains here
+        "path": f"/metadata/datasets/{put_dataset}",
+    }
+    response = router.handler(e, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["Id"] == put_dataset
+
+
+def test_dispatch_not_found(event):
+    response = router.handler(_proxy_event(event, "GET", "/foo"), None)
+    assert response["statusCode"] == 404
+
+    response = router.handler(_proxy_event(event, "DELETE", "/datasets"), None)
+    assert response["statusCode"] == 405
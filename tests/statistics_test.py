@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from metadata.statistics.handler import get_read_statistics
+from metadata.statistics.repository import (
+    REQUESTER_BUCKETS,
+    StatisticsRepository,
+    estimate_requesters,
+    requester_bucket,
+    statistics_hour,
+)
+from tests import common_test_helper
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return common_test_helper.create_metadata_table(dynamodb)
+
+
+@pytest.fixture
+def statistics(metadata_table):
+    metadata_table.put_item(Item={"Id": "foo", "Type": "Dataset"})
+    statistics_repository = StatisticsRepository()
+
+    for hour in ["2020010100", "2020010101", "2020010102"]:
+        statistics_repository.add_read_statistics("foo", hour, 2, 100, 1, ["a", "b"])
+    # Counters of the same hour add up
+    statistics_repository.add_read_statistics("foo", "2020010101", 1, 50, 0, ["c"])
+    # Statistics of other datasets shouldn't be included
+    statistics_repository.add_read_statistics("foo-bar", "2020010101", 1, 1, 0, ["a"])
+
+
+def test_statistics_hour():
+    assert statistics_hour("2020-01-01T12:34:56+00:00") == "2020010112"
+    assert statistics_hour("2020-01-01T12:34:56+02:00") == "2020010110"
+    assert statistics_hour("2020-01-01T12:34:56") == "2020010112"
+
+    with pytest.raises(ValueError):
+        statistics_hour("foo")
+
+
+def test_estimate_requesters():
+    for n in [1, 10, 100, 500]:
+        buckets = {
+            requester_bucket(f"arn:aws:iam::123456789012:user/{i}") for i in range(n)
+        }
+        assert abs(estimate_requesters(buckets) - n) <= max(1, n * 0.1)
+
+    assert estimate_requesters(set()) == 0
+    assert estimate_requesters(set(range(REQUESTER_BUCKETS))) == REQUESTER_BUCKETS
+
+
+def test_requesters_are_not_stored(metadata_table):
+    requester = "arn:aws:iam::123456789012:user/someone"
+    StatisticsRepository().add_read_statistics(
+        "foo", "2020010100", 1, 1, 0, [requester]
+    )
+
+    item = metadata_table.get_item(
+        Key={"Id": "foo/2020010100", "Type": "ReadStatistics"}
+    )["Item"]
+    assert requester not in str(item)
+
+
+class TestGetReadStatistics:
+    def test_get_read_statistics(self, event, statistics):
+        response = get_read_statistics(event(dataset="foo"), None)
+
+        assert response["statusCode"] == 200
+        assert json.loads(response["body"]) == [
+            {
+                "hour": "2020-01-01T00:00:00+00:00",
+                "reads": 2,
+                "bytes_sent": 100,
+                "errors": 1,
+                "requesters": 2,
+            },
+            {
+                "hour": "2020-01-01T01:00:00+00:00",
+                "reads": 3,
+                "bytes_sent": 150,
+                "errors": 1,
+                "requesters": 3,
+            },
+            {
+                "hour": "2020-01-01T02:00:00+00:00",
+                "reads": 2,
+                "bytes_sent": 100,
+                "errors": 1,
+                "requesters": 2,
+            },
+        ]
+
+    def test_get_read_statistics_range(self, event, statistics):
+        response = get_read_statistics(
+            event(
+                dataset="foo",
+                query_params={
+                    "since": "2020-01-01T01:30:00+00:00",
+                    "until": "2020-01-01T02:00:00+00:00",
+                },
+            ),
+            None,
+        )
+
+        assert response["statusCode"] == 200
+        assert [s["hour"] for s in json.loads(response["body"])] == [
+            "2020-01-01T01:00:00+00:00",
+            "2020-01-01T02:00:00+00:00",
+        ]
+
+    def test_get_read_statistics_invalid_range(self, event, statistics):
+        response = get_read_statistics(
+            event(dataset="foo", query_params={"since": "yesterday"}), None
+        )
+        assert response["statusCode"] == 400
+
+    def test_get_read_statistics_no_dataset(self, event, metadata_table):
+        response = get_read_statistics(event(dataset="foo"), None)
+
+        assert response["statusCode"] == 404
+        assert json.loads(response["body"]) == [
+            {"message": "Dataset foo does not exist"}
+        ]
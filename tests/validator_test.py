@@ -6,6 +6,7 @@ dataset = Validator("dataset")
 version = Validator("version")
 edition = Validator("edition")
 distribution = Validator("distribution")
+distribution_batch = Validator("distribution_batch")
 
 valid_dataset = {
     "theme": ["environment"],
@@ -59,3 +60,11 @@ def test_multiple_errors():
     assert len(errors) == 2
     assert errors[0].startswith("accessRights: 'wrong' is not one of")
     assert errors[1] == "'title' is a required property"
+
+
+def test_distribution_batch_resolves_reference():
+    assert distribution_batch.validate([{"filenames": ["foo.csv"]}]) == []
+
+    errors = distribution_batch.validate([{"filenames": ["foo.csv"]}, {"foo": 1}])
+    assert len(errors) == 1
+    assert errors[0].startswith("1: Additional properties are not allowed")
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from metadata import router, warmup
+from metadata.dataset import handler as dataset_handler
+from metadata.dataset.code_examples import template_env
+from metadata.dataset.repository import DatasetRepository
+from tests import common_test_helper
+
+
+@pytest.fixture(autouse=True)
+def metadata_table(dynamodb):
+    return common_test_helper.create_metadata_table(dynamodb)
+
+
+@pytest.mark.parametrize(
+    "event,expected",
+    [
+        ({"source": "serverless-plugin-warmup"}, True),
+        ({"warmup": True}, True),
+        ({"source": "aws.events"}, False),
+        ({"httpMethod": "GET", "path": "/datasets"}, False),
+        ("warmup", False),
+    ],
+)
+def test_is_warmup_event(event, expected):
+    assert warmup.is_warmup_event(event) == expected
+
+
+def test_handler_warm_up(mocker):
+    get_dataset = mocker.spy(DatasetRepository, "get_dataset")
+
+    response = dataset_handler.get_dataset({"warmup": True}, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["warmers"] == len(warmup._warmers)
+    get_dataset.assert_not_called()
+
+
+def test_templates_are_compiled():
+    template_env.cache.clear()
+
+    warmup.warm_up("test")
+
+    assert len(template_env.cache) == len(template_env.list_templates(["jinja"]))
+
+
+def test_router_warm_up(mocker):
+    handler = mocker.spy(router, "_handler")
+
+    response = router.handler({"source": "serverless-plugin-warmup"}, None)
+
+    assert response["statusCode"] == 200
+    assert {c.args[0] for c in handler.call_args_list} == set(
+        router.HANDLERS_BY_RESOURCE.values()
+    )